@@ -1,6 +1,97 @@
 import pandas as pd
 import re
+import itertools
+import PROD_cache
+import PROD_classify
+import PROD_extract
+
+
+#Change this whenever a parser changes, so dataframes cached by the old parsers aren't reused
+parser_version = 1
+
+#Compiled regex patterns used to clean up the report text, so they aren't left to the re module's small cache.
+#Some patterns start a part with (?=(...))\1. That matches the same text as the part inside, but never backtracks into it.
+#It's only used where the next part can't start with any character the inside part matches, so backtracking could never
+#find a different match. It keeps malformed pages from taking minutes.
+
+#Splits the text into pages. pdfminer3 ends each page with a form feed
+page_pattern = re.compile(r"[^\f]*\f|[^\f]+$")
+
+#Civil pending cases header
+civil_header_pattern = re.compile(r"""(?=([A-Z0-9 ()/]*))\1\n\n\s*[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""")
+#The same header from the blank line on, with the characters the line of capitals above it can have. Searching from the blank
+#line only tries the positions where a header can start, instead of every character of the report.
+civil_header_body_pattern = re.compile(r"""\n\n(?=(\s*))\1[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""")
+civil_header_line_characters = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ()/')
+
+#Civil disposed cases header
+civil_disposed_header_pattern = re.compile(r"""(?=(\s*))\1[A-Z]{3,9}\s[0-9]{1,2},\s[0-9]{4}\s(?=([a-zA-Z0-9 \n/-]*))\2:(?=([a-zA-Z0-9 \n/-]*))\3:[A-Za-z0-9 \n\./-]*DEFENDANT\s{1,23}\n""")
+
+#Criminal pending cases header and the dividers between the case sections
+criminal_header_pattern = re.compile(r"""\n\x0c(?=(\s*[A-Z -]*))\1\d{2}/\d{2}/\d{4}\n\s*\w{6,8}[A-Z0-9 -]*\n\s*[A-Z ]*\d{2}/\d{2}/\d{4}[A-Z0-9 -]*\n\n[A-Z ]*#\s*[A-Z -']*\n[A-Z0-9/ -]*\n\n""")
+criminal_cases_filed_total_pattern = re.compile(r"""\nTOTAL NUMBER OF CASES FILED: [0-9\n-]*MTR-A[A-Z\n ]*[-]*""")
+criminal_mtr_filings_total_pattern = re.compile(r"""\n{0,1}TOTAL NUMBER OF MTR-A FILINGS: [0-9\n-]*ALL OTHER CASES ADDED/APPEALED[\n-]*""")
+criminal_cases_added_total_pattern = re.compile(r"""\n{0,1}TOTAL NUMBER OF CASES ADDED/APPEALED: [0-9- a-zA-Z\.#;,:'=\n]*""")
+
+#Criminal disposed cases header
+criminal_disposed_header_pattern = re.compile(r"""\n\x0c(?=(\s*))\1[A-Z]{3,9}\s[0-9]{1,2},\s[0-9]{4}\s[a-zA-Z0-9 \n:/-]*#\s*[A-Z /]*\n\n""")
+
+#Juvenile cases header
+juvenile_header_pattern = re.compile(r"""\n\x0c\s*[A-Z0-9 \(\)\n/#\:-]*\.\sDATE""")
+
+#Inactivity report headers
+civil_inactive_header_pattern = re.compile(r"""(?=(\s*[A-Z\.\' \n-]*))\1\d{2}/\d{2}/\d{4}\n\s*[A-Z0-9 \:-]*\d{2}/\d{2}/\d{4}[A-Z0-9 \n#-]*INACTIVE REASON\s{29}""")
+criminal_inactive_header_pattern = re.compile(r"""\n\x0c(?=(\s*[A-Z\.\' \n-]*))\1\d{2}/\d{2}/\d{4}\n\s*[A-Z0-9 \:-]*\d{2}/\d{2}/\d{4}[A-Z0-9 \n#-]*STATE REPORT COLUMN\n\n""")
+
+#The fixed-width layout of each kind of line in the reports: (field, first column, column after the last or None for the
+#rest of the line). A 'Case' line starts a case and a 'Continuation' line adds to the case above it.
+#If the county system moves a column, this is the only place the offsets need to change.
+line_layouts = {
+    'Civil Case': [('Cause Number', 0, 19), ('File Date', 19, 30), ('Cause of Action', 30, 56), ('Docket Date', 56, 68),
+                   ('Docket Type', 68, 86), ('ANS File', 86, 96), ('CR Number', 96, None)],
+    #As of 13 June 2023, we are no longer collecting names. Plaintiff names are in 0-38 and defendant names are in 64-94
+    'Civil Continuation': [('Plaintiff Attorney', 38, 64), ('Defendant Attorney', 94, None)],
+    'Civil Disposed Case': [('Cause Number', 0, 17), ('Disposed Date', 17, 29), ('Disposition', 29, 64)],
+    'Civil Disposed Continuation': [('Disposed Date', 17, 29), ('Disposition', 29, 64)],
+    #Defendant names are in 34-72
+    'Criminal Case': [('Cause Number', 0, 22), ('File Date', 22, 34), ('Court', 72, 79), ('Docket Date', 79, 89),
+                      ('Outstanding Warrants', 89, None)],
+    'Criminal Continuation': [('Attorney', 0, 35), ('First Offense', 35, 74), ('ST RPT Column', 74, None)],
+    #Defendant names are in 17-45, complainants in 78-110 and bondsmen after that
+    'Criminal Disposed Case': [('Cause Number', 0, 17), ('Disposed Date', 45, 55), ('Disposition', 55, 78)],
+    'Criminal Disposed Continuation': [('Disposed Date', 45, 55), ('Disposition', 55, 78)],
+    #Courts are in 38-70 and respondents after that
+    'Juvenile Case': [('Cause Number', 0, 26), ('File Date', 26, 38)],
+    'Juvenile Continuation': [('Offense', 5, 88), ('Docket Date', 88, 98), ('Disposed Date', 98, None)],
+    'Civil Inactive Case': [('Cause Number', 0, 27), ('File Date', 27, 44), ('Inactive Start Date', 44, 54),
+                            ('Inactive End Date', 54, 73), ('Inactive Reason', 73, None)],
+    'Civil Inactive Continuation': [('Inactive Start Date', 44, 54), ('Inactive End Date', 54, 73), ('Inactive Reason', 73, None)],
+    #The first case on the criminal inactivity report is read after its leading whitespace is removed
+    'Criminal Inactive First Case': [('Cause Number', 0, 19), ('File Date', 19, 31), ('Inactive Start Date', 31, 44),
+                                     ('Inactive End Date', 44, 56), ('Inactive Reason', 56, 88), ('State Report', 88, None)],
+    'Criminal Inactive Case': [('Cause Number', 0, 24), ('File Date', 24, 36), ('Inactive Start Date', 36, 49),
+                               ('Inactive End Date', 49, 61), ('Inactive Reason', 61, 93), ('State Report', 93, None)],
+    'Criminal Inactive Continuation': [('Inactive Start Date', 36, 49), ('Inactive End Date', 49, 61), ('Inactive Reason', 61, 93)]
+}
+
+#The line layouts as slice objects, built once instead of for every line of every report
+line_slices = {line_kind: {field: slice(start, end) for field, start, end in layout} for line_kind, layout in line_layouts.items()}
+
+def get_line_slices(line_kind, fields):
+    """
+    This function takes in a kind of line and the fields a parser reads from it, and returns the slice of each field in the
+    order the fields were given. The parsers look up their slices once, before looping over the lines, and cut each field
+    with line[field_slice].strip(), so the loop does no more work per line than hard-coded offsets would.
+
+    Parameters:
+        - line_kind: A string representing the kind of line, one of the keys of line_layouts
+        - fields: A list of the field names, from that line's layout
+
+    Returns:
+        - slices: A tuple of slice objects, one per field
+    """
 
+    return tuple(line_slices[line_kind][field] for field in fields)
 
 def build_dataframe(report_type, content):
     """
@@ -37,6 +128,35 @@ def build_dataframe(report_type, content):
 
     return df
 
+def build_cached_dataframe(report_type, content, file_hash = None):
+    """
+    This function takes in the report type, text content and file hash of the uploaded PDF. If the same PDF was parsed by the
+    same extractor and parser versions before, the saved dataframe is returned. Otherwise, build_dataframe is called and the
+    result is saved for the next time.
+
+    Parameters:
+        - report_type: A string representing the report type of the uploaded PDF
+        - content: A string representing the text content of the uploaded PDF
+        - file_hash: The SHA-256 hash of the PDF bytes. If None, the cache isn't used.
+
+    Returns:
+        - df: A dataframe of the information extracted from the uploaded PDF
+    """
+
+    if file_hash is None:
+        return build_dataframe(report_type, content)
+
+    cache_key = 'dataframe_' + file_hash + '_v' + str(PROD_extract.extractor_version) + '_' + str(parser_version)
+    df = PROD_cache.load_cached_value(cache_key)
+
+    if df is None:
+        df = build_dataframe(report_type, content)
+        #Don't save the -1 returned for unknown reports
+        if isinstance(df, pd.DataFrame):
+            PROD_cache.save_cached_value(cache_key, df)
+
+    return df
+
 #Create a function to identify combined cases in the civil cases PDF
 def check_for_combined_case(string):
     """
@@ -63,8 +183,9 @@ def extract_civil_case_data(case_info, county):
     This function takes in a list of strings that represent a single case. Each string may contain relevant information
     that will need to be collected, and added to a dictionary. That dictionary will then be added to a list 
     and returned.
-    
-    WARNING: This function is recursive.
+
+    Sometimes several cases are combined into one block. The block is scanned once to find the line each combined case
+    starts on, and each of those sections of lines becomes its own dictionary.
     
     Parameter:
         -case_info: The list of strings representing a single case
@@ -73,193 +194,252 @@ def extract_civil_case_data(case_info, county):
     Returns:
         -case_list: A list containing the case dictionaries
     """
+
+    #Find the line each case starts on. The first case starts on the first line.
+    #The names always start on the third line of a case, so the search for the next combined case does too
+    case_starts = [0]
+    i = 2
+    while i < len(case_info):
+        #Check if this line is the start of a combined case
+        if check_for_combined_case(case_info[i][:38]) == True:
+            case_starts.append(i)
+            i += 2
+        else:
+            i += 1
+
+    #The end of each case is the start of the next one
+    case_ends = case_starts[1:] + [len(case_info)]
+
+    #Build a dictionary for each case. The combined cases come first, last one first, like they always have
+    case_list = [get_civil_case_dict(case_info, start, end, county) for start, end in reversed(list(zip(case_starts, case_ends)))]
     
-    #Initialize the temp list to store the dict(s)
-    case_list = []
+    return case_list
+
+def get_civil_case_dict(case_info, start, end, county):
+    """
+    This function takes in the lines of a case block and the line numbers one case in it starts and ends on. It will collect
+    that case's information into a dictionary.
+
+    Parameters:
+        -case_info: The list of strings representing the case block
+        -start: The index of the line the case starts on
+        -end: The index of the line after the case's last line
+        -county: The county information acquired from the previous function
+
+    Returns:
+        -temp_dict: A dictionary of the case's info
+    """
     
-    #Initialize the temp dict
-    temp_dict = {}
+    #Remove leading whitespace, then cut the first line into its fields
+    case_line = case_info[start].lstrip()
+    temp_dict = {'County': county}
+    for field, field_slice in line_slices['Civil Case'].items():
+        temp_dict[field] = case_line[field_slice].strip()
+
+    #As of 13 June 2023, we are no longer collecting names
+    #The attorneys always start on the third line (index = start + 2)
+    plaintiff_attorney_slice, defendant_attorney_slice = get_line_slices('Civil Continuation', ['Plaintiff Attorney', 'Defendant Attorney'])
+    plaintiff_attorneys = []
+    defendant_attorneys = []
+    for line in case_info[start + 2:end]:
+        plaintiff_attorney = line[plaintiff_attorney_slice].strip()
+        if plaintiff_attorney:
+            plaintiff_attorneys.append(plaintiff_attorney)
+
+        defendant_attorney = line[defendant_attorney_slice].strip()
+        if defendant_attorney:
+            defendant_attorneys.append(defendant_attorney)
+
+    #Now put all the info into the temp dict
+    temp_dict['Plaintiff Attorney'] = list(set(plaintiff_attorneys))
+    temp_dict['Defendant Attorney'] = list(set(defendant_attorneys))
     
-    #Remove leading whitespace
-    case_info[0] = case_info[0].lstrip()
+    return temp_dict
+    
+def split_into_pages(text):
+    """
+    This function takes in the text of an entire PDF and yields it one page at a time. pdfminer3 ends each page with a form
+    feed, which is kept at the end of each page so the pages join back into the original text.
 
-    #Get the cause number
-    cause_num = case_info[0][:19].strip()
+    Parameter:
+        - text: A string of the text content of the PDF
 
-    #Get the file date
-    file_date = case_info[0][19:30].strip()
+    Yields:
+        - page: A string of the text content of one page
+    """
 
-    #Get the Cause of Action
-    coa = case_info[0][30:56].strip()
+    for match in page_pattern.finditer(text):
+        yield match.group()
 
-    #Get the docket_date
-    docket_date = case_info[0][56:68].strip()
+def find_civil_headers(text):
+    """
+    This function takes in the text of a civil pending cases report and yields where each header is, the same ones
+    civil_header_pattern finds. It searches for the blank line in each header, then walks back over the line of capitals above it.
 
-    #Get the docket type
-    docket_type = case_info[0][68:86].strip()
+    Parameter:
+        - text: A string of report text
 
-    #Get the ANS File
-    ans_date = case_info[0][86:96].strip()
+    Yields:
+        - header_start: The position of the first character of a header
+        - header_end: The position just past the end of the header
+    """
 
-    #Get the CR Number
-    cr_num = case_info[0][96:].strip()
+    position = 0
 
-    #Get the names associated with each label
-    #Will need to set up the lists before the loop. They will be added to the dict after the loop
-    #plaintiff_names = []
-    plaintiff_attorneys = []
-    #defendant_names = []
-    defendant_attorneys = []
+    for match in civil_header_body_pattern.finditer(text):
+        #The line of capitals can't start before the end of the last header
+        header_start = match.start()
+        while header_start > position and text[header_start - 1] in civil_header_line_characters:
+            header_start -= 1
 
-    #As of 13 June 2023, we are no longer collecting names
-    #We still need to check for combined cases though and go through each line
-    #The names always start on the third line (index = 2)
-    for i in range(2, len(case_info)):
+        yield header_start, match.end()
+        position = match.end()
 
-        #Check that this line is not the start of a combined case. If it is, collect combined case data,
-        #Then break from this loop
-        if check_for_combined_case(case_info[i][:38]) == True:
-            #Set up temporary dictionary
-            combined_case = {}
+def find_civil_header_start(text):
+    """
+    This function takes in the text of a civil pending cases report up to the end of a page. It returns where the end of the page
+    could be the start of a header that finishes on the next page: a line of capitals and a blank line, with nothing but
+    whitespace after it. That is the only part of a header that can match across a page break.
 
-            #Find combined case text
-            combined_case_text = []
+    Parameter:
+        - text: A string of report text
 
-            #Loop through and grab the necessary lines from the current case
-            for index in range(i, len(case_info)):
-                combined_case_text.append(case_info[index])
+    Returns:
+        - header_start: The position the header could start at, or None if the page can't end with the start of a header
+    """
 
-            #Collect combined case data
-            combined_case = extract_civil_case_data(combined_case_text, county)
+    #The blank line has to be in the whitespace at the end of the page
+    blank_line = text.find('\n\n', len(text.rstrip()))
+    if blank_line == -1:
+        return None
 
-            #Add the temp dictionary to the overall container dict
-            case_list.extend(combined_case)
+    header_start = blank_line
+    while header_start > 0 and text[header_start - 1] in civil_header_line_characters:
+        header_start -= 1
 
-            #Finally, break out of the loop
-            break
+    return header_start
 
-        #As of 13 June 2023, we are no longer collecting names
+def remove_civil_page_headers(pages):
+    """
+    This function takes in the pages of a civil pending cases report and yields the text with the headers removed, one piece at
+    a time. Joined together, the pieces are exactly what removing the headers from the whole report at once would give.
+    A header can start on one page and finish on the next, so the end of a page that could be the start of a header is held
+    until the next page arrives.
 
-        #Get the plaintiff name on current line
-        #plaintiff_name = case_info[i][:38]
+    Parameter:
+        - pages: An iterable of the text of each page. Every page but the last ends with the form feed pdfminer3 puts after it.
 
-        #Check if plaintiff_name is all whitesapace. If not, strip it and add to names list
-        #Also check that the string is not empty
-        #if plaintiff_name.isspace() == False and len(plaintiff_name) > 0:
-        #    plaintiff_names.append(plaintiff_name.strip())
+    Yields:
+        - text: A piece of the report text without headers
+    """
 
-        #Get the plaintiff attorney on current line
-        plaintiff_attorney = case_info[i][38:64]
+    #The end of the last page that could be the start of a header
+    held_text = ''
 
-        #Check if plaintiff_attorney is all whitespace. If not, strip it and add to list
-        #Also check that the string is not empty
-        if plaintiff_attorney.isspace() == False and len(plaintiff_attorney) > 0:
-            plaintiff_attorneys.append(plaintiff_attorney.strip())
+    for page in pages:
+        text = held_text + page
+        pieces = []
+        position = 0
 
-        #Get the defendant name on current line
-        #defendant_name = case_info[i][64:94]
+        #Only the end of the page can be held, so find it once
+        hold_position = find_civil_header_start(text)
 
-        #Check if defendant_name is all whitespace. If not, strip it and add to list
-        #Also check that the string is not empty
-        #if defendant_name.isspace() == False and len(defendant_name) > 0:
-        #    defendant_names.append(defendant_name.strip())
+        for header_start, header_end in find_civil_headers(text):
+            #A header that might finish on the next page comes first, so hold the rest of the text for the next page
+            if hold_position is not None and max(hold_position, position) < header_start:
+                break
 
-        #Get the defendant attorney on current line
-        defendant_attorney = case_info[i][94:]
+            #Remove the header
+            pieces.append(text[position:header_start])
+            position = header_end
 
-        #Check if the defendant_attorney is all whitespace. If not, strip it and add to list
-        #Also check that the string is not empty
-        if defendant_attorney.isspace() == False and len(defendant_attorney) > 0:
-            defendant_attorneys.append(defendant_attorney.strip())
+        if hold_position is None:
+            pieces.append(text[position:])
+            held_text = ''
+        else:
+            hold_position = max(hold_position, position)
+            pieces.append(text[position:hold_position])
+            held_text = text[hold_position:]
 
-    #As of 13 June 2023, we are no longer collecting names
-    #Now put all the info into a temp dict.
-    temp_dict['County'] = county
-    temp_dict['Cause Number'] = cause_num
-    temp_dict['File Date'] = file_date
-    temp_dict['Cause of Action'] = coa
-    temp_dict['Docket Date'] = docket_date
-    temp_dict['Docket Type'] = docket_type
-    temp_dict['ANS File'] = ans_date
-    temp_dict['CR Number'] = cr_num
-    #temp_dict['Plaintiff Name'] = plaintiff_names
-    temp_dict['Plaintiff Attorney'] = list(set(plaintiff_attorneys))
-    #temp_dict['Defendant Name'] = defendant_names
-    temp_dict['Defendant Attorney'] = list(set(defendant_attorneys))
-    
-    #Append the temp_dict to the case_list
-    case_list.append(temp_dict)
-    
-    return case_list
-    
-def build_civil_cases_dataframe(text):
+        yield ''.join(pieces)
+
+    #Nothing came after the held text, so no header could finish in it
+    yield civil_header_pattern.sub('', held_text)
+
+def iterate_civil_case_records(pages, county):
     """
-    This function takes in a page of text from a pdf file. It will extract all available information for each case on
-    the page, put it all into dictionaries, and then return a list containing the other dictionaries for each
-    case.
-    
+    This function takes in the pages of a civil pending cases report and yields the dictionary of each case as soon as the
+    case is complete. Cases that start on one page and finish on the next are held until the rest of the case arrives.
+
+    Parameters:
+        - pages: An iterable of the text of each page
+        - county: The county name found in the report header
+
+    Yields:
+        - case_dict: A dictionary of a single case's info
+    """
+
+    #The piece of text after the last dashed line. It's the start of a case that continues on the next page
+    leftover_text = ''
+
+    #Remove the headers from the pages
+    for text in remove_civil_page_headers(pages):
+
+        #Now split each case by the dashed lines. The last piece isn't finished yet, so save it for the next page
+        cases = (leftover_text + text).split('-------------------------------------------------------------------------------------------------------------')
+        leftover_text = cases.pop()
+
+        #Loop through each case and build a dictionary with its info
+        for case in cases:
+
+            #Remove leading whitespace only
+            case = case.lstrip()
+
+            #Split on the '/n'
+            case_info = case.split('\n')
+
+            #Gather the case data
+            yield from extract_civil_case_data(case_info, county)
+
+    #The leftover text after the last dashed line only consists of the count of cases in the pdf. Not needed here
+
+def build_civil_cases_dataframe_from_pages(pages):
+    """
+    This function takes in the pages of a civil pending cases report, one at a time. It will read the header from the first
+    page, then build the dataframe from the cases as they are parsed, so the whole report never has to be held as one string.
+    The pages can come straight from PROD_extract.get_page_contents while the PDF is still being extracted.
+
     Parameter:
-        - text: The text of a single pdf page.
-        
+        - pages: An iterable of the text of each page
+
     Returns:
-        - cases: A list containing the dictionaries of all cases.
+        - df: A dataframe of the cases in the report
     """
-    
-    #Set up the container list
-    case_dicts = []
-    
-    #First, strip leading and trailing whitespaces
-    text = text.strip()
-    
+
+    pages = iter(pages)
+
+    #First, strip leading whitespaces. Like stripping the whole report, this skips any blank pages at the start.
+    #The header can run onto the next page when the first page is short, so read pages until the header is complete.
+    first_pages = ''
+    for page in pages:
+        first_pages = (first_pages + page).lstrip()
+        if len(first_pages) >= 389:
+            break
+
     #For header. Doesn't have to be perfect, we only need the county name included here
-    header = text[:389]
+    header = first_pages[:389]
 
-    #Use regex to find the 'AS OF' and 'RAN ON' dates
-    #For 'RAN ON' date:
-    report_generated_date = re.findall(r"[A-Z]{3,9}\s[0-9]{2},\s[0-9]{4}", header)[0]
+    #Find the county and the 'AS OF' and 'RAN ON' dates in the header
+    report_header = PROD_classify.classify_header(header, 'Civil')
+    report_generated_date = report_header['Report Generated Date']
+    report_as_of_date = report_header['As Of Date']
+    county = report_header['County']
 
-    #For 'AS OF' date:
-    report_as_of_date = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", header)[0]
-    
-    #Remove headers from all pages
-    text = re.sub(r"""[A-Z0-9 ()/]*\n\n\s*[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""",'', text)
-    
-    #Use if statement to check for county names inside the header info
-    if header.count('MAVERICK') >= 1:
-        county = 'Maverick'
-    elif header.count('DIMMIT') >= 1:
-        county = 'Dimmit'
-    elif header.count('ZAVALA') >= 1:
-        county = 'Zavala'
-    else:
-        county = 'Something went wrong!'
-    
-    #Now split each case by the dashed lines
-    cases = text.split('-------------------------------------------------------------------------------------------------------------')
-    
-    #Drop the last case. It only consists of the count of cases in the pdf. Not needed here
-    cases.pop()
-    
-    #Loop through each case and build a dictionary with its info
-    for case in cases:
-        
-        #Remove leading whitespace only
-        case = case.lstrip()
-        
-        #Split on the '/n'
-        case_info = case.split('\n')
-        
-        #Gather the case data
-        case_list = extract_civil_case_data(case_info, county)
-        
-        #Finally, append this dictionary to the container dict
-        case_dicts.extend(case_list)
+    #Build the df straight from the cases as they are parsed
+    df = pd.DataFrame(iterate_civil_case_records(itertools.chain([first_pages], pages), county))
 
     #How many cases were collected?
-    print(f"Collected Data From {len(case_dicts)} Cases.")
-
-    #Create df
-    df = pd.DataFrame(case_dicts)
+    print(f"Collected Data From {len(df)} Cases.")
 
     #Add 'Report Generated Date', 'Original As Of Date', 'Last As Of Date', and 'Comments' columns
     df["Report Generated Date"] = report_generated_date
@@ -270,6 +450,20 @@ def build_civil_cases_dataframe(text):
         
     return df
 
+def build_civil_cases_dataframe(text):
+    """
+    This function takes in the entire civil pending cases PDF document as a string of text. It will hand the text to
+    build_civil_cases_dataframe_from_pages one page at a time and return the dataframe of all cases.
+    
+    Parameter:
+        - text: A string consisting of the text of the entire civil pending cases PDF document.
+        
+    Returns:
+        - df: A dataframe of the newly gathered civil case info
+    """
+
+    return build_civil_cases_dataframe_from_pages(split_into_pages(text))
+
 def build_civil_disposed_cases_dataframe(text):
     """
     This function takes in the entire PDF document as a string of text. It will gather the info for each case
@@ -288,7 +482,6 @@ def build_civil_disposed_cases_dataframe(text):
     case_list = []
     dispo_dates_list = []
     disposition_list = []
-    #coa_list = []
     temp_dict = {}
     
     #Create a var to count the number of disposed dates
@@ -300,23 +493,15 @@ def build_civil_disposed_cases_dataframe(text):
     #Get the body and remove surrounding whitespace
     body = text[420:].strip()
     
-    #Get the report 'AS OF' date:
-    report_as_of_date = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{2}", header)[1]
-    
-    #Use if statement to check for county names inside the header info
-    if header.count('MAVERICK') >= 1:
-        county = 'Maverick'
-    elif header.count('DIMMIT') >= 1:
-        county = 'Dimmit'
-    elif header.count('ZAVALA') >= 1:
-        county = 'Zavala'
-    else:
-        county = 'Something went wrong!'
+    #Find the county and the 'AS OF' date in the header
+    report_header = PROD_classify.classify_header(header, 'Civil Disposed')
+    report_as_of_date = report_header['As Of Date']
+    county = report_header['County']
         
     #Set up regex to remove all subsequent headers
     #This regex should identify the headers even if some of the info changes later on
     #Can't include the page break in this regex because the formatting is awful
-    body = re.sub(r"""\s*[A-Z]{3,9}\s[0-9]{1,2},\s[0-9]{4}\s[a-zA-Z0-9 \n/-]*:[a-zA-Z0-9 \n/-]*:[A-Za-z0-9 \n\./-]*DEFENDANT\s{1,23}\n""", '', body)
+    body = civil_disposed_header_pattern.sub('', body)
     
     #Since the formatting is awful, manually remove the page break symbol '\n\x0c'
     body = body.replace('\n\x0c','')
@@ -331,12 +516,16 @@ def build_civil_disposed_cases_dataframe(text):
     #Remove cases that happen to be empty or consist of whitespace only
     cases = [case for case in cases if case.isspace() == False and len(case) > 0]
     
+    #Look up the columns of each field before looping over the lines
+    cause_number_slice, case_dispo_date_slice, case_disposition_slice = get_line_slices('Civil Disposed Case', ['Cause Number', 'Disposed Date', 'Disposition'])
+    dispo_date_slice, disposition_slice = get_line_slices('Civil Disposed Continuation', ['Disposed Date', 'Disposition'])
+
     for line in cases:
         #Check if line is the start of a new case
         if not line[0].isspace():
             #Check if the temp_dict is empty.
             #If not, add temp_dict data to case_list
-            if bool(temp_dict) == True:
+            if temp_dict:
                 #Save the last date as the case file date
                 temp_dict['File Date'] = dispo_dates_list[-1]
 
@@ -350,65 +539,25 @@ def build_civil_disposed_cases_dataframe(text):
 
                 temp_dict['Dispositions'] = disposition_list[:file_date_starting_line - 1]
 
-                #temp_dict['Causes of Action'] = coa_list[:file_date_starting_line - 1]
-
-                #temp_dict['Plaintiffs'] = disposition_list[file_date_starting_line - 1:]
-
-                #temp_dict['Defendants'] = coa_list[file_date_starting_line - 1:]
-
                 #Add temp dict data to case_list
                 case_list.append(temp_dict)
 
-            #Reset temp_dict
-            temp_dict = {}
-
-            #Reset lists
-            dispo_dates_list = []
-            disposition_list = []
-            #coa_list = []
-            
-            temp_dict['County'] = county
-
-            #Gather the cause number
-            temp_dict['Cause Number'] = line[:17].strip()
-
-            #Get the first dispo date
-            dispo_dates_list.append(line[17:29].strip())
-
-            #Get first disposition
-            disposition_list.append(line[29:64].strip())
+            #Start the next case with its county and cause number
+            temp_dict = {'County': county, 'Cause Number': line[cause_number_slice].strip()}
 
-            #Get first coa
-            #coa_list.append(line[64:].strip())
-
-            #End of line, so move to next one
+            #Get the first dispo date and disposition
+            dispo_dates_list = [line[case_dispo_date_slice].strip()]
+            disposition_list = [line[case_disposition_slice].strip()]
 
         else:
-            #Get additional dispo date
-            dispo_date = line[17:29].strip()
-
-            #Check if dispo_date is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if dispo_date.isspace() == False and len(dispo_date) > 0:
-                dispo_dates_list.append(dispo_date.strip())
-
-            #Get additional disposition
-            disposition = line[29:64].strip()
-
-            #Check if disposition is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if disposition.isspace() == False and len(disposition) > 0:
-                disposition_list.append(disposition.strip())
+            #Get the additional dispo date and disposition if they aren't blank
+            dispo_date = line[dispo_date_slice].strip()
+            if dispo_date:
+                dispo_dates_list.append(dispo_date)
 
-            #Get additional coa
-            #coa = line[64:].strip()
-
-            #Check if coa is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            #if coa.isspace() == False and len(coa) > 0:
-                #coa_list.append(coa.strip())
-
-            #End of line
+            disposition = line[disposition_slice].strip()
+            if disposition:
+                disposition_list.append(disposition)
 
     #Check that the last case was added to the list
     #If not, add it
@@ -425,12 +574,6 @@ def build_civil_disposed_cases_dataframe(text):
 
     temp_dict['Dispositions'] = disposition_list[:file_date_starting_line - 1]
 
-    #temp_dict['Causes of Action'] = coa_list[:file_date_starting_line - 1]
-
-    #temp_dict['Plaintiffs'] = disposition_list[file_date_starting_line - 1:]
-
-    #temp_dict['Defendants'] = coa_list[file_date_starting_line - 1:]
-
     #Add temp dict data to case_list
     case_list.append(temp_dict)
     
@@ -476,41 +619,29 @@ def build_criminal_cases_dataframe(text):
     #We'll use this to identify the county later
     header = text[:500]
 
-    #Use regex to find the 'AS OF' and 'RAN ON' dates
-    dates = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", header)
-    #For 'RAN ON' date:
-    report_generated_date = dates[0]
-
-    #For 'AS OF' date:
-    report_as_of_date = dates[1]
+    #Find the county and the 'AS OF' and 'RAN ON' dates in the header
+    report_header = PROD_classify.classify_header(header, 'Criminal')
+    report_generated_date = report_header['Report Generated Date']
+    report_as_of_date = report_header['As Of Date']
+    county = report_header['County']
     
     #Body
     body = text[500:]
     
     #Remove leading and trailing whitespaces from the body text
     body = body.strip()
-    
-    #Use if statement to check for county names inside the header info
-    if header.count('MAVERICK') >= 1:
-        county = 'Maverick'
-    elif header.count('DIMMIT') >= 1:
-        county = 'Dimmit'
-    elif header.count('ZAVALA') >= 1:
-        county = 'Zavala'
-    else:
-        county = 'Something went wrong!'
         
     #Set up regex to remove all subsequent headers
     #This regex should identify the headers even if the name of the district clerk changes later on
-    body = re.sub(r"""\n\x0c\s*[A-Z -]*\d{2}/\d{2}/\d{4}\n\s*\w{6,8}[A-Z0-9 -]*\n\s*[A-Z ]*\d{2}/\d{2}/\d{4}[A-Z0-9 -]*\n\n[A-Z ]*#\s*[A-Z -']*\n[A-Z0-9/ -]*\n\n""", '', body)
+    body = criminal_header_pattern.sub('', body)
     
     #########################################################################################################
     #Now remove the last divider sections using regex
-    body = re.sub(r"""\nTOTAL NUMBER OF CASES FILED: [0-9\n-]*MTR-A[A-Z\n ]*[-]*""", '', body)
+    body = criminal_cases_filed_total_pattern.sub('', body)
     
-    body = re.sub(r"""\n{0,1}TOTAL NUMBER OF MTR-A FILINGS: [0-9\n-]*ALL OTHER CASES ADDED/APPEALED[\n-]*""", '', body)
+    body = criminal_mtr_filings_total_pattern.sub('', body)
     
-    body = re.sub(r"""\n{0,1}TOTAL NUMBER OF CASES ADDED/APPEALED: [0-9- a-zA-Z\.#;,:'=\n]*""", '', body)
+    body = criminal_cases_added_total_pattern.sub('', body)
     
     #########################################################################################################
     
@@ -520,13 +651,18 @@ def build_criminal_cases_dataframe(text):
     #Remove cases that happen to be empty or consist of whitespace only
     cases = [case for case in cases if case.isspace() == False and len(case) > 0]
     
+    #Look up the columns of each field before looping over the lines
+    cause_number_slice, file_date_slice, court_slice, docket_date_slice, warrants_slice = get_line_slices('Criminal Case',
+        ['Cause Number', 'File Date', 'Court', 'Docket Date', 'Outstanding Warrants'])
+    attorney_slice, offense_slice, st_rpt_slice = get_line_slices('Criminal Continuation', ['Attorney', 'First Offense', 'ST RPT Column'])
+
     #Loop through each line. Add case info to temp dict, and then add that to the case list
     for line in cases:
         #Check if line is the start of a new case
         if not line[0].isspace():
             #Check if the temp_dict is empty.
             #If not, add temp_dict data to case_list
-            if bool(temp_dict) == True:
+            if temp_dict:
                 #Add list info to temp_dict
                 temp_dict['Attorney'] = list(set(attorney_names))
                 temp_dict['First Offense'] = offense_list
@@ -535,66 +671,35 @@ def build_criminal_cases_dataframe(text):
                 #Add temp dict data to case_list
                 case_list.append(temp_dict)
 
-            #Reset temp_dict
-            temp_dict = {}
-
             #Reset lists
             attorney_names = []
             offense_list = []
             st_rpt_list = []
 
-            #Assign county
-            temp_dict['County'] = county
-
-            #Gather the cause number
-            temp_dict['Cause Number'] = line[:22].strip()
-
-            #Gather the file date
-            temp_dict['File Date'] = line[22:34].strip()
-
+            #Assign county, and gather the cause number, file date, court, docket date and outstanding warrants
             #As of 13 June 2023, we are no longer collecting names
-            #Get defendant name
-            #temp_dict['Defendant'] = line[34:72].strip()
-        
-            #Get court
-            temp_dict['Court'] = line[72:79].strip()
-
-            #Get docket date
-            temp_dict['Docket Date'] = line[79:89].strip()
-
-            #Get outstanding warrants
-            temp_dict['Outstanding Warrants'] = line[89:].strip()
-
-            #End of line, so move to next one
+            temp_dict = {
+                'County': county,
+                'Cause Number': line[cause_number_slice].strip(),
+                'File Date': line[file_date_slice].strip(),
+                'Court': line[court_slice].strip(),
+                'Docket Date': line[docket_date_slice].strip(),
+                'Outstanding Warrants': line[warrants_slice].strip()
+            }
 
         else:
-            #As of 13 June 2023, we are no longer collecting names
-            
-            #Get attorney name
-            attorney_name = line[:35].strip()
-
-            #Check if attorney_name is all whitesapace. If not, strip it and add to names list
-            #Also check that the string is not empty
-            if attorney_name.isspace() == False and len(attorney_name) > 0:
-                attorney_names.append(attorney_name.strip())
-
-            #Get first offense
-            offense = line[35:74].strip()
-
-            #Check if offense is all whitesapace. If not, strip it and add to names list
-            #Also check that the string is not empty
-            if offense.isspace() == False and len(offense) > 0:
-                offense_list.append(offense.strip())
-
-            #Get ST RPT Column
-            st_rpt = line[74:].strip()
-
-            #Check if st_rpt is all whitesapace. If not, strip it and add to names list
-            #Also check that the string is not empty
-            if st_rpt.isspace() == False and len(st_rpt) > 0:
-                st_rpt_list.append(st_rpt.strip())
-
-            #End of line
+            #Get the attorney name, first offense and ST RPT column if they aren't blank
+            attorney_name = line[attorney_slice].strip()
+            if attorney_name:
+                attorney_names.append(attorney_name)
+
+            offense = line[offense_slice].strip()
+            if offense:
+                offense_list.append(offense)
+
+            st_rpt = line[st_rpt_slice].strip()
+            if st_rpt:
+                st_rpt_list.append(st_rpt)
         
     #Check that the last case was added to the list
     #If not, add it
@@ -650,22 +755,14 @@ def build_criminal_disposed_cases_dataframe(text):
     #Get the body and remove surrounding whitespace
     body = text[420:].strip()
     
-    #Get the 'AS OF' date:
-    report_as_of_date = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", header)[1]
-    
-    #Use if statement to check for county names inside the header info
-    if header.count('MAVERICK') >= 1:
-        county = 'Maverick'
-    elif header.count('DIMMIT') >= 1:
-        county = 'Dimmit'
-    elif header.count('ZAVALA') >= 1:
-        county = 'Zavala'
-    else:
-        county = 'Something went wrong!'
+    #Find the county and the 'AS OF' date in the header
+    report_header = PROD_classify.classify_header(header, 'Criminal Disposed')
+    report_as_of_date = report_header['As Of Date']
+    county = report_header['County']
         
     #Set up regex to remove all subsequent headers
     #This regex should identify the headers even if some of the info changes later on
-    body = re.sub(r"""\n\x0c\s*[A-Z]{3,9}\s[0-9]{1,2},\s[0-9]{4}\s[a-zA-Z0-9 \n:/-]*#\s*[A-Z /]*\n\n""", '', body)
+    body = criminal_disposed_header_pattern.sub('', body)
     
     #Split the text on the \n to isolate each case
     cases = body.split('\n')
@@ -676,14 +773,17 @@ def build_criminal_disposed_cases_dataframe(text):
     #Remove cases that happen to be empty or consist of whitespace only
     cases = [case for case in cases if case.isspace() == False and len(case) > 0]
     
+    #Look up the columns of each field before looping over the lines
+    cause_number_slice, case_dispo_date_slice, case_disposition_slice = get_line_slices('Criminal Disposed Case', ['Cause Number', 'Disposed Date', 'Disposition'])
+    dispo_date_slice, disposition_slice = get_line_slices('Criminal Disposed Continuation', ['Disposed Date', 'Disposition'])
+
     #Loop through each line. Add case info to temp dict, and then add that to the case list
-    #Most fields are commented out because we don't need that info yet.
     for line in cases:
         #Check if line is the start of a new case
         if not line[0].isspace():
             #Check if the temp_dict is empty.
             #If not, add temp_dict data to case_list
-            if bool(temp_dict) == True:
+            if temp_dict:
                 #Add list info to temp_dict
                 temp_dict['Disposed Dates'] = dispo_dates_list
                 temp_dict['Dispositions'] = disposition_list
@@ -692,54 +792,22 @@ def build_criminal_disposed_cases_dataframe(text):
                 #Add temp dict data to case_list
                 case_list.append(temp_dict)
 
-            #Reset temp_dict
-            temp_dict = {}
-
-            #Reset lists
-            dispo_dates_list = []
-            disposition_list = []
-            
-            #Assign the county name
-            temp_dict['County'] = county
-
-            #Gather the cause number
-            temp_dict['Cause Number'] = line[:17].strip()
-
-            #Gather the defendant name
-            #temp_dict['Defendant'] = line[17:45].strip()
-
-            #Get first dispo date
-            dispo_dates_list.append(line[45:55].strip())
-
-            #Get first disposition
-            disposition_list.append(line[55:78].strip())
+            #Start the next case with the county name and cause number
+            temp_dict = {'County': county, 'Cause Number': line[cause_number_slice].strip()}
 
-            #Get complainant
-            #temp_dict['Complainant'] = line[78:110].strip()
-
-            #Get bondsman
-            #temp_dict['Bondsman'] = line[110:].strip()
-
-            #End of line, so move to next one
+            #Get first dispo date and disposition
+            dispo_dates_list = [line[case_dispo_date_slice].strip()]
+            disposition_list = [line[case_disposition_slice].strip()]
 
         else:
-            #Get additional dispo date
-            dispo_date = line[45:55].strip()
-
-            #Check if dispo_date is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if dispo_date.isspace() == False and len(dispo_date) > 0:
-                dispo_dates_list.append(dispo_date.strip())
+            #Get the additional dispo date and disposition if they aren't blank
+            dispo_date = line[dispo_date_slice].strip()
+            if dispo_date:
+                dispo_dates_list.append(dispo_date)
 
-            #Get additional disposition
-            disposition = line[55:78].strip()
-
-            #Check if disposition is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if disposition.isspace() == False and len(disposition) > 0:
-                disposition_list.append(disposition.strip())
-
-            #End of line
+            disposition = line[disposition_slice].strip()
+            if disposition:
+                disposition_list.append(disposition)
 
     #Check that the last case was added to the list
     #If not, add it
@@ -791,12 +859,12 @@ def build_juvenile_cases_dataframe(text):
     #Get the body and remove surrounding whitespace
     body = text[450:].strip()
     
-    #Get the 'AS OF' date:
-    report_as_of_date = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", header)[0]
+    #Find the 'AS OF' date in the header
+    report_as_of_date = PROD_classify.classify_header(header, 'Juvenile')['As Of Date']
         
     #Set up regex to remove all subsequent headers
     #This regex should identify the headers even if some of the info changes later on
-    body = re.sub(r"""\n\x0c\s*[A-Z0-9 \(\)\n/#\:-]*\.\sDATE""", '', body)
+    body = juvenile_header_pattern.sub('', body)
     
     #Split the text on the \n to isolate each case
     cases = body.split('\n')
@@ -807,17 +875,17 @@ def build_juvenile_cases_dataframe(text):
     #Remove cases that happen to be empty or consist of whitespace only
     cases = [case for case in cases if case.isspace() == False and len(case) > 0]
     
+    #Look up the columns of each field before looping over the lines
+    cause_number_slice, file_date_slice = get_line_slices('Juvenile Case', ['Cause Number', 'File Date'])
+    offense_slice, docket_date_slice, dispo_date_slice = get_line_slices('Juvenile Continuation', ['Offense', 'Docket Date', 'Disposed Date'])
+
     #Loop through each line. Add case info to temp dict, and then add that to the case list
-    #Some fields are commented out because we don't need that info yet.
     for line in cases:
-        if line.isspace() or len(line) == 0:
-            continue
-
         #Check if line is the start of a new case
         if not line[0].isspace():
             #Check if the temp_dict is empty.
             #If not, add temp_dict data to case_list
-            if bool(temp_dict) == True:
+            if temp_dict:
                 #Add list info to temp_dict
                 temp_dict['Offense'] = offense_list
                 temp_dict['Docket Date'] = docket_date_list
@@ -826,54 +894,27 @@ def build_juvenile_cases_dataframe(text):
                 #Add temp dict data to case_list
                 case_list.append(temp_dict)
 
-            #Reset temp_dict
-            temp_dict = {}
-
             #Reset lists
             offense_list = []
             docket_date_list = []
             dispo_date_list = []
 
-            #Gather the cause number
-            temp_dict['Cause Number'] = line[:26].strip()
-
-            #Gather the file date
-            temp_dict['File Date'] = line[26:38].strip()
-
-            #Get court
-            #temp_dict['Court'] = line[38:70].strip()
-
-            #Get respondent
-            #temp_dict['Respondent'] = line[70:].strip()
-
-            #End of line, so move to next one
+            #Gather the cause number and file date
+            temp_dict = {'Cause Number': line[cause_number_slice].strip(), 'File Date': line[file_date_slice].strip()}
 
         else:
-            #Get offenses
-            offense = line[5:88].strip()
-
-            #Check if offense is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if offense.isspace() == False and len(offense) > 0:
-                offense_list.append(offense.strip())
-
-            #Get Docket Date
-            docket_date = line[88:98].strip()
-
-            #Check if offense is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if docket_date.isspace() == False and len(docket_date) > 0:
-                docket_date_list.append(docket_date.strip())
-
-            #Get Disposition Date
-            dispo_date = line[98:].strip()
-
-            #Check if offense is all whitesapace. If not, strip it and add to list
-            #Also check that the string is not empty
-            if dispo_date.isspace() == False and len(dispo_date) > 0:
-                dispo_date_list.append(dispo_date.strip())
-
-            #End of line
+            #Get the offense, docket date and disposition date if they aren't blank
+            offense = line[offense_slice].strip()
+            if offense:
+                offense_list.append(offense)
+
+            docket_date = line[docket_date_slice].strip()
+            if docket_date:
+                docket_date_list.append(docket_date)
+
+            dispo_date = line[dispo_date_slice].strip()
+            if dispo_date:
+                dispo_date_list.append(dispo_date)
         
     #Check that the last case was added to the list
     #Add list info to temp_dict
@@ -922,27 +963,16 @@ def build_civil_inactive_cases_dataframe(text):
     #We'll use this to identify the county later
     header = text[:370]
 
-    #Use regex to find the 'AS OF' and 'RAN ON' dates
-    dates = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", header)
-
-    #For 'AS OF' date:
-    report_as_of_date = dates[1]
-    
-    #For county, check the name at the beginning of the header
-    if header.count('LEOPOLDO VIELMA') >= 1:
-        county = 'Maverick'
-    elif header.count('MARICELA G. GONZALEZ') >= 1:
-        county = 'Dimmit'
-    elif header.count('RACHEL P. RAMIREZ') >= 1:
-        county = 'Zavala'
-    else:
-        county = 'Unknown'
+    #Find the county and the 'AS OF' date in the header. The county comes from the clerk name at the beginning of the header
+    report_header = PROD_classify.classify_header(header, 'Civil Inactive')
+    report_as_of_date = report_header['As Of Date']
+    county = report_header['County']
     
     #Body
     body = text[370:]
     
     #Remove subsequent page headers
-    body = re.sub(r"""\s*[A-Z\.\' \n-]*\d{2}/\d{2}/\d{4}\n\s*[A-Z0-9 \:-]*\d{2}/\d{2}/\d{4}[A-Z0-9 \n#-]*INACTIVE REASON\s{29}""", '', body)
+    body = civil_inactive_header_pattern.sub('', body)
     
     #Split the text on the '\n' to isolate each case
     cases = body.split('\n')
@@ -958,11 +988,16 @@ def build_civil_inactive_cases_dataframe(text):
     if num_cases == '0':
         return pd.DataFrame()
     
+    #Look up the columns of each field before looping over the lines
+    inactive_fields = ['Inactive Start Date', 'Inactive End Date', 'Inactive Reason']
+    cause_number_slice, file_date_slice, case_start_date_slice, case_end_date_slice, case_reason_slice = get_line_slices('Civil Inactive Case', ['Cause Number', 'File Date'] + inactive_fields)
+    start_date_slice, end_date_slice, reason_slice = get_line_slices('Civil Inactive Continuation', inactive_fields)
+
     for case in cases:
         #Check to see if this line is the start of a new case
         if case[:35].isspace() == False:
             #Check if the temp_dict is empty
-            if bool(temp_dict) == True:
+            if temp_dict:
                 #Reverse the lists so that the newest dates appear first
                 inactive_start_list.reverse()
                 inactive_end_list.reverse()
@@ -973,54 +1008,30 @@ def build_civil_inactive_cases_dataframe(text):
                 temp_dict['Inactive Reason'] = inactive_reason_list
                 
                 case_list.append(temp_dict)
-                
-            #Reset temp_dict and lists
-            temp_dict = {}
-            inactive_start_list = []
-            inactive_end_list = []
-            inactive_reason_list = []
-            
-            #Assign county
-            temp_dict['County'] = county
-
-            #Gather the cause number
-            temp_dict['Cause Number'] = case[:27].strip()
 
-            #Gather the file date
-            temp_dict['File Date'] = case[27:44].strip()
+            #Assign county, cause number, file date, status and case type
+            temp_dict = {
+                'County': county,
+                'Cause Number': case[cause_number_slice].strip(),
+                'File Date': case[file_date_slice].strip(),
+                'Status': 'Inactive',
+                'Case Type': 'Civil'
+            }
 
-            #Get inactive start date
-            inactive_start_list.append(case[44:54].strip())
+            #Get the inactive start date, end date and reason
+            inactive_start_list = [case[case_start_date_slice].strip()]
+            inactive_end_list = [case[case_end_date_slice].strip()]
+            inactive_reason_list = [case[case_reason_slice].strip()]
 
-            #Get inactive end date
-            inactive_end_list.append(case[54:73].strip())
-
-            #Assign Status
-            temp_dict['Status'] = 'Inactive'
-            
-            #Assign Case Type
-            temp_dict['Case Type'] = 'Civil'
-
-            #Get inactive reason
-            inactive_reason_list.append(case[73:].strip())
-
-            #End of line, so move to next one
-            
         else:
             #This line is a continuation of the same case
-            #Just grab the start and end dates
-            #As well as the reason
-            #Get inactive start date
-            inactive_start_list.append(case[44:54].strip())
-
-            #Get inactive end date
-            inactive_end_list.append(case[54:73].strip())
-
-            #Get inactive reason
-            inactive_reason_list.append(case[73:].strip())
+            #Just grab the start and end dates, as well as the reason
+            inactive_start_list.append(case[start_date_slice].strip())
+            inactive_end_list.append(case[end_date_slice].strip())
+            inactive_reason_list.append(case[reason_slice].strip())
             
     #Make sure the last case gets added
-    if bool(temp_dict) == True:
+    if temp_dict:
         inactive_start_list.reverse()
         inactive_end_list.reverse()
         inactive_reason_list.reverse()
@@ -1068,27 +1079,16 @@ def build_criminal_inactive_cases_dataframe(text):
     #We'll use this to identify the county later
     header = text[:370]
 
-    #Use regex to find the 'AS OF' and 'RAN ON' dates
-    dates = re.findall(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", header)
-
-    #For 'AS OF' date:
-    report_as_of_date = dates[1]
-    
-    #For county, check the name at the beginning of the header
-    if header.count('LEOPOLDO VIELMA') >= 1:
-        county = 'Maverick'
-    elif header.count('MARICELA G. GONZALEZ') >= 1:
-        county = 'Dimmit'
-    elif header.count('RACHEL P. RAMIREZ') >= 1:
-        county = 'Zavala'
-    else:
-        county = 'Unknown'
+    #Find the county and the 'AS OF' date in the header. The county comes from the clerk name at the beginning of the header
+    report_header = PROD_classify.classify_header(header, 'Criminal Inactive')
+    report_as_of_date = report_header['As Of Date']
+    county = report_header['County']
     
     #Body
     body = text[368:]
     
     #Remove all subsequent headers with regex
-    body = re.sub(r"""\n\x0c\s*[A-Z\.\' \n-]*\d{2}/\d{2}/\d{4}\n\s*[A-Z0-9 \:-]*\d{2}/\d{2}/\d{4}[A-Z0-9 \n#-]*STATE REPORT COLUMN\n\n""", '', body)
+    body = criminal_inactive_header_pattern.sub('', body)
     
     #Split the text on the '\n' to isolate each case
     cases = body.split('\n')
@@ -1104,11 +1104,17 @@ def build_criminal_inactive_cases_dataframe(text):
     if num_cases == '0':
         return pd.DataFrame()
     
+    #Look up the columns of each field before looping over the lines
+    case_fields = ['Cause Number', 'File Date', 'State Report', 'Inactive Start Date', 'Inactive End Date', 'Inactive Reason']
+    first_case_slices = get_line_slices('Criminal Inactive First Case', case_fields)
+    case_slices = get_line_slices('Criminal Inactive Case', case_fields)
+    start_date_slice, end_date_slice, reason_slice = get_line_slices('Criminal Inactive Continuation', case_fields[3:])
+
     for case in cases:
         #Check to see if this line is the start of a new case
         if case[:35].isspace() == False:
             #Check if the temp_dict is empty
-            if bool(temp_dict) == True:
+            if temp_dict:
                 #Reverse the lists so that the newest dates appear first
                 inactive_start_list.reverse()
                 inactive_end_list.reverse()
@@ -1120,90 +1126,42 @@ def build_criminal_inactive_cases_dataframe(text):
                 
                 case_list.append(temp_dict)
 
+                #Reset lists
+                inactive_start_list = []
+                inactive_end_list = []
+                inactive_reason_list = []
+                cause_number_slice, file_date_slice, state_report_slice, case_start_date_slice, case_end_date_slice, case_reason_slice = case_slices
+
             else:
                 #This would be the first line, so left strip it and gather info
+                #The lines before it stay in the lists, ahead of its own dates
                 case = case.lstrip()
-                
-                #Assign county
-                temp_dict['County'] = county
-                
-                #Gather the cause number
-                temp_dict['Cause Number'] = case[:19].strip()
-
-                #Gather the file date
-                temp_dict['File Date'] = case[19:31].strip()
-
-                #Get inactive start date
-                inactive_start_list.append(case[31:44].strip())
-
-                #Get inactive end date
-                inactive_end_list.append(case[44:56].strip())
-
-                #Assign Status
-                temp_dict['Status'] = 'Inactive'
-
-                #Assign Case Type
-                temp_dict['Case Type'] = 'Criminal'
-
-                #Get inactive reason
-                inactive_reason_list.append(case[56:88].strip())
-
-                #Get State Report
-                temp_dict['State Report'] = case[88:].strip()
+                cause_number_slice, file_date_slice, state_report_slice, case_start_date_slice, case_end_date_slice, case_reason_slice = first_case_slices
+
+            #Assign county, cause number, file date, status, case type and state report
+            temp_dict = {
+                'County': county,
+                'Cause Number': case[cause_number_slice].strip(),
+                'File Date': case[file_date_slice].strip(),
+                'Status': 'Inactive',
+                'Case Type': 'Criminal',
+                'State Report': case[state_report_slice].strip()
+            }
+
+            #Get the inactive start date, end date and reason
+            inactive_start_list.append(case[case_start_date_slice].strip())
+            inactive_end_list.append(case[case_end_date_slice].strip())
+            inactive_reason_list.append(case[case_reason_slice].strip())
 
-                #End of line, so move to next one
-                continue
-                
-            #Reset temp_dict and lists
-            temp_dict = {}
-            inactive_start_list = []
-            inactive_end_list = []
-            inactive_reason_list = []
-            
-            #Assign county
-            temp_dict['County'] = county
-
-            #Gather the cause number
-            temp_dict['Cause Number'] = case[:24].strip()
-
-            #Gather the file date
-            temp_dict['File Date'] = case[24:36].strip()
-
-            #Get inactive start date
-            inactive_start_list.append(case[36:49].strip())
-
-            #Get inactive end date
-            inactive_end_list.append(case[49:61].strip())
-
-            #Assign Status
-            temp_dict['Status'] = 'Inactive'
-            
-            #Assign Case Type
-            temp_dict['Case Type'] = 'Criminal'
-
-            #Get inactive reason
-            inactive_reason_list.append(case[61:93].strip())
-            
-            #Get State Report
-            temp_dict['State Report'] = case[93:].strip()
-
-            #End of line, so move to next one
-            
         else:
             #This line is a continuation of the same case
-            #Just grab the start and end dates
-            #As well as the reason
-            #Get inactive start date
-            inactive_start_list.append(case[36:49].strip())
-
-            #Get inactive end date
-            inactive_end_list.append(case[49:61].strip())
-
-            #Get inactive reason
-            inactive_reason_list.append(case[61:93].strip())
+            #Just grab the start and end dates, as well as the reason
+            inactive_start_list.append(case[start_date_slice].strip())
+            inactive_end_list.append(case[end_date_slice].strip())
+            inactive_reason_list.append(case[reason_slice].strip())
             
     #Make sure the last case gets added
-    if bool(temp_dict) == True:
+    if temp_dict:
         inactive_start_list.reverse()
         inactive_end_list.reverse()
         inactive_reason_list.reverse()
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+#Where the extracted text and parsed dataframes are saved between uploads
+cache_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdf_cache')
+
+#The most disk space the cache may use. Past this, the least recently used entries are deleted.
+max_cache_bytes = 256 * 1024 * 1024
+
+def get_file_hash(pdf_bytes):
+    """
+    This function takes in the bytes of a PDF and returns its SHA-256 hash. The same PDF uploaded again will always have the
+    same hash, so it can be used to find the text and dataframe saved the last time the PDF was processed.
+
+    Parameter:
+        - pdf_bytes: The PDF as bytes
+
+    Returns:
+        - string: The SHA-256 hash of the bytes as a hex string
+    """
+
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+def get_cache_path(key):
+    """
+    This function takes in a cache key and returns the path of the file that holds its value.
+
+    Parameter:
+        - key: A string made of letters, numbers, underscores and dashes
+
+    Returns:
+        - string: The path of the cache file
+    """
+
+    return os.path.join(cache_directory, key + '.pkl')
+
+def load_cached_value(key):
+    """
+    This function takes in a cache key and returns the value saved for it. Reading an entry marks it as recently used.
+    If the entry doesn't exist or can't be read, None is returned and the caller should rebuild the value.
+
+    Parameter:
+        - key: The cache key
+
+    Returns:
+        - value: The saved value, or None
+    """
+
+    cache_path = get_cache_path(key)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        #The entry is damaged, or it was saved by a version of pandas or numpy that can no longer load it.
+        #Unpickling can raise almost anything in that case, like an AttributeError or ModuleNotFoundError.
+        #Delete the entry so it is rebuilt and saved again.
+        remove_cache_file(cache_path)
+        return None
+
+    #Update the modified time so eviction keeps the entries that are still being used
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+    return value
+
+def save_cached_value(key, value):
+    """
+    This function takes in a cache key and a value and saves the value to the cache directory. The file is written under a
+    temporary name first, so a crash never leaves a half written entry behind. A failure to save is ignored since the cache
+    only saves time.
+
+    Parameters:
+        - key: The cache key
+        - value: Any value that can be pickled, like a string or a dataframe
+    """
+
+    temp_path = None
+
+    try:
+        os.makedirs(cache_directory, exist_ok = True)
+        fd, temp_path = tempfile.mkstemp(dir = cache_directory, suffix = '.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, get_cache_path(key))
+    except Exception:
+        #Pickling can fail partway through, so don't leave the temporary file behind
+        if temp_path is not None:
+            remove_cache_file(temp_path)
+        return
+
+    evict_cache_entries()
+
+def remove_cache_file(path):
+    """
+    This function takes in the path of a file in the cache directory and deletes it. A file that is already gone is ignored.
+
+    Parameter:
+        - path: The path of the file to delete
+    """
+
+    try:
+        os.remove(path)
+    except OSError:
+        return
+
+def evict_cache_entries():
+    """
+    This function deletes the least recently used cache entries until the cache directory is no bigger than max_cache_bytes.
+    """
+
+    try:
+        entries = []
+        for entry in os.scandir(cache_directory):
+            if entry.name.endswith('.pkl'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total_bytes = sum([size for mtime, size, path in entries])
+
+    #Delete the oldest entries first
+    for mtime, size, path in sorted(entries):
+        if total_bytes <= max_cache_bytes:
+            break
+        try:
+            os.remove(path)
+            total_bytes -= size
+        except OSError:
+            continue
@@ -0,0 +1,129 @@
+import re
+
+
+#The text in the header that identifies each report type. The order matters, since 'CASES DISPOSED' is checked last.
+report_type_headers = [
+    ('CRIMINAL DETAILED PENDING CASES', 'Criminal'),
+    ('CIVIL PENDING CASES', 'Civil'),
+    ('JUVENILE CASE FILINGS', 'Juvenile'),
+    ('CIVIL DISPOSED CASES', 'Civil Disposed'),
+    ('CASES DISPOSED', 'Criminal Disposed'),
+    ('PENDING CRIMINAL CASES - INACTIVITY REPORT', 'Criminal Inactive'),
+    ('PENDING CIVIL CASES - INACTIVITY REPORT', 'Civil Inactive')
+]
+
+#The county names printed in the header. The first one found wins. This won't work for Inactive reports.
+county_headers = [
+    ('MAVERICK', 'Maverick'),
+    ('DIMMIT', 'Dimmit'),
+    ('ZAVALA', 'Zavala'),
+    ('ALL COUNTIES', 'All Counties')
+]
+
+#The text that shows a report is only for the 293rd district court. The second one is for the civil disposed cases report.
+court_headers = ['293RD DISTRICT COURT', 'COURT: 293']
+
+#The inactivity reports don't print the county or court. Instead, the district clerk's name at the beginning of the header
+#tells us the county. If the name matches, it should be a 293rd district case.
+clerk_headers = [
+    ('LEOPOLDO VIELMA', 'Maverick'),
+    ('MARICELA G. GONZALEZ', 'Dimmit'),
+    ('RACHEL P. RAMIREZ', 'Zavala')
+]
+
+#One pattern that finds every piece of header text above in a single pass
+header_text_pattern = re.compile('|'.join(re.escape(text) for text in
+    [text for text, report_type in report_type_headers] +
+    [text for text, county in county_headers] +
+    court_headers +
+    [text for text, county in clerk_headers]))
+
+#Date patterns. The civil disposed cases report prints two digit years.
+date_pattern = re.compile(r"[0-9]{2}/[0-9]{2}/[0-9]{4}")
+short_date_pattern = re.compile(r"[0-9]{2}/[0-9]{2}/[0-9]{2}")
+long_date_pattern = re.compile(r"[A-Z]{3,9}\s[0-9]{2},\s[0-9]{4}")
+
+#Where to find the 'AS OF' date in the header of each report type: (pattern, which match to use)
+as_of_date_rules = {
+    'Criminal': (date_pattern, 1),
+    'Civil': (date_pattern, 0),
+    'Juvenile': (date_pattern, 0),
+    'Criminal Disposed': (date_pattern, 1),
+    'Civil Disposed': (short_date_pattern, 1),
+    'Criminal Inactive': (date_pattern, 1),
+    'Civil Inactive': (date_pattern, 1)
+}
+
+#Where to find the 'RAN ON' date in the header of the report types that use it: (pattern, which match to use)
+report_generated_date_rules = {
+    'Criminal': (date_pattern, 0),
+    'Civil': (long_date_pattern, 0)
+}
+
+def find_date(header, rule):
+    """
+    This function takes in a header and a (pattern, index) date rule and returns the date the rule points to.
+
+    Parameters:
+        - header: A string of the first part of the report text
+        - rule: A tuple of a compiled date pattern and which of its matches to use, or None
+
+    Returns:
+        - date: A string of the date found, or 'Unknown'
+    """
+
+    if rule is None:
+        return 'Unknown'
+
+    pattern, index = rule
+    dates = pattern.findall(header)
+
+    if len(dates) > index:
+        return dates[index]
+    else:
+        return 'Unknown'
+
+def classify_header(header, report_type = None):
+    """
+    This function takes in the header text of a report. It will scan the header once and return everything the upload
+    needs to know about the report: the county, the report type, whether or not it is for the 293rd district court, the
+    'AS OF' date and the 'RAN ON' date. The app uses it to check the batch, and the PROD_acquire parsers use it to read
+    their own headers.
+
+    Parameters:
+        - header: A string of the first part of the report text
+        - report_type: An optional string representing the report type. If given, the header isn't used to find it.
+
+    Returns:
+        - report_header: A dictionary with the 'County', 'Report Type', 'Is 293rd', 'As Of Date' and 'Report Generated Date'.
+          Anything that couldn't be found is 'Unknown'.
+    """
+
+    #Find every piece of known header text in one pass
+    found_text = set(header_text_pattern.findall(header))
+
+    #What type of report is this?
+    if report_type is None:
+        report_type = next((found_type for text, found_type in report_type_headers if text in found_text), 'Unknown')
+
+    #What county is this?
+    county = next((found_county for text, found_county in county_headers if text in found_text), 'Unknown')
+
+    #Is this only for 293rd district court?
+    #The inactive report does not indicate which court it is, so will default to False
+    is_293rd = any(text in found_text for text in court_headers)
+
+    #For Inactive report county, check the clerk name at the beginning of the header
+    if report_type == 'Criminal Inactive' or report_type == 'Civil Inactive':
+        county = next((found_county for text, found_county in clerk_headers if text in found_text), 'Unknown')
+        is_293rd = county != 'Unknown'
+
+    report_header = {
+        'County': county,
+        'Report Type': report_type,
+        'Is 293rd': is_293rd,
+        'As Of Date': find_date(header, as_of_date_rules.get(report_type)),
+        'Report Generated Date': find_date(header, report_generated_date_rules.get(report_type))
+    }
+
+    return report_header
@@ -0,0 +1,317 @@
+from pdfminer3.layout import LAParams
+from pdfminer3.pdfpage import PDFPage
+from pdfminer3.pdfinterp import PDFResourceManager
+from pdfminer3.pdfinterp import PDFPageInterpreter
+from pdfminer3.converter import TextConverter
+from concurrent.futures import ProcessPoolExecutor
+import io
+import multiprocessing
+import os
+import time
+import PROD_cache
+
+
+#How many pages each worker should handle when splitting one large PDF
+pages_per_task = 25
+
+#Change this whenever the extraction settings change, so text cached by the old settings isn't reused
+extractor_version = 1
+
+#The layout analysis settings every report is extracted with. The blank lines the header patterns look for and the line
+#offsets the parsers slice come from these. tests/benchmark_extract.py times other settings against them.
+layout_params = LAParams()
+
+def open_pdf_source(source):
+    """
+    This function takes in a PDF source and returns a binary file handle that pdfminer3 can read pages from. The source
+    can be a path on disk or the bytes of the PDF itself, like the buffer of a file from the streamlit file uploader.
+
+    Parameter:
+        - source: A path (string or Path), the PDF as bytes/bytearray/memoryview, or a binary file-like object such as BytesIO
+
+    Returns:
+        - fh: A binary file handle for the PDF
+        - should_close: A boolean representing whether or not the handle was opened here and should be closed by the caller
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb'), True
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        #Read the pages straight from memory. Nothing is written to disk.
+        return io.BytesIO(source), True
+    else:
+        #Already a file-like object. Start from the beginning, but leave it open for the caller.
+        source.seek(0)
+        return source, False
+
+def get_page_contents(source, page_numbers = None):
+    """
+    This function takes in a PDF, either as a path on disk or as the uploaded bytes. It is a generator that reads the PDF
+    with pdfminer3 and yields the text of each page as soon as that page is done, so a parser can start on the first pages
+    while the rest are still being extracted. Each page's text ends with a form feed.
+
+    Parameters:
+        - source: A path, the PDF as bytes/bytearray/memoryview, or a binary file-like object such as BytesIO
+        - page_numbers: An optional collection of zero-based page numbers to extract. If None, every page is extracted.
+
+    Yields:
+        - text: A string of the text content of one page
+    """
+    #Set up resource manager to handle pdf content. text, images, etc.
+    resource_manager = PDFResourceManager()
+
+    #Used to display text
+    fake_file_handle = io.StringIO()
+
+    #Set up converter
+    converter = TextConverter(resource_manager, fake_file_handle, laparams=layout_params)
+
+    #Set up page interpreter
+    page_interpreter = PDFPageInterpreter(resource_manager, converter)
+
+    fh, should_close = open_pdf_source(source)
+
+    try:
+        for page in PDFPage.get_pages(fh,
+                                    pagenos=page_numbers,
+                                    caching=True,
+                                    check_extractable=True):
+            page_interpreter.process_page(page)
+
+            #Hand off this page's text, then empty the handle for the next page
+            text = fake_file_handle.getvalue()
+            fake_file_handle.seek(0)
+            fake_file_handle.truncate(0)
+            yield text
+    finally:
+        # close open handles
+        if should_close:
+            fh.close()
+        converter.close()
+        fake_file_handle.close()
+
+def get_file_content(source, page_numbers = None):
+    """
+    This function takes in a PDF, either as a path on disk or as the uploaded bytes. It will read and return the text content
+    of the file using pdfminer3. The text content will be used in a following function for dataframe creation/prep.
+
+    Parameters:
+        - source: A path, the PDF as bytes/bytearray/memoryview, or a binary file-like object such as BytesIO
+        - page_numbers: An optional collection of zero-based page numbers to extract. If None, every page is extracted.
+
+    Returns:
+        - text: A string of the text content of the PDF
+    """
+
+    return ''.join(get_page_contents(source, page_numbers))
+
+def count_pages(source):
+    """
+    This function takes in a PDF and returns the number of pages in it. Only the page tree is read, so this is much faster
+    than extracting the text.
+
+    Parameter:
+        - source: A path, the PDF as bytes/bytearray/memoryview, or a binary file-like object such as BytesIO
+
+    Returns:
+        - page_count: An integer representing the number of pages in the PDF
+    """
+
+    fh, should_close = open_pdf_source(source)
+
+    try:
+        page_count = sum(1 for page in PDFPage.get_pages(fh, caching=True, check_extractable=True))
+    finally:
+        if should_close:
+            fh.close()
+
+    return page_count
+
+def get_timed_file_content(task):
+    """
+    This function takes in a (source, page_numbers) task, extracts the text and times how long it took. It is the function
+    each worker process runs, so it must stay at the top level of the module.
+
+    Parameter:
+        - task: A tuple of the PDF source and the page numbers to extract (or None for every page)
+
+    Returns:
+        - result: A dictionary with the 'Content' text and the 'Extract Seconds' it took
+    """
+
+    source, page_numbers = task
+    start_time = time.perf_counter()
+    content = get_file_content(source, page_numbers)
+
+    return {'Content': content, 'Extract Seconds': round(time.perf_counter() - start_time, 2)}
+
+def run_tasks(tasks, max_workers = None):
+    """
+    This function takes in a list of extraction tasks and runs them on separate processes. pdfminer3 is pure python and uses
+    the cpu the whole time, so running the files side by side means a batch takes about as long as its slowest file instead of
+    the sum of all of them. A single task is run in this process since starting a pool would only slow it down.
+
+    Parameters:
+        - tasks: A list of (source, page_numbers) tuples. Sources sent to other processes must be paths or bytes.
+        - max_workers: The most processes to use. Defaults to the number of cpus.
+
+    Returns:
+        - results: A list of result dictionaries, in the same order as the tasks
+    """
+
+    if len(tasks) <= 1 or os.cpu_count() == 1:
+        return [get_timed_file_content(task) for task in tasks]
+
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count())
+
+    #Start the workers as new interpreters instead of forking. Streamlit runs the app on its own threads, and a forked copy of
+    #a threaded process can hang on a lock some other thread was holding
+    mp_context = multiprocessing.get_context('spawn')
+
+    #map() returns the results in the order the tasks were given, no matter which finishes first
+    with ProcessPoolExecutor(max_workers = max_workers, mp_context = mp_context) as executor:
+        results = list(executor.map(get_timed_file_content, tasks))
+
+    return results
+
+def get_page_chunks(page_count):
+    """
+    This function takes in the number of pages in a PDF and splits the pages into chunks of pages_per_task pages.
+
+    Parameter:
+        - page_count: An integer representing the number of pages in the PDF
+
+    Returns:
+        - page_chunks: A list of sets of zero-based page numbers, in page order
+    """
+
+    return [set(range(first_page, min(first_page + pages_per_task, page_count))) for first_page in range(0, page_count, pages_per_task)]
+
+def get_file_contents(sources, max_workers = None):
+    """
+    This function takes in a list of PDFs and extracts the text of each one on separate processes. When there are fewer files
+    than processes, each file is also split into chunks of pages so a single large report is spread across the processes too.
+    pdfminer3 ends each page with a form feed, so the chunks joined back in page order are the same text as extracting the
+    whole file at once.
+
+    Parameters:
+        - sources: A list of paths or PDF bytes, in upload order
+        - max_workers: The most processes to use. Defaults to the number of cpus.
+
+    Returns:
+        - results: A list of dictionaries in upload order. Each has the 'Content' text and the 'Extract Seconds' spent on it.
+    """
+
+    #Only split the files when there would be processes left with nothing to do
+    worker_count = min(max_workers or os.cpu_count() or 1, os.cpu_count() or 1)
+    split_files = len(sources) < worker_count
+
+    #Build every file's tasks, remembering which of them belong to each file
+    tasks = []
+    file_task_indexes = []
+    for source in sources:
+        if split_files:
+            file_tasks = [(source, page_numbers) for page_numbers in get_page_chunks(count_pages(source))]
+        else:
+            file_tasks = [(source, None)]
+
+        file_task_indexes.append(range(len(tasks), len(tasks) + len(file_tasks)))
+        tasks += file_tasks
+
+    task_results = run_tasks(tasks, max_workers)
+
+    #Put each file's chunks back together in page order
+    results = []
+    for task_indexes in file_task_indexes:
+        results.append({
+            'Content': ''.join([task_results[i]['Content'] for i in task_indexes]),
+            'Extract Seconds': round(sum([task_results[i]['Extract Seconds'] for i in task_indexes]), 2)
+        })
+
+    return results
+
+def get_text_cache_key(file_hash):
+    """
+    This function takes in the hash of a PDF and returns the key its extracted text is cached under.
+
+    Parameter:
+        - file_hash: The SHA-256 hash of the PDF bytes
+
+    Returns:
+        - string: The cache key
+    """
+
+    return 'text_' + file_hash + '_v' + str(extractor_version)
+
+def get_cached_file_contents(pdf_bytes_list, max_workers = None):
+    """
+    This function takes in a list of uploaded PDFs as bytes. PDFs that were extracted before are loaded from the cache, and only
+    the new ones are extracted, on separate processes. The new text is then saved to the cache for the next upload.
+
+    Parameters:
+        - pdf_bytes_list: A list of the uploaded PDFs as bytes, in upload order
+        - max_workers: The most processes to use. Defaults to the number of cpus.
+
+    Returns:
+        - results: A list of dictionaries in upload order. Each has the 'Content' text, the 'Extract Seconds' it took, the
+          'File Hash' of the PDF, and whether or not it came 'From Cache'.
+    """
+
+    results = []
+    missing_indexes = []
+
+    #Check the cache for each file
+    for pdf_bytes in pdf_bytes_list:
+        start_time = time.perf_counter()
+        file_hash = PROD_cache.get_file_hash(pdf_bytes)
+        content = PROD_cache.load_cached_value(get_text_cache_key(file_hash))
+
+        if content is None:
+            missing_indexes.append(len(results))
+            results.append({'File Hash': file_hash, 'From Cache': False})
+        else:
+            results.append({'Content': content, 'Extract Seconds': round(time.perf_counter() - start_time, 2), 'File Hash': file_hash, 'From Cache': True})
+
+    #Extract the files that weren't cached and save their text
+    extracted_files = get_file_contents([pdf_bytes_list[i] for i in missing_indexes], max_workers)
+    for i, extracted_file in zip(missing_indexes, extracted_files):
+        results[i].update(extracted_file)
+        PROD_cache.save_cached_value(get_text_cache_key(results[i]['File Hash']), extracted_file['Content'])
+
+    return results
+
+def get_file_headers(pdf_bytes_list, max_workers = None):
+    """
+    This function takes in a list of uploaded PDFs as bytes and returns the header of each one. Only the first page is
+    extracted, so the batch can be checked in seconds before any full report is read. If a PDF's full text is already
+    cached, its header is taken from there.
+
+    Parameters:
+        - pdf_bytes_list: A list of the uploaded PDFs as bytes, in upload order
+        - max_workers: The most processes to use. Defaults to the number of cpus.
+
+    Returns:
+        - results: A list of dictionaries in upload order. Each has the 'Header' text and the 'File Hash' of the PDF.
+    """
+
+    results = []
+    missing_indexes = []
+
+    #Check the cache for each file
+    for pdf_bytes in pdf_bytes_list:
+        file_hash = PROD_cache.get_file_hash(pdf_bytes)
+        content = PROD_cache.load_cached_value(get_text_cache_key(file_hash))
+
+        if content is None:
+            missing_indexes.append(len(results))
+            results.append({'File Hash': file_hash})
+        else:
+            results.append({'Header': content[:500], 'File Hash': file_hash})
+
+    #Extract only the first page of the files that weren't cached
+    first_pages = run_tasks([(pdf_bytes_list[i], {0}) for i in missing_indexes], max_workers)
+    for i, first_page in zip(missing_indexes, first_pages):
+        results[i]['Header'] = first_page['Content'][:500]
+
+    return results
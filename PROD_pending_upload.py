@@ -1,10 +1,14 @@
 from codecs import ignore_errors
 import streamlit as st
 from datetime import date, datetime
+import os
 import pandas as pd
 import gspread
+from gspread.utils import rowcol_to_a1, a1_to_rowcol, numericise_all
 import PROD_acquire
 import PROD_prepare
+import PROD_sql_storage
+import PROD_workbook
 
 #Set up google sheet name vars
 google_sheet_name = 'Pending Reports'
@@ -23,18 +27,116 @@ criminal_inactive_sheet_name = 'Inactive Criminal Cases'
 civil_inactive_sheet_name = 'Inactive Civil Cases'
 report_tracker_sheet_name = 'Report Tracker'
 
-credentials = {
-  "type": st.secrets["type"],
-  "project_id": st.secrets["project_id"],
-  "private_key_id": st.secrets["private_key_id"],
-  "private_key" : st.secrets["private_key"],
-  "client_email": st.secrets["client_email"],
-  "client_id": st.secrets["client_id"],
-  "auth_uri": st.secrets["auth_uri"],
-  "token_uri": st.secrets["token_uri"],
-  "auth_provider_x509_cert_url": st.secrets["auth_provider_x509_cert_url"],
-  "client_x509_cert_url": st.secrets["client_x509_cert_url"]
-}
+#Where the case tables are kept. By default, every tab lives in the 'Pending Reports' google sheet. The 'storage_backend' secret can
+#change this:
+#   - 'sqlite': The tables are kept in a local SQLite database, and export_to_google_sheets() copies them to the sheet.
+#   - 'local_file': Each tab is a CSV file in the 'local_file_directory' secret, or the local_workbook directory next to the app.
+#   - 'memory': Each tab is kept in memory until the app restarts. Useful for trying out uploads without touching real data.
+if 'storage_backend' in st.secrets:
+    storage_backend = st.secrets['storage_backend']
+else:
+    storage_backend = 'google_sheets'
+
+#Where the 'local_file' backend keeps its CSV files if 'local_file_directory' isn't in the secrets
+default_local_file_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'local_workbook')
+
+#A workbook set with use_workbook(). If set, it is used instead of the storage backend.
+workbook_override = None
+
+def get_credentials():
+    """
+    This function builds the google service account credentials from the secrets. They are only read when the google sheet is
+    opened, so the other storage backends don't need them.
+
+    Returns:
+        - credentials: A dictionary of the service account credentials
+    """
+
+    credentials = {
+      "type": st.secrets["type"],
+      "project_id": st.secrets["project_id"],
+      "private_key_id": st.secrets["private_key_id"],
+      "private_key" : st.secrets["private_key"],
+      "client_email": st.secrets["client_email"],
+      "client_id": st.secrets["client_id"],
+      "auth_uri": st.secrets["auth_uri"],
+      "token_uri": st.secrets["token_uri"],
+      "auth_provider_x509_cert_url": st.secrets["auth_provider_x509_cert_url"],
+      "client_x509_cert_url": st.secrets["client_x509_cert_url"]
+    }
+
+    return credentials
+
+@st.cache_resource
+def get_spreadsheet():
+    """
+    This function connects to the 'Pending Reports' google sheet. It uses st.cache_resource, so the credentials are only exchanged
+    and the spreadsheet is only opened once per app session. Every upload function and the streamlit app share this connection.
+    The client refreshes its own access token whenever it expires, so the cached connection can be reused for the whole session.
+
+    If a 'google_sheet_key' is included in the secrets, the spreadsheet is opened by key. This avoids searching google drive
+    for the spreadsheet name. Otherwise, it is opened by name like before.
+
+    If the storage backend is 'local_file' or 'memory', a PROD_workbook workbook is returned instead. It has the same
+    worksheet() method, and its worksheets have the same methods the upload functions use.
+
+    Returns:
+        - gsheet: The 'Pending Reports' google spreadsheet, or the local workbook
+    """
+
+    if storage_backend == 'memory':
+        return PROD_workbook.MemoryWorkbook()
+    elif storage_backend == 'local_file':
+        if 'local_file_directory' in st.secrets:
+            return PROD_workbook.LocalFileWorkbook(st.secrets['local_file_directory'])
+        else:
+            return PROD_workbook.LocalFileWorkbook(default_local_file_directory)
+
+    #Set up credentials to interact with Google Sheets
+    gc = gspread.service_account_from_dict(get_credentials())
+
+    #Open 'Pending Reports' Google Sheet By Key if we have it, otherwise By Name
+    if 'google_sheet_key' in st.secrets:
+        gsheet = gc.open_by_key(st.secrets['google_sheet_key'])
+    else:
+        gsheet = gc.open(google_sheet_name)
+
+    return gsheet
+
+def use_workbook(workbook):
+    """
+    This function takes in a workbook to use instead of the storage backend, like a PROD_workbook.MemoryWorkbook filled with
+    test data. This way the whole update_spreadsheet() pipeline can be run and timed offline. Pass None to go back to the
+    storage backend.
+
+    Parameter:
+        - workbook: Any object with a worksheet(title) method, or None
+    """
+    global workbook_override
+
+    workbook_override = workbook
+
+    #Forget the tabs and report tracker summary of the previous workbook
+    get_worksheet.clear()
+    get_report_tracker_summary.clear()
+
+@st.cache_resource
+def get_worksheet(sheet_name):
+    """
+    This function takes in the name of a tab in the 'Pending Reports' google sheet and returns the connection to that tab.
+    The connection is cached, so each tab is only looked up once per app session.
+
+    Parameter:
+        - sheet_name: The name of the tab, e.g. 'Common Table'
+
+    Returns:
+        - worksheet: The google sheet tab with the given name
+    """
+
+    if workbook_override is not None:
+        return workbook_override.worksheet(sheet_name)
+
+    return get_spreadsheet().worksheet(sheet_name)
 
 def convert_to_bool(value):
     """
@@ -58,24 +160,375 @@ def convert_to_bool(value):
     else:
         return ''
 
-def find_next_available_row(worksheet):
+def convert_to_sheet_string(value):
+    """
+    This function takes in a single cell value and converts it to the string that would be displayed in the google sheet.
+    Values read back with get_all_records() don't always have the same type as the values we upload (for example, '293' comes
+    back as 293 and True comes back as "TRUE"), so both sides are compared as sheet strings.
+
+    Parameter:
+        - value: The cell value
+
+    Returns:
+        - str: The cell value as it would appear in the google sheet
+    """
+
+    if value is True:
+        return 'TRUE'
+    elif value is False:
+        return 'FALSE'
+    elif value is None or (isinstance(value, float) and value != value):
+        #Empty cells and NaN's are both blank in the sheet
+        return ''
+    else:
+        return str(value)
+
+def serialize_dataframe(df):
+    """
+    This function takes in a dataframe that is about to be written to the google sheet and turns its typed date columns back
+    into the MM/DD/YYYY strings the sheet stores. Only the report tracker's 'Report Date' is kept typed. The case tables keep
+    their dates as the sheet's strings, since 'Docket Date' and 'Disposed Dates' hold newline-joined date histories and the
+    other date columns are only copied between tables, never compared.
+
+    Parameter:
+        - df: The dataframe to be written
+
+    Returns:
+        - df: A copy of the dataframe with every datetime64 column as strings, or the same dataframe if it has none
+    """
+
+    date_columns = df.select_dtypes(include = ['datetime64']).columns
+
+    if len(date_columns) == 0:
+        return df
+
+    df = df.copy()
+    for column in date_columns:
+        df[column] = PROD_prepare.format_report_dates(df[column])
+
+    return df
+
+def update_worksheet(worksheet, df, current_records):
+    """
+    This function takes in a google sheet, the dataframe that should be on it, and the records that were read from it with
+    get_all_records(). Instead of clearing the sheet and uploading every row again, it will compare the new dataframe with the
+    current records and send only the rows that changed, the appended rows, and blank rows for any rows that were removed.
+    All of the changes are sent in a single batch_update request.
+
+    If the sheet is empty or its columns don't match the dataframe, the whole sheet is cleared and uploaded like before.
+
+    Parameters:
+        - worksheet: The google sheet to update
+        - df: The dataframe that should be on the google sheet once the update is done
+        - current_records: The list of records currently on the google sheet, as returned by get_all_records()
+
+    Returns:
+        - Nothing.
+    """
+
+    #Dates are written as strings
+    df = serialize_dataframe(df)
+
+    new_values = [df.columns.values.tolist()] + df.values.tolist()
+
+    #If there's nothing to compare against, or the columns have changed, upload the whole sheet
+    if len(current_records) == 0 or list(current_records[0].keys()) != new_values[0]:
+        worksheet.clear()
+        worksheet.update(new_values)
+        return
+
+    current_values = [new_values[0]] + [list(record.values()) for record in current_records]
+
+    #If the new dataframe has fewer rows than the sheet, blank out the leftover rows
+    if len(current_values) > len(new_values):
+        new_values = new_values + [[''] * len(new_values[0])] * (len(current_values) - len(new_values))
+
+    #Find the rows that changed. Consecutive changed rows are grouped into one range
+    changed_ranges = []
+    for i in range(1, len(new_values)):
+        if i < len(current_values) and list(map(convert_to_sheet_string, new_values[i])) == list(map(convert_to_sheet_string, current_values[i])):
+            continue
+
+        if len(changed_ranges) > 0 and changed_ranges[-1][1] == i - 1:
+            changed_ranges[-1][1] = i
+        else:
+            changed_ranges.append([i, i])
+
+    #Nothing changed, so there's nothing to send
+    if len(changed_ranges) == 0:
+        return
+
+    #Sheet rows start at 1, so row i of new_values is sheet row i + 1
+    data = []
+    for first_row, last_row in changed_ranges:
+        data.append({
+            'range': rowcol_to_a1(first_row + 1, 1) + ':' + rowcol_to_a1(last_row + 1, len(new_values[0])),
+            'values': new_values[first_row:last_row + 1]
+        })
+
+    worksheet.batch_update(data)
+
+def convert_to_sheet_strings(df):
+    """
+    This function takes in a dataframe and returns a copy with every value converted to the string the google sheet would display.
+    This is how the tables are stored in the SQLite database, so they read back the same way get_all_records() reads a tab.
+
+    Parameter:
+        - df: The dataframe to convert
+
+    Returns:
+        - df: A dataframe of strings with the same columns
+    """
+
+    df = serialize_dataframe(df)
+
+    return pd.DataFrame({column: [convert_to_sheet_string(value) for value in df[column]] for column in df.columns}, columns = df.columns)
+
+def convert_to_sheet_records_df(df):
+    """
+    This function takes in a dataframe that was written to a tab and returns the dataframe a fresh read of the tab would give:
+    every value as the google sheet displays it, with numbers converted back to ints and floats the way get_all_records() does,
+    and a new index. Python types like True and the dataframe's old index don't survive the trip through the sheet.
+
+    Parameter:
+        - df: The dataframe written to the tab
+
+    Returns:
+        - df: The dataframe as it would be read back from the tab
     """
-    This function takes in a google spreadsheet and finds the first available row. It will return a string representing the first
-    empty cell in the first column.
+
+    rows_df = convert_to_sheet_strings(df)
+    columns = rows_df.columns.tolist()
+
+    return pd.DataFrame([dict(zip(columns, numericise_all(row))) for row in rows_df.values.tolist()])
+
+def load_table_records(sheet_name):
+    """
+    This function takes in the name of a tab and returns its rows from the storage backend, the same way get_all_records() does.
 
     Parameter:
-        - worksheet: The google sheet you wish to find the first available row for
+        - sheet_name: The name of the tab to read
 
     Returns:
-        - str: The first available cell in the first row. Represented in A1 format
+        - records: A list of dictionaries, one per row
+    """
+
+    if storage_backend == 'sqlite':
+        return PROD_sql_storage.load_records(sheet_name)
+    else:
+        return get_worksheet(sheet_name).get_all_records()
+
+def save_table(sheet_name, df, current_records):
+    """
+    This function takes in the name of a tab, the dataframe that should be on it, and the records it was read with. Only the rows that
+    changed are sent to the storage backend.
+
+    Parameters:
+        - sheet_name: The name of the tab to write
+        - df: The dataframe that should be on the tab once the save is done
+        - current_records: The list of records read from the tab with load_table_records()
+    """
+
+    if storage_backend == 'sqlite':
+        #The database finds the changed rows itself with an upsert
+        PROD_sql_storage.save_table(sheet_name, convert_to_sheet_strings(df))
+    else:
+        update_worksheet(get_worksheet(sheet_name), df, current_records)
+
+def append_table_rows(sheet_name, df):
     """
-    #Count the number of unavailable rows
-    num_unavailable_rows = len(list(worksheet.col_values(1)))
+    This function takes in the name of a tab and a dataframe of rows to add to the bottom of it, without reading the tab first.
+
+    Parameters:
+        - sheet_name: The name of the tab to add rows to
+        - df: The dataframe of rows to add
+    """
+
+    if storage_backend == 'sqlite':
+        PROD_sql_storage.append_rows(sheet_name, convert_to_sheet_strings(df))
+        return
 
-    #Add one and create the string
-    first_available_row = 'A' + str(num_unavailable_rows + 1)
+    rows_df = serialize_dataframe(df)
+    worksheet = get_worksheet(sheet_name)
 
-    return first_available_row
+    #Let the google sheet find the bottom of the tab itself. This is a single request, no matter how many rows the tab already has
+    response = worksheet.append_rows(rows_df.values.tolist(), value_input_option = 'RAW', table_range = 'A1')
+
+    #If the rows landed on the first row, the tab was empty, so add the column names above them
+    updated_range = response['updates']['updatedRange'].split('!')[-1]
+    if a1_to_rowcol(updated_range.split(':')[0])[0] == 1:
+        worksheet.insert_row(rows_df.columns.values.tolist(), 1, value_input_option = 'RAW')
+
+def export_to_google_sheets(sheet_names = None):
+    """
+    This function copies the tables in the SQLite database to the 'Pending Reports' google sheet. Each tab is compared with its
+    table and only the changed rows are sent, so exporting again after an upload is quick. Only used with the 'sqlite' storage backend.
+
+    Parameter:
+        - sheet_names: An optional list of the tabs to export. If None, every table in the database is exported.
+    """
+
+    if sheet_names is None:
+        sheet_names = PROD_sql_storage.get_table_names()
+
+    for sheet_name in sheet_names:
+        worksheet = get_worksheet(sheet_name)
+        update_worksheet(worksheet, pd.DataFrame(PROD_sql_storage.load_records(sheet_name)), worksheet.get_all_records())
+
+#While an upload batch is open, each tab is read from the google sheet once and kept in the batch, along with the records it was
+#read from. The upload functions read and write these dataframes, and the changes are only sent to the google sheet when the batch
+#is closed. Streamlit runs every user's session in the same process, so the batch is kept in st.session_state. That way two users
+#uploading at the same time each have their own batch.
+upload_batch_key = 'Upload Batch'
+
+def get_upload_batch():
+    """
+    This function returns the upload batch open in the current session.
+
+    Returns:
+        - batch: A dictionary with the 'Snapshot' of each tab read during the batch and the 'Pending Rows' waiting to be added
+                 to tabs that haven't been read. None if no batch is open.
+    """
+
+    return st.session_state.get(upload_batch_key)
+
+def open_upload_batch():
+    """
+    This function opens an upload batch. Until the batch is closed, every tab is downloaded at most once and all changes are
+    kept in memory. This way, uploading several reports together only reads and writes the Common Table once.
+    """
+
+    #Start with an empty snapshot
+    st.session_state[upload_batch_key] = {'Snapshot': {}, 'Pending Rows': {}}
+
+def close_upload_batch():
+    """
+    This function closes the upload batch and sends all changes made during the batch to the 'Pending Reports' google sheet, or to
+    the SQLite database if that is the storage backend. Each changed tab is written once. Tabs that were only added to get their
+    new rows appended to the bottom in a single request.
+
+    The batch is removed from the session before anything is sent, so a failed write can't leave the batch open.
+    """
+
+    batch = st.session_state.pop(upload_batch_key, None)
+    if batch is None:
+        return
+
+    #Write the tabs that changed
+    for sheet_name, tab in batch['Snapshot'].items():
+        if tab['changed'] == True:
+            save_table(sheet_name, tab['df'], tab['records'])
+
+    #Add the new rows to the bottom of the tabs that were never read
+    for sheet_name, rows in batch['Pending Rows'].items():
+        append_table_rows(sheet_name, pd.concat(rows, ignore_index = True))
+
+    #The report tracker summary is cached until the report tracker is written, so read it again on the next run
+    if batch['Snapshot'].get(report_tracker_sheet_name, {}).get('changed') == True:
+        get_report_tracker_summary.clear()
+
+def get_batch_checkpoint(batch):
+    """
+    This function takes in an upload batch and returns a copy of its current state. The dataframes in the snapshot are replaced,
+    never changed in place, so only the dictionaries holding them need to be copied.
+
+    Parameter:
+        - batch: The upload batch from get_upload_batch()
+
+    Returns:
+        - checkpoint: A copy of the batch that can be passed to restore_batch_checkpoint()
+    """
+
+    return {
+        'Snapshot': {sheet_name: dict(tab) for sheet_name, tab in batch['Snapshot'].items()},
+        'Pending Rows': {sheet_name: list(rows) for sheet_name, rows in batch['Pending Rows'].items()}
+    }
+
+def restore_batch_checkpoint(batch, checkpoint):
+    """
+    This function takes in an upload batch and a checkpoint from get_batch_checkpoint(), and puts the batch back the way it was
+    when the checkpoint was taken. This drops the changes of a report that failed partway through.
+
+    Parameters:
+        - batch: The upload batch from get_upload_batch()
+        - checkpoint: The checkpoint to restore
+    """
+
+    batch['Snapshot'] = checkpoint['Snapshot']
+    batch['Pending Rows'] = checkpoint['Pending Rows']
+
+def read_worksheet(sheet_name):
+    """
+    This function takes in the name of a tab and returns its data as a dataframe. The tab is only downloaded the first time it is
+    read during an upload batch. After that, the version in the snapshot is returned, including any changes made by earlier reports.
+    Either way, the dataframe is the same as the one a fresh read of the tab would give, with a new index and the sheet's types.
+
+    Parameter:
+        - sheet_name: The name of the tab to read
+
+    Returns:
+        - df: A copy of the tab's data
+    """
+
+    batch = get_upload_batch()
+
+    if sheet_name not in batch['Snapshot']:
+        #Load the data currently on the tab in the 'Pending Reports' spreadsheet
+        records = load_table_records(sheet_name)
+        df = pd.DataFrame(records)
+        changed = False
+
+        #Add any rows that are waiting to be appended to this tab
+        if sheet_name in batch['Pending Rows']:
+            df = pd.concat([df] + batch['Pending Rows'].pop(sheet_name), ignore_index = True)
+            changed = True
+
+        #The rows read from the tab are already in the sheet's types. Added rows aren't, so they are converted the next time
+        #the tab is read
+        batch['Snapshot'][sheet_name] = {'records': records, 'df': df, 'changed': changed, 'read df': None if changed else df}
+
+    tab = batch['Snapshot'][sheet_name]
+
+    #Convert the dataframe last written to the tab, the first time it is read again
+    if tab['read df'] is None:
+        tab['read df'] = convert_to_sheet_records_df(tab['df'])
+
+    return tab['read df'].copy()
+
+def write_worksheet(sheet_name, df):
+    """
+    This function takes in the name of a tab and the dataframe that should be on it. The dataframe is saved in the snapshot and
+    will be sent to the google sheet when the upload batch is closed. The tab must have been read during the batch first.
+    The dataframe is sent as it was written, so values like True keep their type in the sheet. Reading the tab again during the
+    batch returns it the way the sheet would.
+
+    Parameters:
+        - sheet_name: The name of the tab to write
+        - df: The dataframe that should be on the tab
+    """
+
+    tab = get_upload_batch()['Snapshot'][sheet_name]
+    tab['df'] = df.reset_index(drop = True)
+    tab['changed'] = True
+    tab['read df'] = None
+
+def append_worksheet_rows(sheet_name, df):
+    """
+    This function takes in the name of a tab and a dataframe of rows to add to the bottom of it. If the tab was already read during
+    the upload batch, the rows are added to the snapshot. Otherwise, the tab is not downloaded and the rows are held until the
+    batch is closed.
+
+    Parameters:
+        - sheet_name: The name of the tab to add rows to
+        - df: The dataframe of rows to add
+    """
+
+    batch = get_upload_batch()
+
+    if sheet_name in batch['Snapshot']:
+        write_worksheet(sheet_name, pd.concat([batch['Snapshot'][sheet_name]['df'], df], ignore_index = True))
+    else:
+        batch['Pending Rows'].setdefault(sheet_name, []).append(df.copy())
 
 def convert_to_common_table_df(case_df):
     """
@@ -192,36 +645,244 @@ def convert_to_common_table_df(case_df):
 
     return df
 
+def carry_over_case_history(new_cases_df, current_cases_df):
+    """
+    This function takes in the newly created cases df and the cases currently pending in the same county. For each case found in both,
+    it will carry over the 'Original As Of Date' and build the accumulated 'Docket Date' history. If the docket date has changed and is not
+    blank, the new docket date is placed above the old ones. Otherwise, the old docket dates are kept as they are.
+
+    The current cases are indexed on cause number and joined to the new cases in one pass, instead of searching the new cases df
+    once for every pending case.
+
+    Parameters:
+        - new_cases_df: The newly created dataframe from the most recent report
+        - current_cases_df: The dataframe of cases currently pending in the same county as the new report
+
+    Returns:
+        - new_cases_df: The same dataframe with the 'Original As Of Date' and 'Docket Date' columns updated
+    """
+
+    #Index the current cases on cause number. If a cause number is listed more than once, the last version wins
+    current_cases = current_cases_df.drop_duplicates(subset = ['Cause Number'], keep = 'last').set_index('Cause Number')
+
+    #Only the first docket date listed for a cause number in the new report is compared with the docket date history
+    new_docket_dates = new_cases_df.drop_duplicates(subset = ['Cause Number'], keep = 'first').set_index('Cause Number')['Docket Date']
+    new_docket_dates = new_docket_dates.reindex(current_cases.index).astype(str).str.strip()
+    current_docket_dates = current_cases['Docket Date'].astype(str).str.strip()
+
+    #If the new docket date is not blank and not already in the history, append the old ones to the new one
+    docket_history = [new_date + '\n' + current_dates if len(new_date) > 0 and current_dates.find(new_date) == -1 else current_dates
+                        for new_date, current_dates in zip(new_docket_dates, current_docket_dates)]
+    docket_history = pd.Series(docket_history, index = current_cases.index, dtype = object)
+
+    #Join the carried over values back onto the new cases by cause number
+    is_pending = new_cases_df['Cause Number'].isin(current_cases.index)
+    pending_cause_numbers = new_cases_df.loc[is_pending, 'Cause Number']
+    new_cases_df.loc[is_pending, 'Original As Of Date'] = pending_cause_numbers.map(current_cases['Original As Of Date'])
+    new_cases_df.loc[is_pending, 'Docket Date'] = pending_cause_numbers.map(docket_history)
+
+    return new_cases_df
+
+def close_open_cases(common_table_df, closed_cases_df, columns):
+    """
+    This function takes in the common table df and a df of cases that were just dropped or disposed. It will find the 'Open' version
+    of each of those cases in the common table and copy over the given columns from the closed case, including the new 'Status'.
+
+    The open rows are found once for the whole batch of closed cases, and the values are looked up by cause number, so the
+    cost does not grow with the number of closed cases times the size of the common table.
+
+    Parameters:
+        - common_table_df: The common table dataframe
+        - closed_cases_df: The dataframe of newly dropped or disposed cases
+        - columns: The list of columns to copy from the closed cases into the common table
+
+    Returns:
+        - common_table_df: The same common table dataframe with the closed cases updated
+    """
+
+    #Find the open versions of the closed cases. Only these rows change status
+    is_open = (common_table_df['Status'] == 'Open') & (common_table_df['Cause Number'].isin(closed_cases_df['Cause Number']))
+
+    if is_open.any():
+        #Once a case is closed it is no longer open, so only the first closed version of each cause number is used
+        closed_cases = closed_cases_df.drop_duplicates(subset = ['Cause Number'], keep = 'first').set_index('Cause Number')
+        open_cause_numbers = common_table_df.loc[is_open, 'Cause Number']
+
+        for column in columns:
+            common_table_df.loc[is_open, column] = open_cause_numbers.map(closed_cases[column])
+
+    return common_table_df
+
+def merge_into_common_table(common_table_df, report_cases_df):
+    """
+    This function takes in the common table df and the cases from the current report, already in common table format. Each case
+    is matched to the common table on its cause number and status. A matched row is only rewritten if one of its values changed,
+    and cases that aren't in the common table yet are added to the bottom. The rest of the common table isn't rewritten, so
+    apart from one pass to drop repeated cases, the work grows with the number of cases that changed in the report instead of
+    the size of the common table. Matched rows also keep their place, so the google sheet diff only sends the rows that changed.
+
+    Closing a case that was reopened can leave two rows with the same cause number and status in the common table. These are
+    still removed on every merge, keeping the last row, the same way appending the cases and dropping duplicates did.
+
+    Parameters:
+        - common_table_df: The common table dataframe
+        - report_cases_df: The current report's cases in common table format, from convert_to_common_table_df
+
+    Returns:
+        - common_table_df: The common table dataframe with the report's cases merged in
+    """
+
+    #If a case is listed more than once with the same status, the last version wins
+    report_cases_df = report_cases_df.drop_duplicates(subset = ['Cause Number', 'Status'], keep = 'last')
+
+    if len(common_table_df) == 0:
+        return report_cases_df.reset_index(drop = True)
+
+    #Remove the repeated cases in the common table, then match the report's cases to the rows that are left
+    common_table_df = common_table_df.drop_duplicates(subset = ['Cause Number', 'Status'], ignore_index = True, keep = 'last')
+    common_keys = pd.MultiIndex.from_frame(common_table_df[['Cause Number', 'Status']])
+    report_keys = pd.MultiIndex.from_frame(report_cases_df[['Cause Number', 'Status']])
+
+    #Split the report's cases into the ones already in the common table and the new ones
+    is_listed = report_keys.isin(common_keys)
+    new_cases_df = report_cases_df[~is_listed]
+    listed_cases_df = report_cases_df[is_listed].set_index(['Cause Number', 'Status'])
+
+    #Line up the listed cases with their common table rows
+    matched_rows = common_keys.isin(listed_cases_df.index).nonzero()[0]
+    columns = listed_cases_df.columns.tolist()
+    for column in columns:
+        if column not in common_table_df.columns:
+            common_table_df[column] = None
+    new_values = listed_cases_df.reindex(common_keys[matched_rows])
+    current_values = common_table_df.loc[matched_rows, columns]
+
+    #Only rewrite the rows with a changed value. The common table was read from the sheet, so compare both as sheet strings
+    is_changed = [list(map(convert_to_sheet_string, new_row)) != list(map(convert_to_sheet_string, current_row))
+                    for new_row, current_row in zip(new_values.values.tolist(), current_values.values.tolist())]
+    changed_rows = matched_rows[is_changed]
+
+    if len(changed_rows) > 0:
+        #Numbers read from the sheet may be replaced by strings, so let every column hold any type
+        for column in columns:
+            if common_table_df[column].dtype != object:
+                common_table_df[column] = common_table_df[column].astype(object)
+        common_table_df.loc[changed_rows, columns] = new_values[is_changed].values
+
+    return pd.concat([common_table_df, new_cases_df], ignore_index = True)
+
 def update_report_tracker(report):
     """
     This function will update the report tracker tab with the 'As Of Date' of the report just uploaded.
     This allows us to keep track of the which reports were uploaded last and if any still need to be uploaded
     before continuing with a future date.
     """
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
-    #Make connection to 'DEV_Report_Tracker'
-    report_tracker_sheet = gsheet.worksheet(report_tracker_sheet_name)
-
     #Load the data currently on the report tracker tab in the 'Pending Reports' spreadsheet
-    report_tracker_df = pd.DataFrame(report_tracker_sheet.get_all_records())
+    report_tracker_df = read_worksheet(report_tracker_sheet_name)
 
     #Verify the columns are string types. Google sheets can mess with the data types
     report_tracker_df['County'] = report_tracker_df['County'].astype(str).str.strip()
     report_tracker_df['Report Type'] = report_tracker_df['Report Type'].astype(str).str.strip()
 
+    #Keep the report dates typed. They are turned back into MM/DD/YYYY strings when the tab is written
+    report_tracker_df['Report Date'] = PROD_prepare.parse_report_dates(report_tracker_df['Report Date'])
+
     #Update the df with the new report date and load datetime
-    report_tracker_df.loc[(report_tracker_df['County'] == report['County']) & (report_tracker_df['Report Type'] == report['Report Type']), ['Report Date']] = report['As Of Date']
+    report_tracker_df.loc[(report_tracker_df['County'] == report['County']) & (report_tracker_df['Report Type'] == report['Report Type']), ['Report Date']] = PROD_prepare.parse_report_date(report['As Of Date'])
     report_tracker_df.loc[(report_tracker_df['County'] == report['County']) & (report_tracker_df['Report Type'] == report['Report Type']), ['Load DateTime']] = report['Load DateTime']
 
-    #Finally upload the common_table_df to the common table worksheet in 'Pending Reports' spreadsheet
-    report_tracker_sheet.clear()
+    #Finally upload the changes to the report tracker worksheet in 'Pending Reports' spreadsheet
     report_tracker_df.sort_values(by = ['County','Report Type'], ignore_index=True, inplace=True)
-    report_tracker_sheet.update([report_tracker_df.columns.values.tolist()] + report_tracker_df.values.tolist())
+    write_worksheet(report_tracker_sheet_name, report_tracker_df)
+
+#The counties and report types shown on the report tracker, in the order they are listed in the sidebar.
+#The sidebar calls the pending reports 'Civil Pending' and 'Criminal Pending'. Juvenile reports cover every county.
+tracked_counties = ['Dimmit', 'Maverick', 'Zavala']
+tracked_report_types = {
+    'Civil': 'Civil Pending',
+    'Civil Inactive': 'Civil Inactive',
+    'Civil Disposed': 'Civil Disposed',
+    'Criminal': 'Criminal Pending',
+    'Criminal Inactive': 'Criminal Inactive',
+    'Criminal Disposed': 'Criminal Disposed'
+}
+
+@st.cache_data
+def get_report_tracker_summary():
+    """
+    This function reads the report tracker tab and finds the latest report date for every county and report type in a single
+    groupby. It uses st.cache_data, so the tab is only read again after an upload batch writes new report dates to it.
+
+    Returns:
+        - summary: A dictionary with:
+            - 'Last As Of Dates': The latest report date (a Timestamp, or NaT) for each report type and county. 'Juvenile' has one date.
+            - 'As Of Dates': A list of every date in 'Last As Of Dates', in sidebar order
+            - 'Max As Of Date': The latest of those dates, or NaT
+            - 'Missing Reports': A list of the report names, e.g. 'Dimmit Civil', that aren't at the max as of date yet
+            - 'Sidebar': A list of (subheader, lines) tuples to display in the sidebar
+    """
+
+    #Load the data currently on the report tracker tab in the 'Pending Reports' spreadsheet
+    report_tracker_df = pd.DataFrame(load_table_records(report_tracker_sheet_name))
+
+    if len(report_tracker_df) > 0:
+        #Verify the columns are string types. Google sheets can mess with the data types
+        report_tracker_df['County'] = report_tracker_df['County'].astype(str).str.strip()
+        report_tracker_df['Report Type'] = report_tracker_df['Report Type'].astype(str).str.strip()
+
+        #Parse the report dates, so max() compares dates instead of strings
+        report_tracker_df['Report Date'] = PROD_prepare.parse_report_dates(report_tracker_df['Report Date'].astype(str).str.strip())
+
+        #Find the latest report date of every county and report type at once
+        latest_report_dates = report_tracker_df.groupby(['Report Type', 'County'])['Report Date'].max()
+    else:
+        latest_report_dates = pd.Series([], index = pd.MultiIndex.from_tuples([], names = ['Report Type', 'County']), dtype = 'datetime64[ns]')
+
+    #Create a dictionary that we can use to store the last as of date for each county and report type
+    last_as_of_dict = {}
+    for report_type in tracked_report_types:
+        last_as_of_dict[report_type] = {county: latest_report_dates.get((report_type, county), pd.NaT) for county in tracked_counties}
+
+    #The juvenile report isn't split by county, so use its latest date across every county
+    if 'Juvenile' in latest_report_dates.index.get_level_values('Report Type'):
+        last_as_of_dict['Juvenile'] = latest_report_dates.loc['Juvenile'].max()
+    else:
+        last_as_of_dict['Juvenile'] = pd.NaT
+
+    #List every report in sidebar order, along with its latest date
+    tracked_reports = []
+    for county in tracked_counties:
+        for report_type in tracked_report_types:
+            tracked_reports.append((county, report_type, last_as_of_dict[report_type][county]))
+    tracked_reports.append(('Juvenile', 'Juvenile', last_as_of_dict['Juvenile']))
+
+    as_of_date_list = [report_date for county, report_type, report_date in tracked_reports]
+
+    #Find the max as of date. Reports without a date are missing too
+    max_as_of_date = pd.Series(as_of_date_list, dtype = 'datetime64[ns]').max()
+    readable_max_as_of_date = PROD_prepare.format_report_date(max_as_of_date)
+
+    missing_reports = []
+    for county, report_type, report_date in tracked_reports:
+        if PROD_prepare.format_report_date(report_date) != readable_max_as_of_date:
+            missing_reports.append(county if report_type == 'Juvenile' else county + ' ' + report_type)
+
+    #Build the sidebar lines for each county
+    sidebar = []
+    for county in tracked_counties:
+        lines = ["Latest " + report_name + " Report Date: " + PROD_prepare.format_report_date(last_as_of_dict[report_type][county]) for report_type, report_name in tracked_report_types.items()]
+        sidebar.append((county + " County", lines))
+    sidebar.append(("Juvenile Cases", ["Latest Juvenile Report Date: " + PROD_prepare.format_report_date(last_as_of_dict['Juvenile'])]))
+
+    summary = {
+        'Last As Of Dates': last_as_of_dict,
+        'As Of Dates': as_of_date_list,
+        'Max As Of Date': max_as_of_date,
+        'Missing Reports': missing_reports,
+        'Sidebar': sidebar
+    }
+
+    return summary
 
 
 def update_spreadsheet(report):
@@ -230,10 +891,51 @@ def update_spreadsheet(report):
     and build civil and criminal case dataframes. Then, it will load the data currently stored in the 'Pending Reports'
     google sheet and turn it into a dataframe. Finally, it will append the dataframes appropriately, drop duplicates,
     and then upload the updated data to the 'Pending Reports' google sheet.
+
+    If the app has opened an upload batch, the changes are kept in the batch snapshot and sent when the batch is closed.
+    Otherwise, a batch is opened and closed just for this report. If the report fails partway through, its changes are
+    dropped from the batch, so closing the batch afterwards only sends the reports that finished.
     """
-    
-    #Extract the PDF data
-    df = PROD_acquire.build_dataframe(report['Report Type'], report['Content'])
+
+    #If no upload batch is open, open one for this report only
+    is_single_report = get_upload_batch() is None
+    if is_single_report:
+        open_upload_batch()
+
+    batch = get_upload_batch()
+    checkpoint = get_batch_checkpoint(batch)
+
+    try:
+        update_report_tables(report)
+    except Exception:
+        #Drop this report's changes and let the app report the error
+        restore_batch_checkpoint(batch, checkpoint)
+        raise
+    finally:
+        #Send the changes for this report if it isn't part of a larger batch
+        if is_single_report:
+            close_upload_batch()
+
+def update_report_tables(report):
+    """
+    This function takes in a report, extracts its cases and updates the tabs it belongs to in the open upload batch,
+    along with the report tracker.
+
+    Parameter:
+        - report: The report dictionary built by the app
+
+    Returns:
+        - Nothing.
+    """
+
+    #Every table written for this report uses the same load timestamp. The app creates one load context for the whole batch.
+    load_context = report.get('Load Context')
+    if load_context is None:
+        load_context = PROD_prepare.get_load_context(report['As Of Date'])
+        report['Load DateTime'] = load_context['Load DateTime']
+
+    #Extract the PDF data. If this exact PDF was parsed before, the saved dataframe is used instead.
+    df = PROD_acquire.build_cached_dataframe(report['Report Type'], report['Content'], report.get('File Hash'))
 
     #The juvenile case reports are different than the others, so will need separate string of logic
     #The inactive cases will also need a separate string of logic
@@ -243,21 +945,21 @@ def update_spreadsheet(report):
         disposed_juvenile_cases = df[df["Disposed Dates"].str.len() > 0]
 
         #Prepare pending and disposed juvenile cases df's
-        pending_juvenile_cases = PROD_prepare.prepare_pending_juvenile_cases(pending_juvenile_cases)
-        disposed_juvenile_cases = PROD_prepare.prepare_disposed_juvenile_cases(disposed_juvenile_cases)
+        pending_juvenile_cases = PROD_prepare.prepare_pending_juvenile_cases(pending_juvenile_cases, load_context)
+        disposed_juvenile_cases = PROD_prepare.prepare_disposed_juvenile_cases(disposed_juvenile_cases, load_context)
         #Update pending and disposed juvenile cases in google sheet
         update_juvenile_cases(pending_juvenile_cases, disposed_juvenile_cases)
     elif report['Report Type'] == 'Criminal Inactive':
         #Update the inactive spreadsheet.
-        PROD_prepare.prepare_inactive_cases(df)
+        PROD_prepare.prepare_inactive_cases(df, load_context)
         update_criminal_inactive_cases(df, report)
     elif report['Report Type'] == 'Civil Inactive':
         #Update the inactive spreadsheet.
-        PROD_prepare.prepare_inactive_cases(df)
+        PROD_prepare.prepare_inactive_cases(df, load_context)
         update_civil_inactive_cases(df, report)
     else:
         #Prepare the df and add new columns
-        df = PROD_prepare.prepare_dataframe(report['Report Type'], df)
+        df = PROD_prepare.prepare_dataframe(report['Report Type'], df, load_context)
         #If case type is 'Criminal' or 'Criminal OLS', send to criminal function
         #If report is for disposed cases, send them to disposed case function
         if report['Report Type'] == 'Criminal Disposed' or report['Report Type'] == 'Civil Disposed':
@@ -265,17 +967,17 @@ def update_spreadsheet(report):
             update_disposed_cases(df)
         elif report['Report Type'] == 'Criminal':
             #Add to criminal cases tab
-            update_criminal_cases(df)
+            update_criminal_cases(df, load_context)
         else:
             #Add to civil cases tab
-            update_civil_cases(df)
+            update_civil_cases(df, load_context)
     
     #Update the report tracker tab
     update_report_tracker(report)
     
     return
     
-def update_civil_cases(new_civil_df):
+def update_civil_cases(new_civil_df, load_context = None):
     """
     This function takes in the newly created civil cases df and updates it with the current data on the 'Pending Reports' spreadsheet.
     It will connect to the Google Sheet, load the current data, append the new data to the current data, and drop duplicates without 
@@ -283,36 +985,28 @@ def update_civil_cases(new_civil_df):
     
     Parameter:
         - new_civil_df: The newly created dataframe from the most recent civil cases PDF data
+        - load_context: The optional load context of the upload batch from PROD_prepare.get_load_context
 
     Returns:
         - Nothing.
     """
 
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
-    #Make connection to 'PROD_Common_Table'
-    common_sheet = gsheet.worksheet(common_sheet_name)
-    
     if new_civil_df['Case Type'].iloc[0].count('OLS') > 0:
         #Send OLS data to the 'Civil OLS Cases' tab
-        civil_sheet = gsheet.worksheet(ols_civil_sheet_name)
+        civil_tab_name = ols_civil_sheet_name
         #Send closed OLS cases to the 'Closed Civil OLS Cases' tab
-        closed_sheet = gsheet.worksheet(closed_ols_civil_sheet_name)
+        closed_tab_name = closed_ols_civil_sheet_name
     else:
         #Civil cases go to the 'Civil Cases' tab
-        civil_sheet = gsheet.worksheet(civil_sheet_name)
+        civil_tab_name = civil_sheet_name
         #Closed cases go to the 'Closed Civil Cases' tab
-        closed_sheet = gsheet.worksheet(closed_civil_sheet_name)
+        closed_tab_name = closed_civil_sheet_name
 
     #Load the data currently on the civil cases tab in the 'Pending Reports' spreadsheet
-    current_civil_df = pd.DataFrame(civil_sheet.get_all_records())
+    current_civil_df = read_worksheet(civil_tab_name)
 
     #Load the data currently on the common table in the 'Pending Reports' spreadsheet
-    common_table_df = pd.DataFrame(common_sheet.get_all_records())
+    common_table_df = read_worksheet(common_sheet_name)
 
     #Before appending the new cases, create the closed cases df and udpate the closed cases tab
     if len(current_civil_df) > 0:
@@ -326,17 +1020,10 @@ def update_civil_cases(new_civil_df):
         #Remove closed cases from current_civil_df
         current_civil_df = current_civil_df[~(current_civil_df['Cause Number'].isin(closed_cases_df['Cause Number']))]
         #Prepare closed cases df
-        closed_cases_df = PROD_prepare.prepare_closed_cases(closed_cases_df, new_civil_df)
-        #Find next available row
-        next_available_row = find_next_available_row(closed_sheet)
-        #If any cases were closed, add the newly closed cases to the 'Closed Civil Cases' tab
+        closed_cases_df = PROD_prepare.prepare_closed_cases(closed_cases_df, new_civil_df, load_context)
+        #If any cases were closed, add the newly closed cases to the bottom of the 'Closed Civil Cases' tab
         if len(closed_cases_df) > 0:
-            #If the first available row is the first row in the sheet, include the column names when updating
-            #Otherwise, only send the values
-            if next_available_row == 'A1':
-                closed_sheet.update([closed_cases_df.columns.values.tolist()] + closed_cases_df.values.tolist())
-            else:
-                closed_sheet.update(next_available_row, closed_cases_df.values.tolist())
+            append_worksheet_rows(closed_tab_name, closed_cases_df)
     else:
         #Instanciate closed_cases_df
         closed_cases_df = pd.DataFrame()
@@ -345,21 +1032,11 @@ def update_civil_cases(new_civil_df):
     if len(current_civil_df) > 0:
         #Create a df that consists only of pending cases in the county for the current report
         current_county_pending_cases = current_civil_df[current_civil_df['County'] == new_civil_df['County'].iloc[0]]
-        current_county_pending_cases.reset_index(inplace = True)
-        #Iterate through each of those cases and update the corresponding version in new_civil_df
-        for i in current_county_pending_cases.index:
-            new_civil_df.loc[new_civil_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i], ['Original As Of Date']] = current_county_pending_cases['Original As Of Date'].iloc[i]
-            #Check for an updated docket date. If docket date has changed and is not blank, append the old ones to the new one.
-            new_docket_date = str(new_civil_df[new_civil_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i]]['Docket Date'].reset_index(drop=True)[0]).strip()
-            current_docket_dates = str(current_county_pending_cases['Docket Date'].iloc[i]).strip()
-
-            if len(new_docket_date) > 0 and new_docket_date.isspace() == False and current_docket_dates.find(new_docket_date) == -1:
-                new_civil_df.loc[new_civil_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i], ['Docket Date']] = new_docket_date + '\n' + current_docket_dates
-            else:
-                new_civil_df.loc[new_civil_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i], ['Docket Date']] = current_docket_dates
+        #Join those cases onto new_civil_df by cause number and update the corresponding versions
+        new_civil_df = carry_over_case_history(new_civil_df, current_county_pending_cases)
 
     #Append new_civil_df to current_civil_df
-    current_civil_df = current_civil_df.append(new_civil_df, ignore_index = True)
+    current_civil_df = pd.concat([current_civil_df, new_civil_df], ignore_index = True)
 
     #Verify that all Cause Numbers are represented as strings
     current_civil_df['Cause Number'] = current_civil_df['Cause Number'].astype(str).str.strip()
@@ -370,36 +1047,28 @@ def update_civil_cases(new_civil_df):
     #Drop duplicate cases while keeping the most recent version
     current_civil_df = current_civil_df.drop_duplicates(subset = ['Cause Number'], ignore_index = True, keep = 'last')
 
-    #Clear what's currently on the Civil Cases worksheet
-    civil_sheet.clear()
+    #Now save the changes to Civil Cases worksheet in 'Pending Reports' spreadsheet
+    write_worksheet(civil_tab_name, current_civil_df)
 
-    #Now upload to Civil Cases worksheet in 'Pending Reports' spreadsheet
-    civil_sheet.update([current_civil_df.columns.values.tolist()] + current_civil_df.values.tolist())
-
-    #Now append the current_civil_df to the common_table_df, remove duplicates, and update the closed cases
-    #Drop duplicates based on cause number and status since cases have the potential to be reopened.
-    common_table_df = common_table_df.append(convert_to_common_table_df(current_civil_df), ignore_index = True)
-    common_table_df = common_table_df.drop_duplicates(subset = ['Cause Number', 'Status'], ignore_index = True, keep = 'last')
+    #Now merge the cases from this report into the common_table_df, and update the closed cases
+    #Cases are matched on cause number and status since cases have the potential to be reopened.
+    #The other cases on the tab haven't changed since their own report was uploaded, so only this report's cases are merged.
+    report_cases_df = current_civil_df[current_civil_df['Cause Number'].isin(new_civil_df['Cause Number'].astype(str).str.strip())]
+    common_table_df = merge_into_common_table(common_table_df, convert_to_common_table_df(report_cases_df))
 
     if len(closed_cases_df) > 0:
-        #Reset index
-        closed_cases_df.reset_index(inplace = True)
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Dropped DateTime']] = closed_cases_df['Dropped DateTime'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Report Generated Date']] = closed_cases_df['Report Generated Date'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Last As Of Date']] = closed_cases_df['Last As Of Date'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Load DateTime']] = closed_cases_df['Load DateTime'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Status']] = closed_cases_df['Status'].iloc[0]
+        #Mark the open versions of the closed cases as dropped in a single keyed update
+        common_table_df = close_open_cases(common_table_df, closed_cases_df, ['Dropped DateTime', 'Report Generated Date', 'Last As Of Date', 'Load DateTime', 'Status'])
 
     #Finally upload the common_table_df to the common table worksheet in 'Pending Reports' spreadsheet
-    common_sheet.clear()
-    common_table_df.sort_values(by = ['Status'], ignore_index=True, inplace=True, ascending = False)
-    common_sheet.update([common_table_df.columns.values.tolist()] + common_table_df.values.tolist())
+    common_table_df.sort_values(by = ['Status'], ignore_index=True, inplace=True, ascending = False, kind = 'mergesort')
+    write_worksheet(common_sheet_name, common_table_df)
     
     print('Civil Cases Updated!')
 
     return
 
-def update_criminal_cases(new_crim_df):
+def update_criminal_cases(new_crim_df, load_context = None):
     """
     This function takes in the newly created criminal cases df and updates it with the current data on the 'Pending Reports' spreadsheet.
     It will connect to the Google Sheet, load the current data, append the new data to the current data, and drop duplicates without 
@@ -407,36 +1076,28 @@ def update_criminal_cases(new_crim_df):
     
     Parameter:
         - new_criminal_df: The newly created dataframe from the most recent criminal cases PDF data
+        - load_context: The optional load context of the upload batch from PROD_prepare.get_load_context
 
     Returns:
         - Nothing.
     """
 
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
-    #Make connection to 'PROD_Common_Table'
-    common_sheet = gsheet.worksheet(common_sheet_name)
-
     if new_crim_df['Case Type'].iloc[0].count('OLS') > 0:
         #Send OLS data to the 'Criminal OLS Cases' tab
-        crim_sheet = gsheet.worksheet(ols_criminal_sheet_name)
+        crim_tab_name = ols_criminal_sheet_name
         #Send closed OLS cases to the 'Closed Criminal OLS Cases' tab
-        closed_sheet = gsheet.worksheet(closed_ols_criminal_sheet_name)
+        closed_tab_name = closed_ols_criminal_sheet_name
     else:
         #Criminal cases go to the 'Criminal Cases' tab
-        crim_sheet = gsheet.worksheet(criminal_sheet_name)
+        crim_tab_name = criminal_sheet_name
         #Closed cases go to the 'Closed Criminal Cases' tab
-        closed_sheet = gsheet.worksheet(closed_criminal_sheet_name)
+        closed_tab_name = closed_criminal_sheet_name
 
     #Load the data currently on the criminal cases tab in the 'Pending Reports' spreadsheet
-    current_crim_df = pd.DataFrame(crim_sheet.get_all_records())
+    current_crim_df = read_worksheet(crim_tab_name)
 
     #Load the data currently on the common table in the 'Pending Reports' spreadsheet
-    common_table_df = pd.DataFrame(common_sheet.get_all_records())
+    common_table_df = read_worksheet(common_sheet_name)
 
     #Before appending the new cases, create the closed cases df and udpate the closed cases tab
     if len(current_crim_df) > 0:
@@ -450,17 +1111,10 @@ def update_criminal_cases(new_crim_df):
         #Remove closed cases from current_crim_df
         current_crim_df = current_crim_df[~(current_crim_df['Cause Number'].isin(closed_cases_df['Cause Number']))]
         #Prepare closed cases df
-        closed_cases_df = PROD_prepare.prepare_closed_cases(closed_cases_df, new_crim_df)
-        #Find the next available row
-        next_available_row = find_next_available_row(closed_sheet)
-        #If any cases were closed, add the newly closed cases to the 'Closed Criminal Cases' tab
+        closed_cases_df = PROD_prepare.prepare_closed_cases(closed_cases_df, new_crim_df, load_context)
+        #If any cases were closed, add the newly closed cases to the bottom of the 'Closed Criminal Cases' tab
         if len(closed_cases_df) > 0:
-            #If the first available row is the first row in the sheet, include the column names when updating
-            #Otherwise, only send the values
-            if next_available_row == 'A1':
-                closed_sheet.update([closed_cases_df.columns.values.tolist()] + closed_cases_df.values.tolist())
-            else:
-                closed_sheet.update(next_available_row, closed_cases_df.values.tolist())
+            append_worksheet_rows(closed_tab_name, closed_cases_df)
     else:
         #Instanciate closed_cases_df
         closed_cases_df = pd.DataFrame()
@@ -469,22 +1123,11 @@ def update_criminal_cases(new_crim_df):
     if len(current_crim_df) > 0:
         #Create a df that consists only of pending cases in the county for the current report
         current_county_pending_cases = current_crim_df[current_crim_df['County'] == new_crim_df['County'].iloc[0]]
-        current_county_pending_cases.reset_index(inplace = True)
-        #Iterate through each of those cases and update the corresponding version in new_crim_df
-        for i in current_county_pending_cases.index:
-            new_crim_df.loc[new_crim_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i], ['Original As Of Date']] = current_county_pending_cases['Original As Of Date'].iloc[i]
-            #Check for an updated docket date. If docket date has changed and is not blank, append the old ones to the new one.
-            #Have to reset the index of the resulting series so that I can select the individual value at index = 0
-            new_docket_date = str(new_crim_df[new_crim_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i]]['Docket Date'].reset_index(drop=True)[0]).strip()
-            current_docket_dates = str(current_county_pending_cases['Docket Date'].iloc[i]).strip()
-
-            if len(new_docket_date) > 0 and new_docket_date.isspace() == False and current_docket_dates.find(new_docket_date) == -1:
-                new_crim_df.loc[new_crim_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i], ['Docket Date']] = new_docket_date + '\n' + current_docket_dates
-            else:
-                new_crim_df.loc[new_crim_df['Cause Number'] == current_county_pending_cases['Cause Number'].iloc[i], ['Docket Date']] = current_docket_dates
+        #Join those cases onto new_crim_df by cause number and update the corresponding versions
+        new_crim_df = carry_over_case_history(new_crim_df, current_county_pending_cases)
 
     #Append new_crim_df to current_crim_df
-    current_crim_df = current_crim_df.append(new_crim_df, ignore_index = True)
+    current_crim_df = pd.concat([current_crim_df, new_crim_df], ignore_index = True)
 
     #Verify that all Cause Numbers are represented as strings
     current_crim_df['Cause Number'] = current_crim_df['Cause Number'].astype(str).str.strip()
@@ -495,30 +1138,22 @@ def update_criminal_cases(new_crim_df):
     #Drop duplicate cases while keeping the most recent version
     current_crim_df = current_crim_df.drop_duplicates(subset = ['Cause Number'], ignore_index = True, keep = 'last')
 
-    #Clear what's currently on the Criminal Cases worksheet
-    crim_sheet.clear()
-
-    #Now upload to Criminal Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-    crim_sheet.update([current_crim_df.columns.values.tolist()] + current_crim_df.values.tolist())
+    #Now save the changes to Criminal Cases worksheet in 'Pending Reports' spreadsheet
+    write_worksheet(crim_tab_name, current_crim_df)
 
-    #Now append the current_crim_df to the common_table_df, remove duplicates, and update the closed cases
-    #Drop duplicates based on cause number and status since cases have the potential to be reopened.
-    common_table_df = common_table_df.append(convert_to_common_table_df(current_crim_df), ignore_index = True)
-    common_table_df = common_table_df.drop_duplicates(subset = ['Cause Number', 'Status'], ignore_index = True, keep = 'last')
+    #Now merge the cases from this report into the common_table_df, and update the closed cases
+    #Cases are matched on cause number and status since cases have the potential to be reopened.
+    #The other cases on the tab haven't changed since their own report was uploaded, so only this report's cases are merged.
+    report_cases_df = current_crim_df[current_crim_df['Cause Number'].isin(new_crim_df['Cause Number'].astype(str).str.strip())]
+    common_table_df = merge_into_common_table(common_table_df, convert_to_common_table_df(report_cases_df))
     
     if len(closed_cases_df) > 0:
-        #Reset index
-        closed_cases_df.reset_index(inplace = True)
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Dropped DateTime']] = closed_cases_df['Dropped DateTime'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Report Generated Date']] = closed_cases_df['Report Generated Date'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Last As Of Date']] = closed_cases_df['Last As Of Date'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Load DateTime']] = closed_cases_df['Load DateTime'].iloc[0]
-        common_table_df.loc[(common_table_df['Cause Number'].isin(closed_cases_df['Cause Number'])) & (common_table_df['Status'] == 'Open'), ['Status']] = closed_cases_df['Status'].iloc[0]
+        #Mark the open versions of the closed cases as dropped in a single keyed update
+        common_table_df = close_open_cases(common_table_df, closed_cases_df, ['Dropped DateTime', 'Report Generated Date', 'Last As Of Date', 'Load DateTime', 'Status'])
 
     #Finally upload the common_table_df to the common table worksheet in 'Pending Reports' spreadsheet
-    common_sheet.clear()
-    common_table_df.sort_values(by = ['Status'], ignore_index=True, inplace=True, ascending = False)
-    common_sheet.update([common_table_df.columns.values.tolist()] + common_table_df.values.tolist())
+    common_table_df.sort_values(by = ['Status'], ignore_index=True, inplace=True, ascending = False, kind = 'mergesort')
+    write_worksheet(common_sheet_name, common_table_df)
     
     print('Criminal Cases Updated!')
 
@@ -536,26 +1171,17 @@ def update_disposed_cases(disposed_cases):
         - Nothing.
     """
 
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
-    #Make connection to 'PROD_Common_Table'
-    common_sheet = gsheet.worksheet(common_sheet_name)
-
     #Open the associated dropped table
     if disposed_cases['Case Type'].iloc[0].count('Criminal') > 0:
-        dropped_sheet = gsheet.worksheet(closed_criminal_sheet_name)
+        dropped_tab_name = closed_criminal_sheet_name
         is_crim = True
     else:
-        dropped_sheet = gsheet.worksheet(closed_civil_sheet_name)
+        dropped_tab_name = closed_civil_sheet_name
         is_crim = False
     
     #Build dataframes
-    dropped_cases = pd.DataFrame(dropped_sheet.get_all_records())
-    common_table_df = pd.DataFrame(common_sheet.get_all_records())
+    dropped_cases = read_worksheet(dropped_tab_name)
+    common_table_df = read_worksheet(common_sheet_name)
 
     #Verify cause numbers are represented as strings
     if len(dropped_cases) > 0:
@@ -625,7 +1251,7 @@ def update_disposed_cases(disposed_cases):
         ]]
 
         #Now append to dropped cases df
-        dropped_cases = dropped_cases.append(old_disposed_cases, ignore_index = True)
+        dropped_cases = pd.concat([dropped_cases, old_disposed_cases], ignore_index = True)
     else:
         old_disposed_cases['Cause of Action'] = ''
         old_disposed_cases['Docket Date'] = ''
@@ -672,12 +1298,12 @@ def update_disposed_cases(disposed_cases):
         ]]
 
         #Now append to dropped cases df
-        dropped_cases = dropped_cases.append(old_disposed_cases, ignore_index = True)
+        dropped_cases = pd.concat([dropped_cases, old_disposed_cases], ignore_index = True)
 
     #Now append the old cases df to the common_table_df
     if len(old_disposed_cases) > 0:
         if len(common_table_df) > 0:
-            common_table_df = common_table_df.append(convert_to_common_table_df(old_disposed_cases), ignore_index = True)
+            common_table_df = pd.concat([common_table_df, convert_to_common_table_df(old_disposed_cases)], ignore_index = True)
         else:
             common_table_df = convert_to_common_table_df(old_disposed_cases)
 
@@ -695,7 +1321,7 @@ def update_disposed_cases(disposed_cases):
     closed_common_table_cases.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='last')
 
     #Finally, recreate the common_table_df by adding the open cases back to the closed_common_table_cases df
-    common_table_df = closed_common_table_cases.append(open_common_table_cases, ignore_index = True)
+    common_table_df = pd.concat([closed_common_table_cases, open_common_table_cases], ignore_index = True)
 
     #Iterate through each of the newly disposed cases and update the corresponding version in dropped_cases
     if len(new_disposed_cases) > 0:
@@ -717,13 +1343,11 @@ def update_disposed_cases(disposed_cases):
 
     #Now update the google sheet
     #For common table
-    common_sheet.clear()
-    common_table_df.sort_values(by = ['Status'], ignore_index=True, inplace=True, ascending = False)
-    common_sheet.update([common_table_df.columns.values.tolist()] + common_table_df.values.tolist())
+    common_table_df.sort_values(by = ['Status'], ignore_index=True, inplace=True, ascending = False, kind = 'mergesort')
+    write_worksheet(common_sheet_name, common_table_df)
 
     #For dropped cases table
-    dropped_sheet.clear()
-    dropped_sheet.update([dropped_cases.columns.values.tolist()] + dropped_cases.values.tolist())
+    write_worksheet(dropped_tab_name, dropped_cases)
 
     return
     
@@ -740,21 +1364,10 @@ def update_juvenile_cases(pending_juvenile_cases, disposed_juvenile_cases):
     - Nothing.
     """
 
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
-    #Make connection to 'PROD_Common_Table'
-    common_sheet = gsheet.worksheet(common_sheet_name)
-    pending_juvenile_sheet = gsheet.worksheet(juvenile_sheet_name)
-    disposed_juvenile_sheet = gsheet.worksheet(closed_juvenile_sheet_name)
-
     #Build dataframes from existing tables
-    common_table_df = pd.DataFrame(common_sheet.get_all_records())
-    pending_juvenile_cases_table_df = pd.DataFrame(pending_juvenile_sheet.get_all_records())
-    disposed_juvenile_cases_table_df = pd.DataFrame(disposed_juvenile_sheet.get_all_records())
+    common_table_df = read_worksheet(common_sheet_name)
+    pending_juvenile_cases_table_df = read_worksheet(juvenile_sheet_name)
+    disposed_juvenile_cases_table_df = read_worksheet(closed_juvenile_sheet_name)
 
     #Are the tables empty? Default to True
     is_common_table_empty = True
@@ -788,7 +1401,7 @@ def update_juvenile_cases(pending_juvenile_cases, disposed_juvenile_cases):
     #Update the 'Original As Of Date' column for the new pending and disposed juvenile cases dataframes
     if is_pending_juvenile_table_empty == False:
         #Create a temporary reference table to iterate through both the pending and disposed cases. That way we know we have all the cause numbers included in one dataframe
-        ref_table = pending_juvenile_cases[['Cause Number', 'Status']].append(disposed_juvenile_cases[['Cause Number', 'Original As Of Date', 'Docket Date', 'Status']], ignore_index = True)
+        ref_table = pd.concat([pending_juvenile_cases[['Cause Number', 'Status']], disposed_juvenile_cases[['Cause Number', 'Original As Of Date', 'Docket Date', 'Status']]], ignore_index = True)
         ref_table = ref_table[ref_table['Cause Number'].isin(pending_juvenile_cases_table_df['Cause Number'])]
         #If there are any dropped cases, remove them from the pending juvenile cases table df for the next part:
         if len(dropped_cases) > 0:
@@ -818,16 +1431,15 @@ def update_juvenile_cases(pending_juvenile_cases, disposed_juvenile_cases):
                     disposed_juvenile_cases.loc[disposed_juvenile_cases['Cause Number'] == pending_juvenile_cases_table_df['Cause Number'].iloc[i], ['Docket Date']] = current_docket_dates
 
     #Now update the pending juvenile cases table
-    #I can simply clear the entire table and add the new pending juvenile cases df because all county cases are included in each report
-    pending_juvenile_sheet.clear()
-    pending_juvenile_sheet.update([pending_juvenile_cases.columns.values.tolist()] + pending_juvenile_cases.values.tolist())
+    #I can simply replace the entire table with the new pending juvenile cases df because all county cases are included in each report
+    write_worksheet(juvenile_sheet_name, pending_juvenile_cases)
 
     #Update the disposed juvenile cases dataframe with the 'Original As Of Date' values from the disposed juvenile cases table dataframe.
     #This allows us to account for cases that have been reopened and closed again
     if is_disposed_juvenile_table_empty == False:
         #Find any previously dropped cases and add them to the disposed cases dataframe
         previously_dropped_cases = disposed_juvenile_cases_table_df[disposed_juvenile_cases_table_df['Status'] == 'Dropped']
-        disposed_juvenile_cases = disposed_juvenile_cases.append(previously_dropped_cases, ignore_index = True)
+        disposed_juvenile_cases = pd.concat([disposed_juvenile_cases, previously_dropped_cases], ignore_index = True)
 
         #Now remove the dropped cases from the disposed_juvenile_cases_table_df.
         #Running the for loop below without this step is likely causing issues with key errors where index = 0.
@@ -850,48 +1462,49 @@ def update_juvenile_cases(pending_juvenile_cases, disposed_juvenile_cases):
     #If there are newly dropped cases, prepare them and add to the disposed cases dataframe
     if len(dropped_cases) > 0:
             dropped_cases = PROD_prepare.prepare_dropped_juvenile_cases(dropped_cases, pending_juvenile_cases['Last As Of Date'].iloc[0])
-            disposed_juvenile_cases = disposed_juvenile_cases.append(dropped_cases, ignore_index = True)
+            disposed_juvenile_cases = pd.concat([disposed_juvenile_cases, dropped_cases], ignore_index = True)
     
-    #I chose to clear the entire sheet and add all currently disposed cases again because this accounts for any cases that were reopened and closed again.
-    #We will have the most up to date information for each case.
-    disposed_juvenile_sheet.clear()
-    disposed_juvenile_sheet.update([disposed_juvenile_cases.columns.values.tolist()] + disposed_juvenile_cases.values.tolist())
+    #I chose to replace the entire sheet with all currently disposed cases because this accounts for any cases that were reopened and closed again.
+    #We will have the most up to date information for each case. Only the rows that changed are sent.
+    write_worksheet(closed_juvenile_sheet_name, disposed_juvenile_cases)
 
     #Now update the common table
-    #Append the pending juvenile cases df to the common_table_df, remove duplicates, and update the closed cases
-    #Drop duplicates based on cause number and status since cases have the potential to be reopened.
-    common_table_df = common_table_df.append(convert_to_common_table_df(pending_juvenile_cases), ignore_index = True)
-    common_table_df = common_table_df.drop_duplicates(subset = ['Cause Number', 'Status'], ignore_index = True, keep = 'last')
+    #Merge the pending juvenile cases df into the common_table_df, and update the closed cases
+    #Cases are matched on cause number and status since cases have the potential to be reopened.
+    common_table_df = merge_into_common_table(common_table_df, convert_to_common_table_df(pending_juvenile_cases))
 
     #Determine which dropped and disposed cases don't already exist in the common table.
     #These should only exist the first time we run the juvenile report
     disposed_cases_not_in_common_table = disposed_juvenile_cases[~(disposed_juvenile_cases['Cause Number'].isin(common_table_df['Cause Number']))]
     #Convert these to the common table dataframe format and append them
     #Must separate the dropped and disposed cases because the convert_to_common_table_df function can't update both at the same time
-    if len(disposed_cases_not_in_common_table[disposed_cases_not_in_common_table['Status'] == 'Disposed']) > 0:
-        common_table_df = common_table_df.append(convert_to_common_table_df(disposed_cases_not_in_common_table[disposed_cases_not_in_common_table['Status'] == 'Disposed']), ignore_index = True)
-    if len(disposed_cases_not_in_common_table[disposed_cases_not_in_common_table['Status'] == 'Dropped']) > 0:
-        common_table_df = common_table_df.append(convert_to_common_table_df(disposed_cases_not_in_common_table[disposed_cases_not_in_common_table['Status'] == 'Dropped']), ignore_index = True)
+    #The converted frames are collected and added to the common table in one concat
+    common_table_frames = [common_table_df]
+    for status in ['Disposed', 'Dropped']:
+        status_cases = disposed_cases_not_in_common_table[disposed_cases_not_in_common_table['Status'] == status]
+        if len(status_cases) > 0:
+            common_table_frames.append(convert_to_common_table_df(status_cases))
+    if len(common_table_frames) > 1:
+        common_table_df = pd.concat(common_table_frames, ignore_index = True)
     
     if is_common_table_empty == False:
-        #Reset index, iterate through the disposed juvenile cases, and update the newly dropped/disposed cases in the common table
+        #Update the newly dropped/disposed cases in the common table in a single keyed update
         #I do not believe this will account for cases that were reopened and closed again. I need more info on how the report will behave in those instances before I can code for it.
-        disposed_juvenile_cases.reset_index(inplace = True)
-        for i in disposed_juvenile_cases.index:
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Dropped DateTime']] = disposed_juvenile_cases['Dropped DateTime'].iloc[i]
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Report Generated Date']] = disposed_juvenile_cases['Report Generated Date'].iloc[i]
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Disposed Dates']] = disposed_juvenile_cases['Disposed Dates'].iloc[i]
-            #common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Dispositions']] = disposed_juvenile_cases['Dispositions'][i] #Juvenile reports do not contain dispositions
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Disposed As Of Date']] = disposed_juvenile_cases['Disposed As Of Date'].iloc[i]
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Number Of Dispositions']] = disposed_juvenile_cases['Number Of Dispositions'].iloc[i]
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Last As Of Date']] = disposed_juvenile_cases['Last As Of Date'].iloc[i]
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Load DateTime']] = disposed_juvenile_cases['Load DateTime'].iloc[i]
-            common_table_df.loc[(common_table_df['Cause Number'] == (disposed_juvenile_cases['Cause Number'].iloc[i])) & (common_table_df['Status'] == 'Open'), ['Status']] = disposed_juvenile_cases['Status'].iloc[i]
+        #Juvenile reports do not contain dispositions, so the 'Dispositions' column is left as is
+        common_table_df = close_open_cases(common_table_df, disposed_juvenile_cases, [
+            'Dropped DateTime',
+            'Report Generated Date',
+            'Disposed Dates',
+            'Disposed As Of Date',
+            'Number Of Dispositions',
+            'Last As Of Date',
+            'Load DateTime',
+            'Status'
+        ])
 
     #Finally upload the common_table_df to the common table worksheet in 'Pending Reports' spreadsheet
-    common_sheet.clear()
     common_table_df.sort_values(by = ['Case Type','County','Status'], ignore_index=True, inplace=True, ascending = False)
-    common_sheet.update([common_table_df.columns.values.tolist()] + common_table_df.values.tolist())
+    write_worksheet(common_sheet_name, common_table_df)
     
     print('Juvenile Cases Updated!')
 
@@ -910,17 +1523,11 @@ def update_civil_inactive_cases(new_inactive_df, report):
         - Nothing.
     """
 
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
     #Inactive cases go to the 'Inactive Cases' tab
-    inactive_sheet = gsheet.worksheet(civil_inactive_sheet_name)
+    inactive_tab_name = civil_inactive_sheet_name
 
     #Load the data currently on the inactive cases tab in the 'Pending Reports' spreadsheet
-    current_inactive_table_df = pd.DataFrame(inactive_sheet.get_all_records())
+    current_inactive_table_df = read_worksheet(inactive_tab_name)
 
     if len(current_inactive_table_df) > 0 and len(new_inactive_df) > 0:
         #First, Verify that all Cause Numbers are represented as strings
@@ -945,7 +1552,7 @@ def update_civil_inactive_cases(new_inactive_df, report):
                     reactivated_cases_df['Estimated Inactive End Date'].iloc[i] = new_inactive_df['Last As Of Date'].iloc[0] + '\n' + str(reactivated_cases_df['Estimated Inactive End Date'].iloc[i])
             
             #Now add them to the active_table_df
-            active_table_df = active_table_df.append(reactivated_cases_df, ignore_index = True)
+            active_table_df = pd.concat([active_table_df, reactivated_cases_df], ignore_index = True)
             #And remove from inactive table df
             inactive_table_df = inactive_table_df[~(inactive_table_df['Cause Number'].isin(reactivated_cases_df['Cause Number']))].reset_index(drop=True)
         
@@ -962,7 +1569,7 @@ def update_civil_inactive_cases(new_inactive_df, report):
                 inactivated_cases_df['Last As Of Date'].iloc[i] = str(new_inactive_df['Last As Of Date']) + '\n' + str(active_table_df.loc[active_table_df['Cause Number'] == (inactivated_cases_df['Cause Number'].iloc[i]), ['Last As Of Date']])
             
             #Now add them to the inactive_table_df
-            inactive_table_df = inactive_table_df.append(inactivated_cases_df, ignore_index = True).reset_index(drop=True)
+            inactive_table_df = pd.concat([inactive_table_df, inactivated_cases_df], ignore_index = True)
             #And remove them from active_table_df
             active_table_df = active_table_df[~(active_table_df['Cause Number'].isin(inactivated_cases_df['Cause Number']))].reset_index(drop=True)
 
@@ -981,22 +1588,17 @@ def update_civil_inactive_cases(new_inactive_df, report):
         
         #Now append inactive table df to the new inactive cases df and drop duplicates, keeping last.
         #This should keep all updated info intact while adding the entirely new inactive cases to the df
-        inactive_table_df = inactive_table_df.append(new_inactive_df, ignore_index = True)
+        inactive_table_df = pd.concat([inactive_table_df, new_inactive_df], ignore_index = True)
         inactive_table_df.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='first')
 
-        #Now append the active table df. This should give us all cases associated with the current county
-        current_county_df = inactive_table_df.append(active_table_df, ignore_index = True)
-
-        #Now append current_county_df to the total inactive_table_df and remove duplicates, keeping last.
+        #Now append the inactive and active table dfs, which together are all cases associated with the current county,
+        #to the total inactive_table_df in one concat and remove duplicates, keeping last.
         #This should give use the entirely new, updated inactive table.
-        current_inactive_table_df = current_inactive_table_df.append(current_county_df, ignore_index = True)
+        current_inactive_table_df = pd.concat([current_inactive_table_df, inactive_table_df, active_table_df], ignore_index = True)
         current_inactive_table_df.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='last')
 
-        #Clear what's currently on the Criminal Cases worksheet
-        inactive_sheet.clear()
-
-        #Now upload to Inactive Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-        inactive_sheet.update([current_inactive_table_df.columns.values.tolist()] + current_inactive_table_df.values.tolist())
+        #Now save the changes to Inactive Cases worksheet in 'Pending Reports' spreadsheet
+        write_worksheet(inactive_tab_name, current_inactive_table_df)
 
         print('Inactive Cases Updated!')
         return
@@ -1023,25 +1625,22 @@ def update_civil_inactive_cases(new_inactive_df, report):
                     reactivated_cases_df['Estimated Inactive End Date'].iloc[i] = report['As Of Date'] + '\n' + str(reactivated_cases_df['Estimated Inactive End Date'].iloc[i])
             
             #Now add them to the active_table_df
-            active_table_df = active_table_df.append(reactivated_cases_df, ignore_index = True)
+            active_table_df = pd.concat([active_table_df, reactivated_cases_df], ignore_index = True)
             #And remove from inactive table df
             inactive_table_df = inactive_table_df[~(inactive_table_df['Cause Number'].isin(reactivated_cases_df['Cause Number']))].reset_index(drop=True)
 
         #The active_table_df should contain all cases from the inactive report for this county in this case
         #Now append active_table_df to the total inactive_table_df and remove duplicates, keeping last.
         #This should give use the entirely new, updated inactive table.
-        current_inactive_table_df = current_inactive_table_df.append(active_table_df, ignore_index = True)
+        current_inactive_table_df = pd.concat([current_inactive_table_df, active_table_df], ignore_index = True)
         current_inactive_table_df.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='last')
 
-        #Clear what's currently on the Criminal Cases worksheet
-        inactive_sheet.clear()
-
-        #Now upload to Inactive Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-        inactive_sheet.update([current_inactive_table_df.columns.values.tolist()] + current_inactive_table_df.values.tolist())
+        #Now save the changes to Inactive Cases worksheet in 'Pending Reports' spreadsheet
+        write_worksheet(inactive_tab_name, current_inactive_table_df)
     
     elif len(current_inactive_table_df) == 0 and len(new_inactive_df) > 0:
         #Now upload to Inactive Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-        inactive_sheet.update([new_inactive_df.columns.values.tolist()] + new_inactive_df.values.tolist())
+        write_worksheet(inactive_tab_name, new_inactive_df)
 
         print('Inactive Cases Updated!')
 
@@ -1062,17 +1661,11 @@ def update_criminal_inactive_cases(new_inactive_df, report):
         - Nothing.
     """
 
-    #Set up credentials to interact with Google Sheets
-    gc = gspread.service_account_from_dict(credentials)
-    
-    #Open 'Pending Reports' Google Sheet By Name
-    gsheet = gc.open(google_sheet_name)
-
     #Inactive cases go to the 'Inactive Cases' tab
-    inactive_sheet = gsheet.worksheet(criminal_inactive_sheet_name)
+    inactive_tab_name = criminal_inactive_sheet_name
 
     #Load the data currently on the inactive cases tab in the 'Pending Reports' spreadsheet
-    current_inactive_table_df = pd.DataFrame(inactive_sheet.get_all_records())
+    current_inactive_table_df = read_worksheet(inactive_tab_name)
 
     if len(current_inactive_table_df) > 0 and len(new_inactive_df) > 0:
         #First, Verify that all Cause Numbers are represented as strings
@@ -1097,7 +1690,7 @@ def update_criminal_inactive_cases(new_inactive_df, report):
                     reactivated_cases_df['Estimated Inactive End Date'].iloc[i] = new_inactive_df['Last As Of Date'].iloc[0] + '\n' + str(reactivated_cases_df['Estimated Inactive End Date'].iloc[i])
             
             #Now add them to the active_table_df
-            active_table_df = active_table_df.append(reactivated_cases_df, ignore_index = True)
+            active_table_df = pd.concat([active_table_df, reactivated_cases_df], ignore_index = True)
             #And remove from inactive table df
             inactive_table_df = inactive_table_df[~(inactive_table_df['Cause Number'].isin(reactivated_cases_df['Cause Number']))].reset_index(drop=True)
         
@@ -1114,7 +1707,7 @@ def update_criminal_inactive_cases(new_inactive_df, report):
                 inactivated_cases_df['Last As Of Date'].iloc[i] = str(new_inactive_df['Last As Of Date']) + '\n' + str(active_table_df.loc[active_table_df['Cause Number'] == (inactivated_cases_df['Cause Number'].iloc[i]), ['Last As Of Date']])
             
             #Now add them to the inactive_table_df
-            inactive_table_df = inactive_table_df.append(inactivated_cases_df, ignore_index = True).reset_index(drop=True)
+            inactive_table_df = pd.concat([inactive_table_df, inactivated_cases_df], ignore_index = True)
             #And remove them from active_table_df
             active_table_df = active_table_df[~(active_table_df['Cause Number'].isin(inactivated_cases_df['Cause Number']))].reset_index(drop=True)
 
@@ -1133,22 +1726,17 @@ def update_criminal_inactive_cases(new_inactive_df, report):
         
         #Now append inactive table df to the new inactive cases df and drop duplicates, keeping last.
         #This should keep all updated info intact while adding the entirely new inactive cases to the df
-        inactive_table_df = inactive_table_df.append(new_inactive_df, ignore_index = True)
+        inactive_table_df = pd.concat([inactive_table_df, new_inactive_df], ignore_index = True)
         inactive_table_df.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='first')
 
-        #Now append the active table df. This should give us all cases associated with the current county
-        current_county_df = inactive_table_df.append(active_table_df, ignore_index = True)
-
-        #Now append current_county_df to the total inactive_table_df and remove duplicates, keeping last.
+        #Now append the inactive and active table dfs, which together are all cases associated with the current county,
+        #to the total inactive_table_df in one concat and remove duplicates, keeping last.
         #This should give use the entirely new, updated inactive table.
-        current_inactive_table_df = current_inactive_table_df.append(current_county_df, ignore_index = True)
+        current_inactive_table_df = pd.concat([current_inactive_table_df, inactive_table_df, active_table_df], ignore_index = True)
         current_inactive_table_df.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='last')
 
-        #Clear what's currently on the Criminal Cases worksheet
-        inactive_sheet.clear()
-
-        #Now upload to Inactive Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-        inactive_sheet.update([current_inactive_table_df.columns.values.tolist()] + current_inactive_table_df.values.tolist())
+        #Now save the changes to Inactive Cases worksheet in 'Pending Reports' spreadsheet
+        write_worksheet(inactive_tab_name, current_inactive_table_df)
 
         print('Inactive Cases Updated!')
         return
@@ -1175,25 +1763,22 @@ def update_criminal_inactive_cases(new_inactive_df, report):
                     reactivated_cases_df['Estimated Inactive End Date'].iloc[i] = report['As Of Date'] + '\n' + str(reactivated_cases_df['Estimated Inactive End Date'].iloc[i])
             
             #Now add them to the active_table_df
-            active_table_df = active_table_df.append(reactivated_cases_df, ignore_index = True)
+            active_table_df = pd.concat([active_table_df, reactivated_cases_df], ignore_index = True)
             #And remove from inactive table df
             inactive_table_df = inactive_table_df[~(inactive_table_df['Cause Number'].isin(reactivated_cases_df['Cause Number']))].reset_index(drop=True)
 
         #The active_table_df should contain all cases from the inactive report for this county in this case
         #Now append active_table_df to the total inactive_table_df and remove duplicates, keeping last.
         #This should give use the entirely new, updated inactive table.
-        current_inactive_table_df = current_inactive_table_df.append(active_table_df, ignore_index = True)
+        current_inactive_table_df = pd.concat([current_inactive_table_df, active_table_df], ignore_index = True)
         current_inactive_table_df.drop_duplicates(subset = ['Cause Number'], ignore_index=True, inplace=True, keep='last')
 
-        #Clear what's currently on the Criminal Cases worksheet
-        inactive_sheet.clear()
-
-        #Now upload to Inactive Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-        inactive_sheet.update([current_inactive_table_df.columns.values.tolist()] + current_inactive_table_df.values.tolist())
+        #Now save the changes to Inactive Cases worksheet in 'Pending Reports' spreadsheet
+        write_worksheet(inactive_tab_name, current_inactive_table_df)
     
     elif len(current_inactive_table_df) == 0 and len(new_inactive_df) > 0:
         #Now upload to Inactive Cases worksheet in 'Pending Reports' spreadsheet and leave a message
-        inactive_sheet.update([new_inactive_df.columns.values.tolist()] + new_inactive_df.values.tolist())
+        write_worksheet(inactive_tab_name, new_inactive_df)
 
         print('Inactive Cases Updated!')
 
@@ -3,6 +3,136 @@ import re
 from datetime import date, datetime
 import pytz
 
+
+#The time zone every load timestamp is recorded in. It is only looked up once.
+america_central_tz = pytz.timezone('America/Chicago')
+
+def parse_as_of_date(as_of_date):
+    """
+    This function takes in a report's 'AS OF' date and turns it into a date. Most reports print the date as MM/DD/YYYY,
+    but the civil disposed cases report prints MM/DD/YY, so both are accepted.
+
+    Parameter:
+        - as_of_date: A string representing the 'AS OF' date
+
+    Returns:
+        - date: A date object, or None if the string isn't a date
+    """
+
+    for date_format in ['%m/%d/%Y', '%m/%d/%y']:
+        try:
+            return datetime.strptime(as_of_date.strip(), date_format).date()
+        except (ValueError, AttributeError):
+            continue
+
+    return None
+
+def get_load_context(as_of_date = None):
+    """
+    This function creates the load context for an upload batch. It holds the one load timestamp every table in the batch is
+    written with, so rows loaded together can be matched on their 'Load DateTime', and the batch's 'AS OF' date parsed once.
+    The app creates one for the whole batch and passes it along with each report to the prepare functions.
+
+    Parameter:
+        - as_of_date: An optional string representing the 'AS OF' date of the reports in the batch
+
+    Returns:
+        - load_context: A dictionary with the 'Load DateTime' string and the 'As Of Date' as a date, or None if not given
+    """
+
+    load_context = {
+        'Load DateTime': str(datetime.now(tz = america_central_tz)),
+        'As Of Date': parse_as_of_date(as_of_date) if as_of_date is not None else None
+    }
+
+    return load_context
+
+def get_dropped_datetime(as_of_date):
+    """
+    This function takes in a report's 'AS OF' date and returns the 'Dropped DateTime' for cases that dropped off that report.
+    The cases are considered dropped at midnight of the 'AS OF' date.
+
+    Parameter:
+        - as_of_date: A date object, or a string representing the date as MM/DD/YYYY
+
+    Returns:
+        - string: The dropped datetime as YYYY-MM-DD 00:00:00
+    """
+
+    if isinstance(as_of_date, str):
+        as_of_date = datetime.strptime(as_of_date.strip(), '%m/%d/%Y').date()
+
+    return str(datetime(as_of_date.year, as_of_date.month, as_of_date.day))
+
+def parse_report_dates(dates):
+    """
+    This function takes in a column of dates as they are printed on the reports or stored in the google sheet and turns them
+    into a datetime64 column, so they can be compared, sorted and used with max() directly. Dates in MM/DD/YYYY and MM/DD/YY
+    format are both parsed, without a python loop over the rows.
+
+    Parameter:
+        - dates: A series (or list) of date strings. A datetime64 series is returned as is.
+
+    Returns:
+        - parsed_dates: A datetime64 series. Anything that isn't a date is NaT.
+    """
+
+    #Dates that were already parsed are left alone
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+
+    dates = pd.Series(dates, dtype = object).astype(str).str.strip()
+
+    #Parse the four digit years first, then try the rest as two digit years
+    parsed_dates = pd.to_datetime(dates, format = '%m/%d/%Y', errors = 'coerce')
+    is_short_date = parsed_dates.isna()
+    parsed_dates[is_short_date] = pd.to_datetime(dates[is_short_date], format = '%m/%d/%y', errors = 'coerce')
+
+    return parsed_dates
+
+def parse_report_date(value):
+    """
+    This function does the same thing as parse_report_dates, but for a single date.
+
+    Parameter:
+        - value: A date string in MM/DD/YYYY or MM/DD/YY format
+
+    Returns:
+        - Timestamp: The parsed date, or NaT if the string isn't a date
+    """
+
+    return parse_report_dates([value]).iloc[0]
+
+def format_report_dates(dates):
+    """
+    This function takes in a datetime64 column and turns it back into the MM/DD/YYYY strings stored in the google sheet.
+    It is only used when a dataframe is written, so the report tracker's dates can stay typed until then.
+
+    Parameter:
+        - dates: A datetime64 series
+
+    Returns:
+        - series: A series of MM/DD/YYYY strings. Missing dates are empty strings.
+    """
+
+    return dates.dt.strftime('%m/%d/%Y').fillna('')
+
+def format_report_date(value):
+    """
+    This function does the same thing as format_report_dates, but for a single date.
+
+    Parameter:
+        - value: A Timestamp, or NaT
+
+    Returns:
+        - string: The date in MM/DD/YYYY format, or an empty string if the date is missing
+    """
+
+    if pd.isnull(value):
+        return ''
+
+    return value.strftime('%m/%d/%Y')
+
 def get_case_type(value):
     """
     This function looks at the cause number and determines what type of case it is. If the given string doesn't meet
@@ -136,7 +266,20 @@ def count_number_of_dispositions(date_list):
 
     return len(date_list)
 
-def prepare_closed_cases(closed_cases_df, new_cases_df):
+def convert_name_lists_to_strings(name_lists):
+    """
+    This function does the same thing as convert_name_list_to_string, but for a whole column of lists at once.
+
+    Parameter:
+        - name_lists: A series of lists of names
+
+    Returns:
+        - series: A series of strings with the names in each list joined by new lines
+    """
+
+    return name_lists.str.join('\n')
+
+def prepare_closed_cases(closed_cases_df, new_cases_df, load_context = None):
     """
     This function takes in a dataframe of newly closed cases and prepares them to be added to the appropriate closed cases tab.
     It will set the closed date to the current date, set case status to closed, calculate the number of days it took to get a docket date
@@ -146,6 +289,7 @@ def prepare_closed_cases(closed_cases_df, new_cases_df):
     Parameter:
         -closed_cases_df: The dataframe containing the newly closed cases
         -new_cases_df: The dataframe containing the newly uploaded cases - Needed to get the report's 'As Of' date
+        -load_context: The optional load context of the upload batch. If it has the 'As Of' date, new_cases_df isn't needed for it.
 
     Returns:
         -closed_cases_df: The dataframe containing the newly closed cases with the updated information
@@ -155,12 +299,10 @@ def prepare_closed_cases(closed_cases_df, new_cases_df):
     closed_cases_df['Status'] = 'Dropped'
 
     #Set the dropped datetime column to the uploaded report's 'As Of' date
-    date = new_cases_df['Last As Of Date'][0].strip()
-    time = '00:00:00'
-    datetime_str = date + ' ' + time
-
-    datetime_object = datetime.strptime(datetime_str, '%m/%d/%Y %H:%M:%S')
-    closed_cases_df['Dropped DateTime'] = str(datetime_object)
+    if load_context is not None and load_context['As Of Date'] is not None:
+        closed_cases_df['Dropped DateTime'] = get_dropped_datetime(load_context['As Of Date'])
+    else:
+        closed_cases_df['Dropped DateTime'] = get_dropped_datetime(new_cases_df['Last As Of Date'][0])
 
     #Add other disposed case columns
     closed_cases_df['Disposed Dates'] = ''
@@ -186,18 +328,23 @@ def prepare_closed_cases(closed_cases_df, new_cases_df):
 
     return closed_cases_df
 
-def prepare_dataframe(report_type, df):
+def prepare_dataframe(report_type, df, load_context = None):
     """
     This function takes in a newly created case dataframe and adds additional columns. Do not pass in a dataframe
     that has already been manually updated. It will remove any previous work.
     
     Parameter:
         - df: The newly created case dataframe. Can be civil or criminal.
+        - load_context: The optional load context of the upload batch from get_load_context
         
     Returns:
         - df: The same dataframe, but with new columns added.
     """
 
+    #Without a batch load context, this call gets its own timestamp
+    if load_context is None:
+        load_context = get_load_context()
+
     #Verify Cause Numbers are represented as strings
     #df['Cause Number'] = df['Cause Number'].astype(str)
 
@@ -232,30 +379,29 @@ def prepare_dataframe(report_type, df):
     #Also convert the disposition list to a single string with each item separated by a new line
     if report_type == 'Criminal Disposed' or report_type == 'Civil Disposed':
         df['Number Of Dispositions'] = df['Dispositions'].apply(count_number_of_dispositions)
-        df['Dispositions'] = df['Dispositions'].apply(convert_name_list_to_string)
-        df['Disposed Dates'] = df['Disposed Dates'].apply(convert_name_list_to_string)
+        df['Dispositions'] = convert_name_lists_to_strings(df['Dispositions'])
+        df['Disposed Dates'] = convert_name_lists_to_strings(df['Disposed Dates'])
 
     #Create Load Date column
     #df['load_date'] = str(date.today())
 
-    #Create Load DateTime column
-    america_central_tz = pytz.timezone('America/Chicago')
-    df['Load DateTime'] = str(datetime.now(tz = america_central_tz))
+    #Create Load DateTime column. Every table in the batch uses the same timestamp
+    df['Load DateTime'] = load_context['Load DateTime']
 
     #Convert the lists of names in the civil cases dataframe to single strings with each name separated by a new line
     if report_type == 'Civil':
         #df['Plaintiff Name'] = df['Plaintiff Name'].apply(convert_name_list_to_string)
-        df['Plaintiff Attorney'] = df['Plaintiff Attorney'].apply(convert_name_list_to_string)
+        df['Plaintiff Attorney'] = convert_name_lists_to_strings(df['Plaintiff Attorney'])
         #df['Defendant Name'] = df['Defendant Name'].apply(convert_name_list_to_string)
-        df['Defendant Attorney'] = df['Defendant Attorney'].apply(convert_name_list_to_string)
+        df['Defendant Attorney'] = convert_name_lists_to_strings(df['Defendant Attorney'])
     if report_type == 'Criminal' or report_type == 'Criminal OLS':
-        df['First Offense'] = df['First Offense'].apply(convert_name_list_to_string)
-        df['ST RPT Column'] = df['ST RPT Column'].apply(convert_name_list_to_string)
-        df['Attorney'] = df['Attorney'].apply(convert_name_list_to_string)
+        df['First Offense'] = convert_name_lists_to_strings(df['First Offense'])
+        df['ST RPT Column'] = convert_name_lists_to_strings(df['ST RPT Column'])
+        df['Attorney'] = convert_name_lists_to_strings(df['Attorney'])
     
     return df
 
-def prepare_pending_juvenile_cases(pending_juvenile_cases):
+def prepare_pending_juvenile_cases(pending_juvenile_cases, load_context = None):
     """
     This function takes in a dataframe of pending juvenile cases.
     It will add required columns and perform transformations as necessary.
@@ -263,11 +409,16 @@ def prepare_pending_juvenile_cases(pending_juvenile_cases):
 
     Parameter:
         pending_juvenile_cases: A dataframe representing pending juvenile cases only
+        load_context: The optional load context of the upload batch from get_load_context
 
     Returns:
         pending_juvenile_cases: The updated version of the original dataframe
     """
 
+    #Without a batch load context, this call gets its own timestamp
+    if load_context is None:
+        load_context = get_load_context()
+
     #Add case type
     pending_juvenile_cases['Case Type'] = 'Juvenile'
 
@@ -278,17 +429,16 @@ def prepare_pending_juvenile_cases(pending_juvenile_cases):
     pending_juvenile_cases['County'] = pending_juvenile_cases['Cause Number'].apply(get_county_name_from_cause_number)
 
     #Convert offense list into a single string
-    pending_juvenile_cases['Offense'] = pending_juvenile_cases['Offense'].apply(convert_name_list_to_string)
+    pending_juvenile_cases['Offense'] = convert_name_lists_to_strings(pending_juvenile_cases['Offense'])
 
     #Convert docket date list into a single string
-    pending_juvenile_cases['Docket Date'] = pending_juvenile_cases['Docket Date'].apply(convert_name_list_to_string)
+    pending_juvenile_cases['Docket Date'] = convert_name_lists_to_strings(pending_juvenile_cases['Docket Date'])
 
     #Add court
     pending_juvenile_cases['Court'] = '293'
 
-    #Create Load DateTime column
-    america_central_tz = pytz.timezone('America/Chicago')
-    pending_juvenile_cases['Load DateTime'] = str(datetime.now(tz = america_central_tz))
+    #Create Load DateTime column. Every table in the batch uses the same timestamp
+    pending_juvenile_cases['Load DateTime'] = load_context['Load DateTime']
 
     #Drop 'Disposed Dates' and 'Disposed As Of Date' columns
     pending_juvenile_cases = pending_juvenile_cases.drop(columns=['Disposed Dates', 'Disposed As Of Date'])
@@ -310,7 +460,7 @@ def prepare_pending_juvenile_cases(pending_juvenile_cases):
 
     return pending_juvenile_cases
 
-def prepare_disposed_juvenile_cases(disposed_juvenile_cases):
+def prepare_disposed_juvenile_cases(disposed_juvenile_cases, load_context = None):
     """
     This function takes in a dataframe of disposed juvenile cases.
     It will add required columns and perform transformations as necessary.
@@ -318,11 +468,16 @@ def prepare_disposed_juvenile_cases(disposed_juvenile_cases):
 
     Parameter:
         disposed_juvenile_cases: A dataframe representing disposed juvenile cases only
+        load_context: The optional load context of the upload batch from get_load_context
 
     Returns:
         disposed_juvenile_cases: The updated version of the original dataframe
     """
 
+    #Without a batch load context, this call gets its own timestamp
+    if load_context is None:
+        load_context = get_load_context()
+
     #Add case type
     disposed_juvenile_cases['Case Type'] = 'Juvenile'
 
@@ -339,13 +494,13 @@ def prepare_disposed_juvenile_cases(disposed_juvenile_cases):
     disposed_juvenile_cases['Number Of Dispositions'] = disposed_juvenile_cases['Disposed Dates'].apply(count_number_of_dispositions)
 
     #Convert disposition date list into a single string
-    disposed_juvenile_cases['Disposed Dates'] = disposed_juvenile_cases['Disposed Dates'].apply(convert_name_list_to_string)
+    disposed_juvenile_cases['Disposed Dates'] = convert_name_lists_to_strings(disposed_juvenile_cases['Disposed Dates'])
 
     #Convert offense list into a single string
-    disposed_juvenile_cases['Offense'] = disposed_juvenile_cases['Offense'].apply(convert_name_list_to_string)
+    disposed_juvenile_cases['Offense'] = convert_name_lists_to_strings(disposed_juvenile_cases['Offense'])
 
     #Convert docket date list into a single string
-    disposed_juvenile_cases['Docket Date'] = disposed_juvenile_cases['Docket Date'].apply(convert_name_list_to_string)
+    disposed_juvenile_cases['Docket Date'] = convert_name_lists_to_strings(disposed_juvenile_cases['Docket Date'])
 
     #Add court
     disposed_juvenile_cases['Court'] = '293'
@@ -355,16 +510,13 @@ def prepare_disposed_juvenile_cases(disposed_juvenile_cases):
     disposed_juvenile_cases = disposed_juvenile_cases[(disposed_juvenile_cases['Cause Number'] != '') & (disposed_juvenile_cases['Disposed Dates'] != '01/01/1999')]
 
     #Set the dropped datetime column to the uploaded report's 'As Of' date
-    date = disposed_juvenile_cases['Last As Of Date'].iloc[0].strip()
-    time = '00:00:00'
-    datetime_str = date + ' ' + time
-
-    datetime_object = datetime.strptime(datetime_str, '%m/%d/%Y %H:%M:%S')
-    disposed_juvenile_cases['Dropped DateTime'] = str(datetime_object)
+    if load_context['As Of Date'] is not None:
+        disposed_juvenile_cases['Dropped DateTime'] = get_dropped_datetime(load_context['As Of Date'])
+    else:
+        disposed_juvenile_cases['Dropped DateTime'] = get_dropped_datetime(disposed_juvenile_cases['Last As Of Date'].iloc[0])
 
-    #Create Load DateTime column
-    america_central_tz = pytz.timezone('America/Chicago')
-    disposed_juvenile_cases['Load DateTime'] = str(datetime.now(tz = america_central_tz))
+    #Create Load DateTime column. Every table in the batch uses the same timestamp
+    disposed_juvenile_cases['Load DateTime'] = load_context['Load DateTime']
 
     #Reorder columns
     disposed_juvenile_cases = disposed_juvenile_cases[[
@@ -418,10 +570,7 @@ def prepare_dropped_juvenile_cases(dropped_juvenile_cases, dropped_as_of_date):
     dropped_juvenile_cases['Disposed As Of Date'] = dropped_as_of_date
 
     #Set the dropped datetime column to the newest report's 'As Of' date
-    time = '00:00:00'
-    datetime_str = dropped_as_of_date + ' ' + time
-    datetime_object = datetime.strptime(datetime_str, '%m/%d/%Y %H:%M:%S')
-    dropped_juvenile_cases['Dropped DateTime'] = str(datetime_object)
+    dropped_juvenile_cases['Dropped DateTime'] = get_dropped_datetime(dropped_as_of_date)
 
     #Reorder columns
     dropped_juvenile_cases = dropped_juvenile_cases[[
@@ -445,19 +594,23 @@ def prepare_dropped_juvenile_cases(dropped_juvenile_cases, dropped_as_of_date):
 
     return dropped_juvenile_cases
 
-def prepare_inactive_cases(df):
+def prepare_inactive_cases(df, load_context = None):
     """
     This function will prepare the inactive case dataframe to be uploaded to the google sheet.
     It will primarily be used to convert lists of strings to individual strings joined on new lines.
+    The optional load_context from get_load_context gives the batch's load timestamp.
     """
+    #Without a batch load context, this call gets its own timestamp
+    if load_context is None:
+        load_context = get_load_context()
+
     #the df could be empty, so do a check.
     if len(df) > 0:
-        df['Inactive Start Date'] = df['Inactive Start Date'].apply(convert_name_list_to_string).str.strip()
-        df['Inactive End Date'] = df['Inactive End Date'].apply(convert_name_list_to_string).str.strip()
-        df['Inactive Reason'] = df['Inactive Reason'].apply(convert_name_list_to_string).str.strip()
+        df['Inactive Start Date'] = convert_name_lists_to_strings(df['Inactive Start Date']).str.strip()
+        df['Inactive End Date'] = convert_name_lists_to_strings(df['Inactive End Date']).str.strip()
+        df['Inactive Reason'] = convert_name_lists_to_strings(df['Inactive Reason']).str.strip()
 
-        #Create Load DateTime column
-        america_central_tz = pytz.timezone('America/Chicago')
-        df['Load DateTime'] = str(datetime.now(tz = america_central_tz))
+        #Create Load DateTime column. Every table in the batch uses the same timestamp
+        df['Load DateTime'] = load_context['Load DateTime']
 
     return df
\ No newline at end of file
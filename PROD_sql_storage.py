@@ -0,0 +1,271 @@
+import os
+import streamlit as st
+import sqlalchemy
+from gspread.utils import numericise_all
+
+
+#Where the local database is saved if 'sqlite_path' isn't in the secrets
+default_database_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pending_reports.db')
+
+#Tabs with these columns are keyed on them, so a case's row can be found and updated in place. A case can be listed more
+#than once with the same key, so each row also stores which occurrence of its key it is.
+key_columns = ['County', 'Cause Number', 'Status']
+occurrence_column = 'Key Occurrence'
+
+#Keyed tables are upserted, so new rows get new rowids at the end of the table. Each row stores its position on the tab instead,
+#and the rows are read back in that order.
+position_column = 'Row Position'
+
+#The columns the database adds to a keyed table. They are never shown on the sheet.
+storage_columns = [occurrence_column, position_column]
+
+@st.cache_resource
+def get_engine():
+    """
+    This function connects to the local SQLite database that holds the case tables. It uses st.cache_resource, so the
+    connection pool is only created once per app session. The database file is created the first time a table is written.
+
+    Returns:
+        - engine: A SQLAlchemy engine for the database
+    """
+
+    if 'sqlite_path' in st.secrets:
+        database_path = st.secrets['sqlite_path']
+    else:
+        database_path = default_database_path
+
+    return sqlalchemy.create_engine('sqlite:///' + database_path)
+
+def quote(name):
+    """
+    This function takes in a table or column name and returns it quoted for SQLite. The tab and column names have spaces in them.
+
+    Parameter:
+        - name: The table or column name
+
+    Returns:
+        - string: The quoted name
+    """
+
+    return '"' + name.replace('"', '""') + '"'
+
+def get_table_columns(connection, table_name):
+    """
+    This function takes in a database connection and a table name and returns the table's columns in order.
+
+    Parameters:
+        - connection: An open SQLAlchemy connection
+        - table_name: The name of the table, which is the same as the google sheet tab name
+
+    Returns:
+        - columns: A list of the column names, or an empty list if the table doesn't exist
+    """
+
+    return [row[1] for row in connection.exec_driver_sql('PRAGMA table_info(' + quote(table_name) + ')')]
+
+def get_table_names():
+    """
+    This function returns the name of every table in the database.
+
+    Returns:
+        - table_names: A list of table names
+    """
+
+    with get_engine().connect() as connection:
+        return [row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+
+def is_keyed(columns):
+    """
+    This function takes in a list of columns and returns whether or not a table with those columns is keyed on County, Cause Number
+    and Status.
+
+    Parameter:
+        - columns: A list of column names
+
+    Returns:
+        - boolean: True if every key column is included
+    """
+
+    return all(column in columns for column in key_columns)
+
+def add_key_occurrences(rows_df):
+    """
+    This function takes in a dataframe of rows to store. If it has the key columns, it numbers the rows that share a key in the
+    order they are listed, so every row of a keyed table has its own key. It also numbers every row with its position, so the
+    rows can be read back in the same order.
+
+    Parameter:
+        - rows_df: A dataframe of sheet strings
+
+    Returns:
+        - rows_df: The same dataframe. Keyed rows get the key occurrence and row position columns added.
+    """
+
+    if is_keyed(rows_df.columns):
+        rows_df[occurrence_column] = rows_df.groupby(key_columns, sort = False).cumcount()
+        rows_df[position_column] = range(len(rows_df))
+
+    return rows_df
+
+def create_table(connection, table_name, columns):
+    """
+    This function creates a table with the given columns. Every column is text, except the key occurrence and row position. If the
+    table is keyed, a unique index is created on County, Cause Number, Status and the key occurrence, so a case's row can be found
+    without scanning the table.
+
+    Parameters:
+        - connection: An open SQLAlchemy connection
+        - table_name: The name of the table
+        - columns: A list of the column names, including the key occurrence and row position columns if the table is keyed
+    """
+
+    column_definitions = [quote(column) + (" INTEGER NOT NULL DEFAULT 0" if column in storage_columns else " TEXT NOT NULL DEFAULT ''") for column in columns]
+    connection.exec_driver_sql('CREATE TABLE ' + quote(table_name) + ' (' + ', '.join(column_definitions) + ')')
+
+    if is_keyed(columns):
+        index_columns = ', '.join(quote(column) for column in key_columns + [occurrence_column])
+        connection.exec_driver_sql('CREATE UNIQUE INDEX ' + quote(table_name + ' Key') + ' ON ' + quote(table_name) + ' (' + index_columns + ')')
+
+def insert_rows(connection, table_name, rows_df):
+    """
+    This function inserts the rows of a dataframe into a table in a single executemany call.
+
+    Parameters:
+        - connection: An open SQLAlchemy connection
+        - table_name: The name of the table
+        - rows_df: The dataframe of rows to insert. Its columns must all be in the table.
+    """
+
+    if len(rows_df) == 0:
+        return
+
+    columns = ', '.join(quote(column) for column in rows_df.columns)
+    placeholders = ', '.join(['?'] * len(rows_df.columns))
+    connection.exec_driver_sql('INSERT INTO ' + quote(table_name) + ' (' + columns + ') VALUES (' + placeholders + ')', list(rows_df.itertuples(index = False, name = None)))
+
+def load_records(table_name):
+    """
+    This function takes in a table name and returns its rows the same way get_all_records() returns the rows of a google sheet tab.
+    Numbers are converted back to ints and floats, and blank cells are empty strings. The rows are in the order they were saved in.
+
+    Parameter:
+        - table_name: The name of the table, which is the same as the google sheet tab name
+
+    Returns:
+        - records: A list of dictionaries, one per row. Empty if the table doesn't exist.
+    """
+
+    with get_engine().connect() as connection:
+        table_columns = get_table_columns(connection, table_name)
+        columns = [column for column in table_columns if column not in storage_columns]
+
+        if len(columns) == 0:
+            return []
+
+        #Tables that are replaced whole keep their rows in rowid order
+        order_by = quote(position_column) + ', rowid' if position_column in table_columns else 'rowid'
+        rows = connection.exec_driver_sql('SELECT ' + ', '.join(quote(column) for column in columns) + ' FROM ' + quote(table_name) + ' ORDER BY ' + order_by)
+        records = [dict(zip(columns, numericise_all(list(row)))) for row in rows]
+
+    return records
+
+def save_table(table_name, rows_df):
+    """
+    This function takes in a table name and the rows that should be in it. Instead of deleting and inserting every row, keyed
+    tables are updated with set-based SQL: the new rows are loaded into a staging table, rows whose key is no longer listed are
+    deleted, and the rest are upserted on their key. Only the rows that actually changed are written. A row that moved on the tab
+    counts as changed, since its row position is updated.
+
+    If the table doesn't exist, isn't keyed, or its columns don't match the rows, the whole table is replaced.
+
+    Parameters:
+        - table_name: The name of the table, which is the same as the google sheet tab name
+        - rows_df: A dataframe of the values as the google sheet would display them, from PROD_pending_upload.convert_to_sheet_strings
+    """
+
+    rows_df = add_key_occurrences(rows_df.copy())
+    columns = rows_df.columns.tolist()
+
+    with get_engine().begin() as connection:
+        if get_table_columns(connection, table_name) != columns or not is_keyed(columns):
+            #Replace the whole table
+            connection.exec_driver_sql('DROP TABLE IF EXISTS ' + quote(table_name))
+            if len(columns) > 0:
+                create_table(connection, table_name, columns)
+                insert_rows(connection, table_name, rows_df)
+            return
+
+        #Load the new rows into a staging table next to the real one
+        connection.exec_driver_sql('DROP TABLE IF EXISTS temp.staging')
+        connection.exec_driver_sql('CREATE TEMP TABLE staging AS SELECT * FROM ' + quote(table_name) + ' WHERE 0')
+        insert_rows(connection, 'staging', rows_df)
+
+        table = quote(table_name)
+        row_key = key_columns + [occurrence_column]
+        #The row position is a value column, so it is updated when rows move
+        key_match = ' AND '.join('staging.' + quote(column) + ' = ' + table + '.' + quote(column) for column in row_key)
+        value_columns = [column for column in columns if column not in row_key]
+
+        #Delete the rows that are no longer listed
+        connection.exec_driver_sql('DELETE FROM ' + table + ' WHERE NOT EXISTS (SELECT 1 FROM staging WHERE ' + key_match + ')')
+
+        #Insert the new rows and update only the rows with a changed value
+        if len(value_columns) > 0:
+            on_conflict = 'DO UPDATE SET ' + ', '.join(quote(column) + ' = excluded.' + quote(column) for column in value_columns) \
+                + ' WHERE ' + ' OR '.join(table + '.' + quote(column) + ' IS NOT excluded.' + quote(column) for column in value_columns)
+        else:
+            on_conflict = 'DO NOTHING'
+
+        quoted_columns = ', '.join(quote(column) for column in columns)
+        connection.exec_driver_sql('INSERT INTO ' + table + ' (' + quoted_columns + ') SELECT ' + quoted_columns + ' FROM staging WHERE true'
+            + ' ON CONFLICT (' + ', '.join(quote(column) for column in row_key) + ') ' + on_conflict)
+
+        connection.exec_driver_sql('DROP TABLE temp.staging')
+
+def append_rows(table_name, rows_df):
+    """
+    This function takes in a table name and rows to add to it. The table is not read. If the table doesn't exist it is created,
+    and any new columns are added to it first. The rows are added after the last row of the table.
+
+    Parameters:
+        - table_name: The name of the table, which is the same as the google sheet tab name
+        - rows_df: A dataframe of the values as the google sheet would display them, from PROD_pending_upload.convert_to_sheet_strings
+    """
+
+    if len(rows_df) == 0:
+        return
+
+    rows_df = add_key_occurrences(rows_df.copy())
+
+    with get_engine().begin() as connection:
+        table_columns = get_table_columns(connection, table_name)
+
+        if len(table_columns) == 0:
+            create_table(connection, table_name, rows_df.columns.tolist())
+            insert_rows(connection, table_name, rows_df)
+            return
+
+        #Add any columns the table doesn't have yet
+        for column in rows_df.columns:
+            if column not in table_columns and column != occurrence_column:
+                column_type = " INTEGER NOT NULL DEFAULT 0" if column == position_column else " TEXT NOT NULL DEFAULT ''"
+                connection.exec_driver_sql('ALTER TABLE ' + quote(table_name) + ' ADD COLUMN ' + quote(column) + column_type)
+
+        if is_keyed(table_columns) and is_keyed(rows_df.columns):
+            #Continue numbering from the rows already stored with the same key
+            connection.exec_driver_sql('DROP TABLE IF EXISTS temp.staging')
+            connection.exec_driver_sql('CREATE TEMP TABLE staging AS SELECT * FROM ' + quote(table_name) + ' WHERE 0')
+            insert_rows(connection, 'staging', rows_df)
+
+            table = quote(table_name)
+            quoted_columns = ', '.join(quote(column) for column in rows_df.columns if column not in storage_columns)
+            key_match = ' AND '.join(table + '.' + quote(column) + ' = staging.' + quote(column) for column in key_columns)
+            #The row positions continue from the last row of the table
+            last_position = connection.exec_driver_sql('SELECT COALESCE(MAX(' + quote(position_column) + ') + 1, 0) FROM ' + table).scalar()
+            connection.exec_driver_sql('INSERT INTO ' + table + ' (' + quoted_columns + ', ' + quote(occurrence_column) + ', ' + quote(position_column) + ')'
+                + ' SELECT ' + quoted_columns + ', staging.' + quote(occurrence_column) + ' + COALESCE((SELECT MAX(' + table + '.' + quote(occurrence_column) + ') + 1 FROM ' + table + ' WHERE ' + key_match + '), 0)'
+                + ', staging.' + quote(position_column) + ' + ' + str(int(last_position))
+                + ' FROM staging ORDER BY rowid')
+            connection.exec_driver_sql('DROP TABLE temp.staging')
+        else:
+            insert_rows(connection, table_name, rows_df)
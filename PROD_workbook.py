@@ -0,0 +1,231 @@
+import csv
+import os
+import tempfile
+from gspread.utils import a1_to_rowcol, rowcol_to_a1, numericise_all
+
+
+#Workbooks and worksheets that behave like gspread's Spreadsheet and Worksheet for the calls PROD_pending_upload makes:
+#worksheet(), get_all_values(), get_all_records(), col_values(), update(), batch_update(), append_rows(), insert_row() and clear().
+#The gspread workbook is the google sheet itself. These let the whole upload pipeline run offline, in memory or against CSV files on disk.
+
+def convert_to_cell_string(value):
+    """
+    This function takes in a value sent to a worksheet and returns the string the google sheet would display for it.
+
+    Parameter:
+        - value: The value written to the cell
+
+    Returns:
+        - str: The displayed cell value
+    """
+
+    if value is True:
+        return 'TRUE'
+    elif value is False:
+        return 'FALSE'
+    elif value is None or (isinstance(value, float) and value != value):
+        return ''
+    elif isinstance(value, float) and value.is_integer():
+        #The google sheet displays whole numbers without the decimal
+        return str(int(value))
+    else:
+        return str(value)
+
+class MemoryWorksheet:
+    """
+    A worksheet kept in memory as rows of displayed cell strings.
+    """
+
+    def __init__(self, title, values = None):
+        self.title = title
+        self.values = [list(row) for row in values] if values is not None else []
+
+    def get_all_values(self):
+        """
+        This function returns every row of the worksheet as lists of strings. Like the google sheet, the empty rows and columns
+        after the last value are left off.
+
+        Returns:
+            - values: A list of rows
+        """
+
+        values = [list(row) for row in self.values]
+
+        while len(values) > 0 and all(cell == '' for cell in values[-1]):
+            values.pop()
+
+        width = max([max([i + 1 for i, cell in enumerate(row) if cell != ''], default = 0) for row in values], default = 0)
+
+        return [row[:width] + [''] * (width - len(row)) for row in values]
+
+    def get_all_records(self):
+        """
+        This function returns the rows after the first as dictionaries keyed on the first row, with numbers converted to
+        ints and floats, the same way gspread does.
+
+        Returns:
+            - records: A list of dictionaries, one per row
+        """
+
+        values = self.get_all_values()
+
+        if len(values) == 0:
+            return []
+
+        return [dict(zip(values[0], numericise_all(row))) for row in values[1:]]
+
+    def col_values(self, col):
+        """
+        This function takes in a column number, starting at 1, and returns the column's values down to its last value.
+
+        Returns:
+            - values: A list of strings
+        """
+
+        column = [row[col - 1] if len(row) >= col else '' for row in self.values]
+
+        while len(column) > 0 and column[-1] == '':
+            column.pop()
+
+        return column
+
+    def write_values(self, start_row, start_col, values):
+        """
+        This function writes a block of values with its top left cell at the given row and column, both starting at 1.
+        The worksheet grows to fit the block. It doesn't save the worksheet, so a call that writes several blocks only saves once.
+        """
+
+        for i, row in enumerate(values):
+            row_number = start_row - 1 + i
+
+            while len(self.values) <= row_number:
+                self.values.append([])
+
+            sheet_row = self.values[row_number]
+            while len(sheet_row) < start_col - 1 + len(row):
+                sheet_row.append('')
+
+            for j, value in enumerate(row):
+                sheet_row[start_col - 1 + j] = convert_to_cell_string(value)
+
+    def update(self, range_name, values = None):
+        """
+        This function writes values to the worksheet. Like gspread, it can be called with just the values, which are written
+        starting at A1, or with the A1 cell or range to start at and the values.
+        """
+
+        if values is None:
+            range_name, values = 'A1', range_name
+
+        start_row, start_col = a1_to_rowcol(range_name.split(':')[0])
+        self.write_values(start_row, start_col, values)
+        self.save()
+
+    def batch_update(self, data):
+        """
+        This function takes in a list of {'range', 'values'} dictionaries and writes each block of values. The worksheet is
+        saved once, after every block is written.
+        """
+
+        for block in data:
+            start_row, start_col = a1_to_rowcol(block['range'].split(':')[0])
+            self.write_values(start_row, start_col, block['values'])
+
+        self.save()
+
+    def append_rows(self, values, value_input_option = 'RAW', table_range = None):
+        """
+        This function adds rows below the last row with a value. Like gspread, it returns the response with the range the rows
+        were written to.
+        """
+
+        start_row = len(self.get_all_values()) + 1
+        self.write_values(start_row, 1, values)
+        self.save()
+
+        width = max([len(row) for row in values], default = 1)
+        updated_range = "'" + self.title + "'!" + rowcol_to_a1(start_row, 1) + ':' + rowcol_to_a1(start_row + len(values) - 1, width)
+
+        return {'updates': {'updatedRange': updated_range}}
+
+    def insert_row(self, values, index = 1, value_input_option = 'RAW'):
+        """
+        This function inserts a row at the given row number, starting at 1, and moves the rows below it down.
+        """
+
+        self.values.insert(index - 1, [convert_to_cell_string(value) for value in values])
+        self.save()
+
+    def clear(self):
+        """
+        This function empties the worksheet.
+        """
+
+        self.values = []
+        self.save()
+
+    def save(self):
+        """
+        An in-memory worksheet has nothing to save.
+        """
+
+        return
+
+class MemoryWorkbook:
+    """
+    A workbook of MemoryWorksheets. Tabs are created empty the first time they are opened.
+    """
+
+    def __init__(self, worksheets = None):
+        self.worksheets = {}
+
+        for title, values in (worksheets or {}).items():
+            self.worksheets[title] = MemoryWorksheet(title, values)
+
+    def worksheet(self, title):
+        if title not in self.worksheets:
+            self.worksheets[title] = MemoryWorksheet(title)
+
+        return self.worksheets[title]
+
+class LocalFileWorksheet(MemoryWorksheet):
+    """
+    A worksheet kept in a CSV file. The file is rewritten once for every call that changes the worksheet.
+    """
+
+    def __init__(self, title, path):
+        self.path = path
+
+        if os.path.exists(path):
+            with open(path, newline = '', encoding = 'utf-8') as f:
+                values = list(csv.reader(f))
+        else:
+            values = None
+
+        MemoryWorksheet.__init__(self, title, values)
+
+    def save(self):
+        #Write to a temporary file first, so a crash can't leave a half written tab
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok = True)
+        fd, temp_path = tempfile.mkstemp(dir = directory, suffix = '.tmp')
+
+        with os.fdopen(fd, 'w', newline = '', encoding = 'utf-8') as f:
+            csv.writer(f).writerows(self.values)
+
+        os.replace(temp_path, self.path)
+
+class LocalFileWorkbook:
+    """
+    A workbook kept in a directory, with one CSV file per tab.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.worksheets = {}
+
+    def worksheet(self, title):
+        if title not in self.worksheets:
+            self.worksheets[title] = LocalFileWorksheet(title, os.path.join(self.directory, title + '.csv'))
+
+        return self.worksheets[title]
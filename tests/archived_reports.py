@@ -0,0 +1,72 @@
+import ast
+import io
+import json
+import os
+
+
+#Report text extracted with pdfminer3 and saved in the outputs of the archive notebooks: (notebook, cell).
+#There are no archived civil disposed or civil inactive reports.
+archived_reports = {
+    'Civil': ('ja_scratch.ipynb', 8),
+    'Criminal': ('jsmith_criminal_workbook.ipynb', 38),
+    'Criminal Disposed': ('jsmith_criminal_disposed_cases.ipynb', 4),
+    'Juvenile': ('jsmith_juvenile_cases_2.ipynb', 3),
+    'Criminal Inactive': ('jsmith_workbook_6.ipynb', 5)
+}
+
+archive_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'archive')
+
+def load_archived_report(report_type):
+    """
+    This function takes in a report type and returns the text of the archived report of that type. The notebook cell printed
+    the text's repr, so it is read back with literal_eval.
+
+    Parameter:
+        - report_type: A report type in archived_reports
+
+    Returns:
+        - text: The report text, pages ending with form feeds
+    """
+
+    notebook, cell = archived_reports[report_type]
+
+    with open(os.path.join(archive_directory, notebook), encoding = 'utf-8') as f:
+        output = json.load(f)['cells'][cell]['outputs'][0]
+
+    return ast.literal_eval(''.join(output['data']['text/plain']))
+
+def build_report_pdf(pages):
+    """
+    This function takes in the text of report pages and draws them into a PDF, one fixed-width line of Courier per line of
+    text, the way the county system prints its reports. Extracting the PDF with pdfminer3 gives the text back, so the
+    extraction settings can be checked against the parsers.
+
+    Parameter:
+        - pages: A list of the text of each page
+
+    Returns:
+        - pdf_bytes: The PDF as bytes
+    """
+
+    #Only the extraction tests need reportlab
+    from reportlab.pdfgen import canvas
+
+    font_size = 8
+    line_height = 9
+    line_lists = [page.rstrip('\f').split('\n') for page in pages]
+    page_width = 40 + font_size * 0.6 * max([len(line) for lines in line_lists for line in lines] + [1])
+    page_height = 40 + line_height * max([len(lines) for lines in line_lists] + [1])
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize = (page_width, page_height))
+    for lines in line_lists:
+        text_object = pdf.beginText(20, page_height - 20)
+        text_object.setFont('Courier', font_size)
+        text_object.setLeading(line_height)
+        for line in lines:
+            text_object.textLine(line)
+        pdf.drawText(text_object)
+        pdf.showPage()
+    pdf.save()
+
+    return buffer.getvalue()
@@ -0,0 +1,57 @@
+#Run from the repository root with: python tests/benchmark_acquire_parsers.py [--rows 10000] [--repeat 5] [--compare]
+import argparse
+import builtins
+import itertools
+import time
+#Puts the repository root on the path, the same way it is when pytest runs the tests
+import conftest
+import archived_reports
+import baseline_acquire
+import PROD_acquire
+
+
+def build_report(report_type, row_count):
+    """
+    This function takes in a report type and a number of cases, and builds a report with about that many cases by repeating
+    the pages of the archived report of that type. The first page keeps its header, so the parsers read the report normally.
+    """
+
+    text = archived_reports.load_archived_report(report_type)
+    pages = list(PROD_acquire.split_into_pages(text))
+    case_count = len(PROD_acquire.build_dataframe(report_type, text))
+    page_count = max(len(pages), round(len(pages) * row_count / case_count))
+
+    return ''.join(itertools.islice(itertools.cycle(pages), page_count))
+
+def time_parser(module, report_type, text, repeat):
+    """
+    This function parses the text with the module's build_dataframe and returns the number of cases and the fastest time.
+    """
+
+    seconds = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        df = module.build_dataframe(report_type, text)
+        seconds.append(time.perf_counter() - start_time)
+
+    return len(df), min(seconds)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Time each PROD_acquire parser over synthetic reports built from the archived reports.')
+    parser.add_argument('--rows', type = int, default = 10000, help = 'About how many cases each report should have')
+    parser.add_argument('--repeat', type = int, default = 5, help = 'How many times to parse each report. The fastest run is shown.')
+    parser.add_argument('--compare', action = 'store_true', help = 'Also time the parsers in baseline_acquire')
+    args = parser.parse_args()
+
+    #The parsers print how many cases they collected
+    print_output = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+
+    print_output(f"{'Report':<18} {'Cases':>7} {'Current (ms)':>13}" + (f" {'Baseline (ms)':>14}" if args.compare else ''))
+    for report_type in archived_reports.archived_reports:
+        text = build_report(report_type, args.rows)
+        case_count, seconds = time_parser(PROD_acquire, report_type, text, args.repeat)
+        line = f"{report_type:<18} {case_count:>7} {seconds * 1000:>13.1f}"
+        if args.compare:
+            line += f" {time_parser(baseline_acquire, report_type, text, args.repeat)[1] * 1000:>14.1f}"
+        print_output(line)
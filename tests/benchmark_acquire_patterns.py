@@ -0,0 +1,62 @@
+#Run from the repository root with: python tests/benchmark_acquire_patterns.py [--pages 1000] [--compare]
+import argparse
+import itertools
+import re
+import time
+#Puts the repository root on the path, the same way it is when pytest runs the tests
+import conftest
+import archived_reports
+import PROD_acquire
+from test_acquire import uncompiled_patterns
+
+
+#The report each pattern runs on. There are no archived civil disposed or civil inactive reports, so those patterns are timed
+#on the civil pending report, where they find nothing. That is the slowest case for a header pattern.
+pattern_reports = {
+    'page_pattern': 'Civil',
+    'civil_header_pattern': 'Civil',
+    'civil_disposed_header_pattern': 'Civil',
+    'civil_inactive_header_pattern': 'Civil',
+    'criminal_header_pattern': 'Criminal',
+    'criminal_cases_filed_total_pattern': 'Criminal',
+    'criminal_mtr_filings_total_pattern': 'Criminal',
+    'criminal_cases_added_total_pattern': 'Criminal',
+    'criminal_disposed_header_pattern': 'Criminal Disposed',
+    'juvenile_header_pattern': 'Juvenile',
+    'criminal_inactive_header_pattern': 'Criminal Inactive'
+}
+
+def build_report(report_type, page_count):
+    """
+    This function takes in a report type and a number of pages, and builds a report that long by repeating the pages of the
+    archived report of that type.
+    """
+
+    pages = list(PROD_acquire.split_into_pages(archived_reports.load_archived_report(report_type)))
+
+    return ''.join(itertools.islice(itertools.cycle(pages), page_count))
+
+def time_pattern(pattern, text):
+    start_time = time.perf_counter()
+    pattern.sub('', text)
+    return time.perf_counter() - start_time
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Time each PROD_acquire pattern over synthetic reports built from the archived reports.')
+    parser.add_argument('--pages', type = int, default = 1000, help = 'The number of pages in each report')
+    parser.add_argument('--compare', action = 'store_true', help = 'Also time the uncompiled patterns. Some take minutes on 1,000 pages.')
+    args = parser.parse_args()
+
+    reports = {report_type: build_report(report_type, args.pages) for report_type in set(pattern_reports.values())}
+
+    print(f"{'Pattern':<36} {'Report':<18} {'Compiled (s)':>12}" + (f" {'Uncompiled (s)':>15}" if args.compare else ''))
+    for pattern_name, report_type in pattern_reports.items():
+        line = f"{pattern_name:<36} {report_type:<18} {time_pattern(getattr(PROD_acquire, pattern_name), reports[report_type]):>12.3f}"
+        if args.compare:
+            line += f" {time_pattern(re.compile(uncompiled_patterns[pattern_name]), reports[report_type]):>15.3f}"
+        print(line)
+
+    #The civil parser removes the headers page by page, holding the end of a page that could start a header on the next one
+    start_time = time.perf_counter()
+    ''.join(PROD_acquire.remove_civil_page_headers(PROD_acquire.split_into_pages(reports['Civil'])))
+    print(f"{'remove_civil_page_headers':<36} {'Civil':<18} {time.perf_counter() - start_time:>12.3f}")
@@ -0,0 +1,78 @@
+#Run from the repository root with: python tests/benchmark_extract.py [--pages 20] [--repeat 3]
+import argparse
+import builtins
+import itertools
+import time
+#Puts the repository root on the path, the same way it is when pytest runs the tests
+import conftest
+import archived_reports
+import PROD_acquire
+import PROD_extract
+from pdfminer3.layout import LAParams
+
+
+#The layout settings to time against the ones PROD_extract uses. None turns layout analysis off.
+layout_variants = {
+    'default': LAParams(),
+    'no box grouping': LAParams(boxes_flow = 2),
+    'line_margin=0.3': LAParams(line_margin = 0.3),
+    'line_margin=1.0': LAParams(line_margin = 1.0),
+    'char_margin=1.0': LAParams(char_margin = 1.0),
+    'line_overlap=0.1': LAParams(line_overlap = 0.1),
+    'no layout analysis': None
+}
+
+def build_pdf(report_type, page_count):
+    """
+    This function takes in a report type and a number of pages, and draws a PDF that long by repeating the pages of the
+    archived report of that type.
+    """
+
+    pages = list(PROD_acquire.split_into_pages(archived_reports.load_archived_report(report_type)))
+
+    return archived_reports.build_report_pdf(list(itertools.islice(itertools.cycle(pages), page_count)))
+
+def time_extraction(pdf_bytes, layout_params, repeat):
+    """
+    This function extracts a PDF with the given layout settings and returns the text and the fastest time of the runs.
+    """
+
+    PROD_extract.layout_params = layout_params
+    seconds = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        content = PROD_extract.get_file_content(pdf_bytes)
+        seconds.append(time.perf_counter() - start_time)
+
+    return content, min(seconds)
+
+def get_case_rows(report_type, content):
+    """
+    This function parses the text and returns the cases as strings, or None if the parser fails on it.
+    """
+
+    try:
+        return PROD_acquire.build_dataframe(report_type, content).astype(str).values.tolist()
+    except Exception:
+        return None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Time pdfminer3 layout settings on PDFs drawn from the archived reports.')
+    parser.add_argument('--pages', type = int, default = 20, help = 'The number of pages in each PDF')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'How many times to extract each PDF. The fastest run is shown.')
+    args = parser.parse_args()
+
+    #The parsers print how many cases they collected
+    print_output = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+
+    print_output(f"{'Report':<18} {'Layout':<20} {'Seconds':>8} {'vs Default':>10}  {'Same Text':<10} {'Same Cases':<10}")
+    for report_type in archived_reports.archived_reports:
+        pdf_bytes = build_pdf(report_type, args.pages)
+        default_content, default_seconds = time_extraction(pdf_bytes, layout_variants['default'], args.repeat)
+        default_rows = get_case_rows(report_type, default_content)
+
+        for layout_name, layout_params in layout_variants.items():
+            content, seconds = time_extraction(pdf_bytes, layout_params, args.repeat)
+            print_output(f"{report_type:<18} {layout_name:<20} {seconds:>8.2f} {seconds / default_seconds:>10.2f}  "
+                         f"{str(content == default_content):<10} {str(get_case_rows(report_type, content) == default_rows):<10}")
@@ -0,0 +1,26 @@
+#Run from the repository root with: python tests/benchmark_prepare.py [--rows 100000]
+import argparse
+import random
+import timeit
+import pandas as pd
+#Puts the repository root on the path, the same way it is when pytest runs the tests
+import conftest
+import PROD_prepare
+from test_prepare import make_name_lists
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Time convert_name_lists_to_strings against applying convert_name_list_to_string to each row.')
+    parser.add_argument('--rows', type = int, default = 100000, help = 'The number of rows in the column')
+    args = parser.parse_args()
+
+    name_lists = make_name_lists(random.Random(17), args.rows)
+
+    #Check the output is the same before timing it
+    pd.testing.assert_series_equal(PROD_prepare.convert_name_lists_to_strings(name_lists), name_lists.apply(PROD_prepare.convert_name_list_to_string))
+
+    column_time = min(timeit.repeat(lambda: PROD_prepare.convert_name_lists_to_strings(name_lists), number = 1, repeat = 5))
+    apply_time = min(timeit.repeat(lambda: name_lists.apply(PROD_prepare.convert_name_list_to_string), number = 1, repeat = 5))
+
+    print(f"{'Rows':<8} {'str.join (s)':>12} {'apply (s)':>10} {'Speedup':>8}")
+    print(f"{args.rows:<8} {column_time:>12.4f} {apply_time:>10.4f} {apply_time / column_time:>7.2f}x")
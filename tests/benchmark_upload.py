@@ -0,0 +1,167 @@
+#Run from the repository root with: python tests/benchmark_upload.py [--months 24] [--workbook memory] [--seed 0]
+import argparse
+import builtins
+import random
+import re
+import tempfile
+import time
+import warnings
+from datetime import date
+#Puts the repository root on the path, the same way it is when pytest runs the tests
+import conftest
+import archived_reports
+import PROD_acquire
+import PROD_classify
+import PROD_pending_upload
+import PROD_prepare
+import PROD_workbook
+
+
+#The share of a report's cases that are closed each month and replaced by new ones
+monthly_turnover = 0.03
+
+#The archived criminal and criminal inactivity reports were saved without their first page header. These headers are put in
+#front of them, padded to where each parser starts reading the body, so their reports have a county and an 'AS OF' date.
+missing_report_headers = {
+    'Criminal': ('COUNTY OF ZAVALA 293RD DISTRICT COURT CRIMINAL DETAILED PENDING CASES RAN ON 01/14/2022\nAS OF 01/14/2022\n', 500),
+    'Criminal Inactive': ('LEOPOLDO VIELMA PENDING CRIMINAL CASES - INACTIVITY REPORT RAN ON 01/14/2022\nAS OF 01/14/2022\n', 368)
+}
+
+#The first 'AS OF' date of the synthetic reports. Every report in a month shares the month's last day as its date.
+first_month = date(2022, 1, 1)
+
+def get_month_end(month_number):
+    """
+    This function takes in how many months after first_month it is, and returns the last day of that month as MM/DD/YYYY.
+    """
+
+    year, month = divmod(first_month.month - 1 + month_number, 12)
+    next_month = date(first_month.year + year + (month + 1) // 12, (month + 1) % 12 + 1, 1)
+
+    return date.fromordinal(next_month.toordinal() - 1).strftime('%m/%d/%Y')
+
+def renumber_cause_number(cause_number, rng):
+    """
+    This function takes in a cause number and returns a new one with the same shape, so it still fits the report columns.
+    """
+
+    return re.sub(r'[0-9]', lambda match: str(rng.randrange(10)), cause_number)
+
+def build_monthly_reports(month_count, seed = 0, report_types = None):
+    """
+    This function takes in a number of months and builds that many months of synthetic reports from the archived reports.
+    Each month, a few cases of every report but the juvenile report are given new cause numbers, so the old cases close
+    and new ones open, and every report is dated the last day of the month. The reports are built the way the app builds
+    them before an upload.
+
+    Parameters:
+        - month_count: The number of months of reports
+        - seed: The seed of the random cause number changes
+        - report_types: A list of the archived report types to use, or None for all of them
+
+    Returns:
+        - monthly_reports: A list with a list of report dictionaries for each month
+    """
+
+    rng = random.Random(seed)
+    report_types = list(archived_reports.archived_reports) if report_types is None else report_types
+
+    #Read each archived report and its first page header once
+    archives = {}
+    for report_type in report_types:
+        text = archived_reports.load_archived_report(report_type)
+        if report_type in missing_report_headers:
+            header, body_start = missing_report_headers[report_type]
+            text = header.ljust(body_start) + text
+        report_header = PROD_classify.classify_header(next(iter(PROD_acquire.split_into_pages(text))), report_type)
+        cause_numbers = [cause_number for cause_number in PROD_acquire.build_dataframe(report_type, text)['Cause Number'].unique() if cause_number]
+        archives[report_type] = {'Text': text, 'Header': report_header, 'Cause Numbers': {cause_number: cause_number for cause_number in cause_numbers}}
+
+    monthly_reports = []
+    for month_number in range(month_count):
+        as_of_date = get_month_end(month_number)
+
+        #One load context per batch, like the app. The load time is fixed so runs can be compared.
+        load_context = PROD_prepare.get_load_context(as_of_date)
+        load_context['Load DateTime'] = as_of_date + ' 09:00:00'
+
+        reports = []
+        for report_type, archive in archives.items():
+            current_cause_numbers = archive['Cause Numbers']
+            #The juvenile report lists every case, disposed or not, so its cases never leave the report
+            if month_number > 0 and report_type != 'Juvenile':
+                for cause_number in current_cause_numbers:
+                    if rng.random() < monthly_turnover:
+                        current_cause_numbers[cause_number] = renumber_cause_number(cause_number, rng)
+
+            #Swap every changed cause number and the 'AS OF' date into the archived text. Both keep their length.
+            replacements = {cause_number: new_cause_number for cause_number, new_cause_number in current_cause_numbers.items() if cause_number != new_cause_number}
+            replacements[archive['Header']['As Of Date']] = as_of_date
+            pattern = re.compile(r'(?<![\w-])(' + '|'.join(map(re.escape, sorted(replacements, key = len, reverse = True))) + r')(?![\w-])')
+            content = pattern.sub(lambda match: replacements[match.group(1)], archive['Text'])
+
+            reports.append({'County': archive['Header']['County'], 'Report Type': report_type, 'As Of Date': as_of_date,
+                            'Content': content, 'Load Context': load_context, 'Load DateTime': load_context['Load DateTime']})
+
+        monthly_reports.append(reports)
+
+    return monthly_reports
+
+def add_report_tracker(workbook):
+    """
+    This function adds the report tracker tab to an empty workbook, with a row for every county and report type.
+    """
+
+    rows = [[county, report_type, '', ''] for county in PROD_pending_upload.tracked_counties for report_type in PROD_pending_upload.tracked_report_types]
+    workbook.worksheet(PROD_pending_upload.report_tracker_sheet_name).update([['County', 'Report Type', 'Report Date', 'Load DateTime']] + rows + [['All Counties', 'Juvenile', '', '']])
+
+def upload_monthly_reports(workbook, monthly_reports):
+    """
+    This function uploads each month of reports to the workbook in one upload batch, the way the app uploads a batch of
+    reports, and returns how many seconds each month took.
+    """
+
+    PROD_pending_upload.use_workbook(workbook)
+    month_seconds = []
+    try:
+        for reports in monthly_reports:
+            start_time = time.perf_counter()
+            PROD_pending_upload.open_upload_batch()
+            try:
+                for report in reports:
+                    PROD_pending_upload.update_spreadsheet(dict(report))
+            finally:
+                PROD_pending_upload.close_upload_batch()
+            month_seconds.append(time.perf_counter() - start_time)
+    finally:
+        PROD_pending_upload.use_workbook(None)
+
+    return month_seconds
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Time update_spreadsheet over months of synthetic reports built from the archived reports.')
+    parser.add_argument('--months', type = int, default = 24, help = 'The number of months of reports to upload')
+    parser.add_argument('--workbook', choices = ['memory', 'local_file'], default = 'memory', help = 'Where the tabs are kept')
+    parser.add_argument('--seed', type = int, default = 0, help = 'The seed of the random cause number changes')
+    args = parser.parse_args()
+
+    #The parsers and upload functions print their progress, and pandas warns about their chained assignments
+    print_output = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+    warnings.simplefilter('ignore')
+
+    monthly_reports = build_monthly_reports(args.months, args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        workbook = PROD_workbook.MemoryWorkbook() if args.workbook == 'memory' else PROD_workbook.LocalFileWorkbook(directory)
+        add_report_tracker(workbook)
+        month_seconds = upload_monthly_reports(workbook, monthly_reports)
+
+        print_output(f"{'Month':<12} {'Seconds':>8}")
+        for reports, seconds in zip(monthly_reports, month_seconds):
+            print_output(f"{reports[0]['As Of Date']:<12} {seconds:>8.2f}")
+        print_output(f"{'Total':<12} {sum(month_seconds):>8.2f}")
+
+        print_output(f"\n{'Tab':<28} {'Rows':>7}")
+        for sheet_name in sorted(workbook.worksheets):
+            print_output(f"{sheet_name:<28} {len(workbook.worksheet(sheet_name).get_all_records()):>7}")
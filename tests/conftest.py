@@ -0,0 +1,6 @@
+import os
+import sys
+
+
+#The PROD modules import each other by name from the repository root, the same way Streamlit runs them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
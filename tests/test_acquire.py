@@ -0,0 +1,424 @@
+import random
+import re
+import sys
+import pandas as pd
+import pytest
+import PROD_acquire
+import PROD_classify
+import archived_reports
+import baseline_acquire
+
+
+dashed_line = '-------------------------------------------------------------------------------------------------------------'
+
+#Page headers as they appear on the civil pending cases report. The second one has nothing but letters and spaces above the
+#column titles, so it can finish a header that started at the bottom of the page before it.
+civil_page_headers = [
+    '   293RD DISTRICT COURT                 CIVIL PENDING CASES                    MARCH 01, 2023\n'
+    '   MAVERICK COUNTY                       AS OF 02/28/2023\n\n'
+    ' CAUSE NUMBER       FILE DATE  CAUSE OF ACTION           DOCKET DATE DOCKET TYPE       ANS FILE  CR NUMBER\n'
+    ' PLAINTIFF NAME                        PLAINTIFF ATTORNEY        DEFENDANT NAME                  DEFENDANT ATTORNEY',
+    '   293RD DISTRICT COURT CIVIL PENDING CASES\n\n'
+    ' CAUSE NUMBER       FILE DATE  CAUSE OF ACTION           DOCKET DATE DOCKET TYPE       ANS FILE  CR NUMBER\n'
+    ' PLAINTIFF NAME                        PLAINTIFF ATTORNEY        DEFENDANT NAME                  DEFENDANT ATTORNEY'
+]
+
+def pad(value, width):
+    return value.ljust(width)[:width]
+
+def make_civil_case(rng, number):
+    """
+    This function builds the lines of one random case block. Some blocks hold combined cases.
+    """
+
+    lines = []
+    for combined in range(rng.choice([1, 1, 1, 2, 3])):
+        cause_number = '%02dCV%05d' % (rng.randint(15, 23), number * 10 + combined)
+        lines.append(pad(cause_number, 19) + pad('01/02/2020', 11) + pad(rng.choice(['DEBT', 'DIVORCE', 'TAX']), 26)
+                     + pad(rng.choice(['', '03/07/2023']), 12) + pad(rng.choice(['', 'HEARING']), 18) + pad('', 10) + 'CR%d' % number)
+        #The plaintiff names are on the second line
+        lines.append(pad(rng.choice(['STATE OF TEXAS', 'SMITH JOHN', 'TX DFPS']), 38))
+        for attorney in range(rng.randint(0, 3)):
+            lines.append(pad(rng.choice(['JONES', 'DOE JANE', '']), 38) + pad(rng.choice(['SMITH ATTY', 'GARCIA', '']), 26)
+                         + pad('DEFENDANT', 30) + rng.choice(['LOPEZ ATTY', 'PRO SE', '']))
+
+    return '\n'.join(lines)
+
+def make_civil_report(rng):
+    """
+    This function builds the pages of a random civil pending cases report. The pages are built the way pdfminer3 writes them,
+    each ending with a form feed, with random whitespace around them and headers that can start on the page before.
+    """
+
+    blocks = [make_civil_case(rng, number) for number in range(rng.randint(0, 12))]
+    body = '\n' + ''.join('\n' + dashed_line + '\n' + block for block in blocks) + '\n' + dashed_line + '\n  TOTAL CASES: %d\n' % len(blocks)
+
+    #Cut the body into pages at random points
+    cut_points = sorted(rng.sample(range(1, len(body)), min(len(body) - 1, rng.randint(0, 6))))
+    pieces = [body[start:end] for start, end in zip([0] + cut_points, cut_points + [len(body)])]
+
+    pages = []
+    for i, piece in enumerate(pieces):
+        header = civil_page_headers[0] if i == 0 else rng.choice(civil_page_headers)
+        leading = rng.choice(['', '\n', '   \n\n  '])
+        #Some pages end with a line of capitals and a blank line, which the next page's header can finish
+        trailing = rng.choice(['', '\n', '\n\n', '   \n\n  ', '\nPAGE %d OF %d\n\n' % (i + 1, len(pieces))])
+        pages.append(leading + header + piece + trailing + '\f')
+
+    #Some reports start with a blank page, and some first pages are shorter than the header
+    if rng.random() < 0.2:
+        pages.insert(0, '  \n \f')
+    if rng.random() < 0.2 and len(pages[0]) > 100:
+        pages[0:1] = [pages[0][:100] + '\f', pages[0][100:]]
+
+    return pages
+
+def build_civil_cases_whole_document(text):
+    """
+    The civil parser before it read reports page by page: the whole report is stripped, the headers are removed from all of it
+    at once, and then it's split into cases.
+    """
+
+    text = text.strip()
+    header = PROD_classify.classify_header(text[:389], 'Civil')
+
+    text = re.sub(r"""[A-Z0-9 ()/]*\n\n\s*[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""", '', text)
+    cases = text.split(dashed_line)
+    cases.pop()
+
+    case_dicts = []
+    for case in cases:
+        case_dicts.extend(PROD_acquire.extract_civil_case_data(case.lstrip().split('\n'), header['County']))
+
+    return header, case_dicts
+
+@pytest.mark.parametrize('seed', range(300))
+def test_paged_civil_parser_matches_whole_document(seed):
+    pages = make_civil_report(random.Random(seed))
+    header, case_dicts = build_civil_cases_whole_document(''.join(pages))
+
+    df = PROD_acquire.build_civil_cases_dataframe_from_pages(iter(pages))
+
+    expected = pd.DataFrame(case_dicts)
+    assert df.columns.tolist()[:len(expected.columns)] == expected.columns.tolist()
+    assert df.reindex(columns = expected.columns).astype(str).values.tolist() == expected.astype(str).values.tolist()
+    assert (df['Original As Of Date'] == header['As Of Date']).all()
+    assert (df['Report Generated Date'] == header['Report Generated Date']).all()
+
+@pytest.mark.parametrize('seed', range(300))
+def test_page_header_removal_matches_whole_document(seed):
+    pages = make_civil_report(random.Random(seed))
+
+    expected = re.sub(r"""[A-Z0-9 ()/]*\n\n\s*[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""", '', ''.join(pages))
+
+    assert ''.join(PROD_acquire.remove_civil_page_headers(iter(pages))) == expected
+
+def test_header_finishing_on_the_next_page_is_removed():
+    pages = ['CASE LINE\n\nLAST LINE\n\n\f', '  CIVIL PENDING CASES\n CAUSE NUMBER  DEFENDANT ATTORNEY\nNEXT LINE\f']
+
+    assert ''.join(PROD_acquire.remove_civil_page_headers(pages)) == 'CASE LINE\n\n\nNEXT LINE\f'
+
+#Pieces of civil report text that sit on the edges of the header pattern
+civil_header_tokens = ['A', '9', ' ', '(', '/', '\n', '\n\n', '\t', '\f', '#', 'x', '-', 'DEFENDANT ATTORNEY']
+
+@pytest.mark.parametrize('seed', range(300))
+def test_find_civil_headers_matches_the_header_pattern(seed):
+    rng = random.Random(seed)
+    text = ''.join(rng.choice(civil_header_tokens) for _ in range(rng.randint(0, 60)))
+
+    assert list(PROD_acquire.find_civil_headers(text)) == [match.span() for match in PROD_acquire.civil_header_pattern.finditer(text)]
+    assert ''.join(PROD_acquire.remove_civil_page_headers(PROD_acquire.split_into_pages(text))) == PROD_acquire.civil_header_pattern.sub('', text)
+
+def test_find_civil_headers_on_the_archived_report():
+    text = archived_reports.load_archived_report('Civil')
+
+    assert list(PROD_acquire.find_civil_headers(text)) == [match.span() for match in PROD_acquire.civil_header_pattern.finditer(text)]
+
+#The inline patterns PROD_acquire used before they were compiled with the (?=(X))\1 rewrite
+uncompiled_patterns = {
+    'page_pattern': r"[^\f]*\f|[^\f]+$",
+    'civil_header_pattern': r"""[A-Z0-9 ()/]*\n\n\s*[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""",
+    'civil_disposed_header_pattern': r"""\s*[A-Z]{3,9}\s[0-9]{1,2},\s[0-9]{4}\s[a-zA-Z0-9 \n/-]*:[a-zA-Z0-9 \n/-]*:[A-Za-z0-9 \n\./-]*DEFENDANT\s{1,23}\n""",
+    'criminal_header_pattern': r"""\n\x0c\s*[A-Z -]*\d{2}/\d{2}/\d{4}\n\s*\w{6,8}[A-Z0-9 -]*\n\s*[A-Z ]*\d{2}/\d{2}/\d{4}[A-Z0-9 -]*\n\n[A-Z ]*#\s*[A-Z -']*\n[A-Z0-9/ -]*\n\n""",
+    'criminal_cases_filed_total_pattern': r"""\nTOTAL NUMBER OF CASES FILED: [0-9\n-]*MTR-A[A-Z\n ]*[-]*""",
+    'criminal_mtr_filings_total_pattern': r"""\n{0,1}TOTAL NUMBER OF MTR-A FILINGS: [0-9\n-]*ALL OTHER CASES ADDED/APPEALED[\n-]*""",
+    'criminal_cases_added_total_pattern': r"""\n{0,1}TOTAL NUMBER OF CASES ADDED/APPEALED: [0-9- a-zA-Z\.#;,:'=\n]*""",
+    'criminal_disposed_header_pattern': r"""\n\x0c\s*[A-Z]{3,9}\s[0-9]{1,2},\s[0-9]{4}\s[a-zA-Z0-9 \n:/-]*#\s*[A-Z /]*\n\n""",
+    'juvenile_header_pattern': r"""\n\x0c\s*[A-Z0-9 \(\)\n/#\:-]*\.\sDATE""",
+    'civil_inactive_header_pattern': r"""\s*[A-Z\.\' \n-]*\d{2}/\d{2}/\d{4}\n\s*[A-Z0-9 \:-]*\d{2}/\d{2}/\d{4}[A-Z0-9 \n#-]*INACTIVE REASON\s{29}""",
+    'criminal_inactive_header_pattern': r"""\n\x0c\s*[A-Z\.\' \n-]*\d{2}/\d{2}/\d{4}\n\s*[A-Z0-9 \:-]*\d{2}/\d{2}/\d{4}[A-Z0-9 \n#-]*STATE REPORT COLUMN\n\n"""
+}
+
+def get_pattern_test_texts():
+    """
+    This function returns the archived report text to check the compiled patterns against: the first pages of each report,
+    and the same pages with lines randomly dropped, doubled and cut short, like a malformed extraction.
+    """
+
+    rng = random.Random(13)
+    texts = []
+
+    for report_type in archived_reports.archived_reports:
+        #The uncompiled patterns can backtrack for minutes on long or malformed text, which is why they were rewritten.
+        #Only the first part of each report is used, so they finish.
+        text = archived_reports.load_archived_report(report_type)[:8000]
+        texts.append((report_type, text))
+
+        lines = text.split('\n')
+        malformed_lines = []
+        for line in lines:
+            choice = rng.random()
+            if choice < 0.1:
+                continue
+            elif choice < 0.2:
+                malformed_lines.extend([line, line])
+            elif choice < 0.3:
+                malformed_lines.append(line[:rng.randint(0, len(line))])
+            else:
+                malformed_lines.append(line)
+        texts.append((report_type + ' Malformed', '\n'.join(malformed_lines)))
+
+    return texts
+
+pattern_test_texts = get_pattern_test_texts()
+
+@pytest.mark.parametrize('pattern_name', sorted(uncompiled_patterns))
+def test_compiled_patterns_match_the_uncompiled_patterns(pattern_name):
+    uncompiled_pattern = re.compile(uncompiled_patterns[pattern_name])
+    compiled_pattern = getattr(PROD_acquire, pattern_name)
+
+    for text_name, text in pattern_test_texts:
+        expected = [(match.span(), match.group()) for match in uncompiled_pattern.finditer(text)]
+        assert [(match.span(), match.group()) for match in compiled_pattern.finditer(text)] == expected, text_name
+
+def test_header_patterns_find_the_archived_headers():
+    #Each archived report has one header per page for its own pattern to remove
+    for report_type, pattern, first_page_header in [
+        ('Civil', PROD_acquire.civil_header_pattern, 1),
+        ('Criminal Disposed', PROD_acquire.criminal_disposed_header_pattern, 0),
+        ('Criminal Inactive', PROD_acquire.criminal_inactive_header_pattern, 0)
+    ]:
+        text = archived_reports.load_archived_report(report_type)
+        assert len(pattern.findall(text)) == text.count('\f') - 1 + first_page_header, report_type
+
+def extract_civil_case_data_recursively(case_info, county):
+    """
+    The civil case parser before it was made iterative. Each combined case was parsed by calling it again on the rest of the
+    lines, so the combined cases come first, last one first.
+    """
+
+    case_list = []
+    case_info[0] = case_info[0].lstrip()
+
+    plaintiff_attorneys = []
+    defendant_attorneys = []
+
+    for i in range(2, len(case_info)):
+        if PROD_acquire.check_for_combined_case(case_info[i][:38]) == True:
+            case_list.extend(extract_civil_case_data_recursively(case_info[i:], county))
+            break
+
+        plaintiff_attorney = case_info[i][38:64]
+        if plaintiff_attorney.isspace() == False and len(plaintiff_attorney) > 0:
+            plaintiff_attorneys.append(plaintiff_attorney.strip())
+
+        defendant_attorney = case_info[i][94:]
+        if defendant_attorney.isspace() == False and len(defendant_attorney) > 0:
+            defendant_attorneys.append(defendant_attorney.strip())
+
+    case_list.append({
+        'County': county,
+        'Cause Number': case_info[0][:19].strip(),
+        'File Date': case_info[0][19:30].strip(),
+        'Cause of Action': case_info[0][30:56].strip(),
+        'Docket Date': case_info[0][56:68].strip(),
+        'Docket Type': case_info[0][68:86].strip(),
+        'ANS File': case_info[0][86:96].strip(),
+        'CR Number': case_info[0][96:].strip(),
+        'Plaintiff Attorney': list(set(plaintiff_attorneys)),
+        'Defendant Attorney': list(set(defendant_attorneys))
+    })
+
+    return case_list
+
+def normalize_civil_case_dicts(case_dicts):
+    #The attorney lists come from sets, so their order can differ between runs
+    return [dict(case_dict, **{'Plaintiff Attorney': sorted(case_dict['Plaintiff Attorney']),
+                               'Defendant Attorney': sorted(case_dict['Defendant Attorney'])}) for case_dict in case_dicts]
+
+def assert_civil_parsers_match(case_info):
+    expected = extract_civil_case_data_recursively(list(case_info), 'MAVERICK')
+
+    assert normalize_civil_case_dicts(PROD_acquire.extract_civil_case_data(list(case_info), 'MAVERICK')) == normalize_civil_case_dicts(expected)
+
+def make_large_civil_case(rng, combined_count):
+    """
+    This function builds one case block holding combined_count combined cases, each with a random number of attorney lines.
+    Some combined cases start right on the third line of the case before them, the first line a combined case can start on.
+    """
+
+    lines = []
+    for number in range(combined_count):
+        #The cause number and plaintiff lines of one random case, and up to three attorney lines
+        case_lines = make_civil_case(random.Random(rng.random()), number).split('\n')
+        lines.extend(case_lines[:2] + [line for line in case_lines[2:] if not re.match(r'\d{2}CV', line)][:rng.randint(0, 3)])
+
+    return lines
+
+@pytest.mark.parametrize('seed', range(200))
+def test_iterative_civil_parser_matches_recursive_parser(seed):
+    rng = random.Random(seed)
+
+    assert_civil_parsers_match(make_large_civil_case(rng, rng.randint(1, 8)))
+
+@pytest.mark.parametrize('combined_count', [300, 900])
+def test_iterative_civil_parser_matches_recursive_parser_on_a_very_large_block(combined_count):
+    case_info = make_large_civil_case(random.Random(combined_count), combined_count)
+
+    #The recursive parser calls itself once per combined case, so the recursion limit has to be raised for it
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, combined_count * 3))
+    try:
+        assert_civil_parsers_match(case_info)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+    assert len(PROD_acquire.extract_civil_case_data(list(case_info), 'MAVERICK')) == combined_count
+
+def test_iterative_civil_parser_matches_recursive_parser_on_the_archived_report():
+    text = archived_reports.load_archived_report('Civil').strip()
+    text = re.sub(r"""[A-Z0-9 ()/]*\n\n\s*[A-Za-z0-9 #,:\n]*DEFENDANT ATTORNEY""", '', text)
+    cases = text.split(dashed_line)
+    cases.pop()
+
+    for case in cases:
+        assert_civil_parsers_match(case.lstrip().split('\n'))
+
+def make_malformed_report(text, rng):
+    """
+    This function takes in report text and returns it with lines after the first header randomly dropped, doubled, cut short
+    and copied to other places, like a malformed extraction. Short lines end inside the fixed columns the parsers slice, and
+    copied lines can put continuation lines ahead of the first case.
+    """
+
+    lines = text.split('\n')
+    malformed_lines = lines[:12]
+    for line in lines[12:]:
+        choice = rng.random()
+        if choice < 0.05:
+            continue
+        elif choice < 0.1:
+            malformed_lines.extend([line, line])
+        elif choice < 0.2:
+            malformed_lines.append(line[:rng.randint(0, len(line))])
+        elif choice < 0.25:
+            malformed_lines.extend([rng.choice(lines), line])
+        else:
+            malformed_lines.append(line)
+
+    return '\n'.join(malformed_lines)
+
+def get_parser_result(module, report_type, text):
+    """
+    This function parses the text with the module's build_dataframe and returns the columns and the cases as strings, or the
+    name of the error the parser raised.
+    """
+
+    try:
+        df = module.build_dataframe(report_type, text)
+    except Exception as error:
+        return type(error).__name__
+
+    rows = df.astype(str).values.tolist()
+
+    #The baseline marked a county it couldn't find with its own text. PROD_classify calls it 'Unknown'
+    rows = [['Unknown' if value == 'Something went wrong!' else value for value in row] for row in rows]
+
+    return df.columns.tolist(), rows
+
+@pytest.mark.parametrize('report_type', list(archived_reports.archived_reports))
+def test_parsers_match_the_baseline_parsers_on_the_archived_reports(report_type):
+    text = archived_reports.load_archived_report(report_type)
+
+    result = get_parser_result(PROD_acquire, report_type, text)
+
+    assert len(result[1]) > 0
+    assert result == get_parser_result(baseline_acquire, report_type, text)
+
+@pytest.mark.parametrize('seed', range(30))
+@pytest.mark.parametrize('report_type', list(archived_reports.archived_reports))
+def test_parsers_match_the_baseline_parsers_on_malformed_reports(report_type, seed):
+    text = make_malformed_report(archived_reports.load_archived_report(report_type)[:20000], random.Random(seed))
+
+    assert get_parser_result(PROD_acquire, report_type, text) == get_parser_result(baseline_acquire, report_type, text)
+
+#Headers for the reports with no archived copy, and for a criminal inactivity report with continuation lines. Each one is padded
+#to where the parser starts reading the body, and holds what both the baseline parser and PROD_classify look for.
+synthetic_report_headers = {
+    'Civil Disposed': ('MARCH 01, 2023   MAVERICK COUNTY   COURT: 293   CIVIL DISPOSED CASES   FROM 02/01/23 TO 02/28/23\n', 420),
+    'Civil Inactive': ('RACHEL P. RAMIREZ   PENDING CIVIL CASES - INACTIVITY REPORT   03/01/2023\nAS OF 02/28/2023\n', 370),
+    'Criminal Inactive': ('LEOPOLDO VIELMA   PENDING CRIMINAL CASES - INACTIVITY REPORT   03/01/2023\nAS OF 02/28/2023\n', 368)
+}
+
+#The kinds of lines in the body of each of those reports
+synthetic_line_kinds = {
+    'Civil Disposed': ['Civil Disposed Case', 'Civil Disposed Continuation'],
+    'Civil Inactive': ['Civil Inactive Case', 'Civil Inactive Continuation'],
+    'Criminal Inactive': ['Criminal Inactive Case', 'Criminal Inactive Continuation']
+}
+
+def make_report_line(rng, line_kind):
+    """
+    This function builds one line of the given kind from its layout in PROD_acquire, with random values that are sometimes blank.
+    """
+
+    line = ''
+    for field, start, end in PROD_acquire.line_layouts[line_kind]:
+        if field == 'Cause Number':
+            value = '%02d-%05d-CR' % (rng.randint(15, 23), rng.randint(0, 99999))
+        elif 'Date' in field:
+            value = rng.choice(['', '01/02/2020', '12/31/2022', '02/28/2023'])
+        else:
+            value = rng.choice(['', 'Y', 'DISMISSED', 'WARRANT ISSUED', 'PENDING APPEAL'])
+        line = pad(line, start) + (value if end is None else pad(value, end - start))
+
+    return line.rstrip()
+
+def make_synthetic_report(rng, report_type):
+    """
+    This function builds a random report of the given type. Cases have any number of continuation lines, and continuation
+    lines can come before the first case.
+    """
+
+    case_kind, continuation_kind = synthetic_line_kinds[report_type]
+    lines = [make_report_line(rng, continuation_kind) for _ in range(rng.choice([0, 0, 1, 2]))]
+    for i in range(rng.randint(1, 8)):
+        if report_type == 'Criminal Inactive' and i == 0:
+            #The first case is read after its leading whitespace is removed, so it can be indented
+            lines.append(' ' * rng.randint(0, 4) + make_report_line(rng, 'Criminal Inactive First Case'))
+        else:
+            lines.append(make_report_line(rng, case_kind))
+        lines.extend(make_report_line(rng, continuation_kind) for _ in range(rng.choice([0, 1, 1, 2, 3])))
+        if rng.random() < 0.2:
+            lines.append('')
+
+    header, body_start = synthetic_report_headers[report_type]
+    total_lines = ['TOTAL CASES:'.ljust(19) + str(len(lines))]
+    if report_type == 'Civil Disposed':
+        total_lines.append('TOTAL DISPOSITIONS:'.ljust(19) + str(len(lines)))
+
+    return pad(header, body_start) + '\n'.join(lines + total_lines) + '\n'
+
+@pytest.mark.parametrize('seed', range(50))
+@pytest.mark.parametrize('report_type', list(synthetic_report_headers))
+def test_parsers_match_the_baseline_parsers_on_synthetic_reports(report_type, seed):
+    text = make_synthetic_report(random.Random(seed), report_type)
+
+    assert get_parser_result(PROD_acquire, report_type, text) == get_parser_result(baseline_acquire, report_type, text)
+
+def test_synthetic_reports_have_cases():
+    for report_type in synthetic_report_headers:
+        result = get_parser_result(PROD_acquire, report_type, make_synthetic_report(random.Random(0), report_type))
+
+        assert isinstance(result, tuple) and len(result[1]) > 0, report_type
+        assert 'Unknown' not in result[1][0], report_type
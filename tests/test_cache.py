@@ -0,0 +1,62 @@
+import os
+import pickle
+import pytest
+import PROD_cache
+
+
+@pytest.fixture(autouse = True)
+def cache_directory(tmp_path, monkeypatch):
+    #Keep every test's entries in its own empty directory
+    monkeypatch.setattr(PROD_cache, 'cache_directory', str(tmp_path))
+    return tmp_path
+
+class RaisesOnLoad:
+    """
+    A value that pickles fine but raises when it is loaded, like a dataframe saved by an older version of pandas.
+    """
+
+    def __init__(self, error):
+        self.error = error
+
+    def __reduce__(self):
+        return (raise_error, (self.error,))
+
+def raise_error(error):
+    raise error
+
+class RaisesOnSave:
+    """
+    A value that fails partway through being pickled.
+    """
+
+    def __reduce__(self):
+        raise TypeError('cannot pickle this value')
+
+def test_round_trip():
+    PROD_cache.save_cached_value('text', 'CAUSE NUMBER')
+
+    assert PROD_cache.load_cached_value('text') == 'CAUSE NUMBER'
+
+def test_missing_entry_is_a_miss():
+    assert PROD_cache.load_cached_value('missing') is None
+
+@pytest.mark.parametrize('error', [AttributeError('no attribute'), ModuleNotFoundError('no module'), ImportError('no name'), TypeError('bad args')])
+def test_unloadable_entry_is_a_miss_and_deleted(error):
+    with open(PROD_cache.get_cache_path('old'), 'wb') as f:
+        pickle.dump(RaisesOnLoad(error), f)
+
+    assert PROD_cache.load_cached_value('old') is None
+    assert not os.path.exists(PROD_cache.get_cache_path('old'))
+
+def test_truncated_entry_is_a_miss_and_deleted():
+    with open(PROD_cache.get_cache_path('cut'), 'wb') as f:
+        f.write(pickle.dumps('CAUSE NUMBER')[:5])
+
+    assert PROD_cache.load_cached_value('cut') is None
+    assert not os.path.exists(PROD_cache.get_cache_path('cut'))
+
+def test_failed_save_leaves_no_temporary_file(cache_directory):
+    PROD_cache.save_cached_value('bad', RaisesOnSave())
+
+    assert os.listdir(cache_directory) == []
+    assert PROD_cache.load_cached_value('bad') is None
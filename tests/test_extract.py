@@ -0,0 +1,69 @@
+import io
+import pytest
+
+pytest.importorskip('pdfminer3')
+canvas = pytest.importorskip('reportlab.pdfgen.canvas')
+
+import PROD_acquire
+import PROD_extract
+import archived_reports
+
+
+def make_pdf(page_count):
+    """
+    This function builds a PDF with a few lines of report-like text on each page and returns it as bytes.
+    """
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for page_number in range(page_count):
+        pdf.drawString(40, 800, 'MAVERICK COUNTY PENDING REPORT   PAGE %d' % (page_number + 1))
+        for line_number in range(5):
+            pdf.drawString(40, 760 - 20 * line_number, '%02d-%05d-CV   01/02/2020   DEBT   SMITH, JOHN' % (page_number % 24, line_number))
+        pdf.showPage()
+    pdf.save()
+
+    return buffer.getvalue()
+
+@pytest.fixture
+def many_cpus(monkeypatch):
+    #Act like a machine with several cpus, so the files are split and run on the process pool
+    monkeypatch.setattr(PROD_extract.os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(PROD_extract, 'pages_per_task', 3)
+
+def test_page_chunks_cover_every_page_in_order(monkeypatch):
+    monkeypatch.setattr(PROD_extract, 'pages_per_task', 3)
+
+    assert PROD_extract.get_page_chunks(7) == [{0, 1, 2}, {3, 4, 5}, {6}]
+    assert PROD_extract.get_page_chunks(0) == []
+
+def test_count_pages():
+    assert PROD_extract.count_pages(make_pdf(7)) == 7
+
+def test_split_file_matches_extracting_it_at_once(many_cpus):
+    pdf_bytes = make_pdf(8)
+
+    results = PROD_extract.get_file_contents([pdf_bytes], max_workers = 2)
+
+    assert results[0]['Content'] == PROD_extract.get_file_content(pdf_bytes)
+    assert results[0]['Content'].count('\f') == 8
+
+def test_files_keep_upload_order(many_cpus):
+    pdf_bytes_list = [make_pdf(page_count) for page_count in [4, 1, 6]]
+
+    results = PROD_extract.get_file_contents(pdf_bytes_list)
+
+    assert [result['Content'] for result in results] == [PROD_extract.get_file_content(pdf_bytes) for pdf_bytes in pdf_bytes_list]
+
+@pytest.mark.parametrize('report_type', list(archived_reports.archived_reports))
+def test_extracted_reports_parse_like_the_archived_text(report_type):
+    #The first pages of each archived report, drawn into a PDF and extracted with the settings PROD_extract uses.
+    #The parsers slice fixed columns out of each line, so the cases only match if every column still lines up.
+    pages = list(PROD_acquire.split_into_pages(archived_reports.load_archived_report(report_type)))[:4]
+
+    content = PROD_extract.get_file_content(archived_reports.build_report_pdf(pages))
+
+    df = PROD_acquire.build_dataframe(report_type, content)
+    expected = PROD_acquire.build_dataframe(report_type, ''.join(pages))
+    assert len(df) > 0
+    assert df.astype(str).values.tolist() == expected.astype(str).values.tolist()
@@ -0,0 +1,390 @@
+import random
+import pandas as pd
+import pytest
+
+#The upload functions need the app's dependencies
+pytest.importorskip('streamlit')
+pytest.importorskip('gspread')
+pytest.importorskip('sqlalchemy')
+
+import PROD_acquire
+import PROD_pending_upload
+import PROD_prepare
+import PROD_workbook
+import archived_reports
+import benchmark_upload
+
+
+@pytest.fixture
+def workbook():
+    #Run the upload functions against an empty in-memory workbook, with no batch left open by another test
+    workbook = PROD_workbook.MemoryWorkbook()
+    PROD_pending_upload.use_workbook(workbook)
+    PROD_pending_upload.st.session_state.pop(PROD_pending_upload.upload_batch_key, None)
+
+    yield workbook
+
+    PROD_pending_upload.st.session_state.pop(PROD_pending_upload.upload_batch_key, None)
+    PROD_pending_upload.use_workbook(None)
+
+class RecordingWorksheet(PROD_workbook.MemoryWorksheet):
+    """
+    A MemoryWorksheet that records the requests sent to it, the way they would be sent to the google sheet.
+    """
+
+    def __init__(self, title, values = None):
+        PROD_workbook.MemoryWorksheet.__init__(self, title, values)
+        self.requests = []
+
+    def update(self, range_name, values = None):
+        self.requests.append(('update', range_name if values is not None else 'A1'))
+        PROD_workbook.MemoryWorksheet.update(self, range_name, values)
+
+    def batch_update(self, data):
+        self.requests.append(('batch_update', [block['range'] for block in data]))
+        PROD_workbook.MemoryWorksheet.batch_update(self, data)
+
+    def clear(self):
+        self.requests.append(('clear', None))
+        PROD_workbook.MemoryWorksheet.clear(self)
+
+def make_case_df(rng, row_count, first_number = 0):
+    """
+    This function builds a dataframe like a case table, with a mix of the types the upload functions write.
+    """
+
+    return pd.DataFrame({
+        'County': [rng.choice(['Dimmit', 'Maverick', 'Zavala']) for _ in range(row_count)],
+        'Cause Number': ['%02d-%05d-CV' % (rng.randint(15, 23), first_number + i) for i in range(row_count)],
+        'Status': [rng.choice(['Open', 'Closed']) for _ in range(row_count)],
+        'Docket Date': [rng.choice(['', '03/07/2023', '03/07/2023\n01/02/2023']) for _ in range(row_count)],
+        'Bad Cause Number': [rng.choice([True, False]) for _ in range(row_count)],
+        'Months Pending': [rng.choice([0, 12, 1.5, '']) for _ in range(row_count)]
+    })
+
+def get_sheet(df):
+    """
+    This function uploads a dataframe to a new recording worksheet and returns the worksheet and its records.
+    """
+
+    worksheet = RecordingWorksheet('Common Table')
+    worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+    worksheet.requests = []
+
+    return worksheet, worksheet.get_all_records()
+
+def get_full_upload(df):
+    """
+    This function returns the values a worksheet has after the whole dataframe is uploaded to it at once.
+    """
+
+    worksheet = PROD_workbook.MemoryWorksheet('Common Table')
+    worksheet.update([df.columns.values.tolist()] + df.values.tolist())
+
+    return worksheet.get_all_values()
+
+def test_update_worksheet_skips_unchanged_rows():
+    df = make_case_df(random.Random(3), 50)
+    worksheet, records = get_sheet(df)
+
+    #Change two rows next to each other and one further down
+    new_df = df.copy()
+    new_df.loc[[10, 11], 'Status'] = 'Closed Again'
+    new_df.loc[30, 'Docket Date'] = '04/01/2023'
+
+    PROD_pending_upload.update_worksheet(worksheet, new_df, records)
+
+    #Row 0 of the dataframe is sheet row 2
+    assert worksheet.requests == [('batch_update', ['A12:F13', 'A32:F32'])]
+    assert worksheet.get_all_values() == get_full_upload(new_df)
+
+def test_update_worksheet_sends_nothing_when_nothing_changed():
+    df = make_case_df(random.Random(4), 20)
+    worksheet, records = get_sheet(df)
+
+    #The records come back with sheet types, like '0' as 0 and True as 'TRUE', which still count as unchanged
+    PROD_pending_upload.update_worksheet(worksheet, df, records)
+
+    assert worksheet.requests == []
+
+def test_update_worksheet_blanks_removed_trailing_rows():
+    df = make_case_df(random.Random(5), 30)
+    worksheet, records = get_sheet(df)
+
+    new_df = df.iloc[:25]
+    PROD_pending_upload.update_worksheet(worksheet, new_df, records)
+
+    assert worksheet.requests == [('batch_update', ['A27:F31'])]
+    assert worksheet.get_all_values() == get_full_upload(new_df)
+    assert len(worksheet.get_all_records()) == 25
+
+@pytest.mark.parametrize('change', ['added column', 'removed column', 'renamed column', 'moved column'])
+def test_update_worksheet_rewrites_the_sheet_when_the_columns_change(change):
+    df = make_case_df(random.Random(6), 10)
+    worksheet, records = get_sheet(df)
+
+    if change == 'added column':
+        new_df = df.assign(Comments = 'NEW')
+    elif change == 'removed column':
+        new_df = df.drop(columns = ['Months Pending'])
+    elif change == 'renamed column':
+        new_df = df.rename(columns = {'Status': 'Case Status'})
+    else:
+        new_df = df[['Cause Number', 'County'] + df.columns.tolist()[2:]]
+
+    PROD_pending_upload.update_worksheet(worksheet, new_df, records)
+
+    assert worksheet.requests == [('clear', None), ('update', 'A1')]
+    assert worksheet.get_all_values() == get_full_upload(new_df)
+
+def test_update_worksheet_uploads_an_empty_sheet_in_full():
+    df = make_case_df(random.Random(7), 10)
+    worksheet = RecordingWorksheet('Common Table')
+
+    PROD_pending_upload.update_worksheet(worksheet, df, [])
+
+    assert worksheet.requests == [('clear', None), ('update', 'A1')]
+    assert worksheet.get_all_values() == get_full_upload(df)
+
+@pytest.mark.parametrize('seed', range(100))
+def test_update_worksheet_matches_a_full_upload(seed):
+    rng = random.Random(seed)
+    df = make_case_df(rng, rng.randint(1, 40))
+    worksheet, records = get_sheet(df)
+
+    #Change, drop, move and add random rows
+    new_df = df.sample(frac = rng.uniform(0.5, 1), random_state = seed).sort_index()
+    if len(new_df) > 0 and rng.random() < 0.7:
+        new_df = new_df.copy()
+        new_df.iloc[rng.randrange(len(new_df)), rng.randrange(len(new_df.columns))] = rng.choice(['CHANGED', 7, False, ''])
+    if rng.random() < 0.5:
+        new_df = pd.concat([make_case_df(rng, rng.randint(1, 10), first_number = 1000), new_df])
+    if rng.random() < 0.5:
+        new_df = pd.concat([new_df, make_case_df(rng, rng.randint(1, 10), first_number = 2000)])
+
+    PROD_pending_upload.update_worksheet(worksheet, new_df, records)
+
+    assert worksheet.get_all_values() == get_full_upload(new_df)
+    assert all(request[0] == 'batch_update' for request in worksheet.requests)
+
+def test_reading_a_tab_again_in_a_batch_matches_a_fresh_read(workbook):
+    df = make_case_df(random.Random(8), 20)
+    workbook.worksheet('Common Table').update([df.columns.values.tolist()] + df.values.tolist())
+
+    PROD_pending_upload.open_upload_batch()
+    first_read_df = PROD_pending_upload.read_worksheet('Common Table')
+
+    #Write back part of the tab with its filtered index and Python types, then read it again
+    new_df = pd.concat([first_read_df[first_read_df['Status'] == 'Open'], make_case_df(random.Random(9), 5, first_number = 1000)])
+    new_df['Bad Cause Number'] = new_df['Bad Cause Number'].map(PROD_pending_upload.convert_to_bool)
+    PROD_pending_upload.write_worksheet('Common Table', new_df)
+    second_read_df = PROD_pending_upload.read_worksheet('Common Table')
+
+    PROD_pending_upload.close_upload_batch()
+    fresh_read_df = pd.DataFrame(workbook.worksheet('Common Table').get_all_records())
+
+    pd.testing.assert_frame_equal(second_read_df, fresh_read_df)
+    assert isinstance(second_read_df.index, pd.RangeIndex)
+
+    #The values written keep their types in the sheet
+    assert workbook.worksheet('Common Table').get_all_values()[1:] == get_full_upload(new_df)[1:]
+
+def test_rows_appended_before_a_tab_is_read_match_a_fresh_read(workbook):
+    df = make_case_df(random.Random(10), 10)
+    workbook.worksheet('Closed Civil Cases').update([df.columns.values.tolist()] + df.values.tolist())
+
+    PROD_pending_upload.open_upload_batch()
+    PROD_pending_upload.append_worksheet_rows('Closed Civil Cases', make_case_df(random.Random(11), 5, first_number = 1000).set_index(pd.Index(range(50, 55))))
+    read_df = PROD_pending_upload.read_worksheet('Closed Civil Cases')
+    PROD_pending_upload.close_upload_batch()
+
+    pd.testing.assert_frame_equal(read_df, pd.DataFrame(workbook.worksheet('Closed Civil Cases').get_all_records()))
+
+def get_juvenile_report():
+    text = archived_reports.load_archived_report('Juvenile')
+    as_of_date = '01/22/2024'
+    load_context = PROD_prepare.get_load_context(as_of_date)
+
+    #Set the same way the app sets them before an upload
+    return {'County': 'All Counties', 'Report Type': 'Juvenile', 'As Of Date': as_of_date, 'Content': text,
+            'Load Context': load_context, 'Load DateTime': load_context['Load DateTime']}
+
+def add_report_tracker(workbook):
+    workbook.worksheet('Report Tracker').update([['County', 'Report Type', 'Report Date', 'Load DateTime'], ['All Counties', 'Juvenile', '', '']])
+
+def test_juvenile_report_uploaded_twice_in_one_batch(workbook):
+    #The juvenile update loops over the tab it read by position, which only works if the second read has a new index
+    report = get_juvenile_report()
+    add_report_tracker(workbook)
+
+    PROD_pending_upload.open_upload_batch()
+    try:
+        PROD_pending_upload.update_spreadsheet(dict(report))
+        PROD_pending_upload.update_spreadsheet(dict(report))
+    finally:
+        PROD_pending_upload.close_upload_batch()
+
+    #The same as uploading it twice in separate batches
+    separate_workbook = PROD_workbook.MemoryWorkbook()
+    add_report_tracker(separate_workbook)
+    PROD_pending_upload.use_workbook(separate_workbook)
+    PROD_pending_upload.update_spreadsheet(dict(report))
+    PROD_pending_upload.update_spreadsheet(dict(report))
+
+    assert sorted(workbook.worksheets) == sorted(separate_workbook.worksheets)
+    for sheet_name in workbook.worksheets:
+        assert workbook.worksheet(sheet_name).get_all_values() == separate_workbook.worksheet(sheet_name).get_all_values(), sheet_name
+
+@pytest.fixture(scope = 'module')
+def monthly_reports():
+    #Two months of synthetic reports of every archived report type. Some cases close and open in the second month.
+    return benchmark_upload.build_monthly_reports(2)
+
+def get_cause_numbers(df):
+    return set(df['Cause Number'].astype(str))
+
+def get_report_cause_numbers(report):
+    return get_cause_numbers(PROD_acquire.build_dataframe(report['Report Type'], report['Content']))
+
+def get_tab_df(workbook, sheet_name):
+    return pd.DataFrame(workbook.worksheet(sheet_name).get_all_records())
+
+def test_monthly_uploads_follow_the_reports(workbook, monthly_reports):
+    benchmark_upload.add_report_tracker(workbook)
+    benchmark_upload.upload_monthly_reports(workbook, monthly_reports)
+
+    civil_reports = [report for reports in monthly_reports for report in reports if report['Report Type'] == 'Civil']
+    civil_cause_numbers = [get_report_cause_numbers(report) for report in civil_reports]
+    last_reports = {report['Report Type']: report for report in monthly_reports[-1]}
+
+    #The pending tabs hold the cases on the last pending reports
+    assert get_cause_numbers(get_tab_df(workbook, 'Civil Cases')) == civil_cause_numbers[-1]
+    assert get_cause_numbers(get_tab_df(workbook, 'Criminal Cases')) == get_report_cause_numbers(last_reports['Criminal'])
+
+    #Every case that left the civil report was dropped
+    dropped_cause_numbers = set().union(*[before - after for before, after in zip(civil_cause_numbers, civil_cause_numbers[1:])])
+    closed_civil_df = get_tab_df(workbook, 'Closed Civil Cases')
+    assert len(dropped_cause_numbers) > 0
+    assert get_cause_numbers(closed_civil_df) == dropped_cause_numbers
+    assert (closed_civil_df['Status'] == 'Dropped').all()
+
+    #The common table has the open civil cases and one row for each case and status
+    common_table_df = get_tab_df(workbook, 'Common Table')
+    open_civil_df = common_table_df[(common_table_df['County'] == 'Maverick') & common_table_df['Case Type'].isin(['Civil', 'Tax']) & (common_table_df['Status'] == 'Open')]
+    assert get_cause_numbers(open_civil_df) == civil_cause_numbers[-1]
+    assert not common_table_df.astype(str).duplicated(['Cause Number', 'Status']).any()
+
+    #The report tracker has the last date of each report
+    report_tracker_df = get_tab_df(workbook, 'Report Tracker').set_index(['County', 'Report Type'])
+    for report in last_reports.values():
+        assert report_tracker_df.loc[(report['County'], report['Report Type']), 'Report Date'] == report['As Of Date']
+        assert report_tracker_df.loc[(report['County'], report['Report Type']), 'Load DateTime'] == report['Load DateTime']
+
+def test_monthly_uploads_match_when_each_report_has_its_own_batch(workbook, monthly_reports):
+    benchmark_upload.add_report_tracker(workbook)
+    benchmark_upload.upload_monthly_reports(workbook, monthly_reports)
+
+    separate_workbook = PROD_workbook.MemoryWorkbook()
+    benchmark_upload.add_report_tracker(separate_workbook)
+    benchmark_upload.upload_monthly_reports(separate_workbook, [[report] for reports in monthly_reports for report in reports])
+
+    assert sorted(workbook.worksheets) == sorted(separate_workbook.worksheets)
+    for sheet_name in workbook.worksheets:
+        assert workbook.worksheet(sheet_name).get_all_values() == separate_workbook.worksheet(sheet_name).get_all_values(), sheet_name
+
+def test_monthly_uploads_match_on_the_local_file_workbook(workbook, monthly_reports, tmp_path):
+    benchmark_upload.add_report_tracker(workbook)
+    benchmark_upload.upload_monthly_reports(workbook, monthly_reports)
+
+    local_workbook = PROD_workbook.LocalFileWorkbook(str(tmp_path))
+    benchmark_upload.add_report_tracker(local_workbook)
+    benchmark_upload.upload_monthly_reports(local_workbook, monthly_reports)
+
+    #Read the tabs back from their files
+    saved_workbook = PROD_workbook.LocalFileWorkbook(str(tmp_path))
+    for sheet_name in workbook.worksheets:
+        assert workbook.worksheet(sheet_name).get_all_values() == saved_workbook.worksheet(sheet_name).get_all_values(), sheet_name
+
+def merge_by_appending(common_table_df, report_cases_df):
+    """
+    This function merges the report's cases into the common table the way the upload functions used to: append them and drop
+    the duplicate cause number and status pairs across the whole table.
+    """
+
+    return pd.concat([common_table_df, report_cases_df], ignore_index = True).drop_duplicates(subset = ['Cause Number', 'Status'], ignore_index = True, keep = 'last')
+
+def get_sheet_rows(df):
+    """
+    This function returns the rows of a dataframe as the sheet would show them, in the order of the given columns.
+    """
+
+    return PROD_pending_upload.convert_to_sheet_strings(df).values.tolist()
+
+def make_common_table(rng, row_count):
+    """
+    This function builds a common table like the one read from the sheet, where some cases are listed with more than one status.
+    """
+
+    df = make_case_df(rng, row_count)
+    reopened_df = df.sample(n = row_count // 5, random_state = rng.randrange(1000)).assign(Status = 'Dropped')
+
+    return PROD_pending_upload.convert_to_sheet_records_df(pd.concat([df, reopened_df], ignore_index = True))
+
+def test_merge_updates_changed_cases_in_place():
+    common_table_df = make_common_table(random.Random(12), 20)
+    report_cases_df = common_table_df.iloc[[3, 8]].copy()
+    report_cases_df['Docket Date'] = '05/01/2023'
+
+    merged_df = PROD_pending_upload.merge_into_common_table(common_table_df, report_cases_df)
+
+    expected_df = common_table_df.copy()
+    expected_df.loc[[3, 8], 'Docket Date'] = '05/01/2023'
+    assert get_sheet_rows(merged_df) == get_sheet_rows(expected_df)
+
+def test_merge_adds_new_cases_to_the_bottom():
+    common_table_df = make_common_table(random.Random(13), 20)
+    new_cases_df = make_case_df(random.Random(14), 3, first_number = 1000)
+    report_cases_df = pd.concat([common_table_df.iloc[[5]], new_cases_df])
+
+    merged_df = PROD_pending_upload.merge_into_common_table(common_table_df, report_cases_df)
+
+    assert get_sheet_rows(merged_df) == get_sheet_rows(common_table_df) + get_sheet_rows(new_cases_df)
+
+def test_merge_drops_repeated_cases_already_in_the_common_table():
+    common_table_df = make_common_table(random.Random(15), 10)
+    repeated_df = common_table_df.iloc[[2, 6]].assign(**{'Docket Date': '06/01/2023'})
+    common_table_df = pd.concat([common_table_df, repeated_df], ignore_index = True)
+
+    merged_df = PROD_pending_upload.merge_into_common_table(common_table_df, make_case_df(random.Random(16), 2, first_number = 1000))
+
+    assert not merged_df.duplicated(['Cause Number', 'Status']).any()
+    assert get_sheet_rows(merged_df) == get_sheet_rows(merge_by_appending(common_table_df, make_case_df(random.Random(16), 2, first_number = 1000)))
+
+@pytest.mark.parametrize('seed', range(50))
+def test_merge_matches_appending_and_dropping_duplicates(seed):
+    rng = random.Random(seed)
+    common_table_df = make_common_table(rng, rng.randint(0, 40))
+    if len(common_table_df) > 0 and rng.random() < 0.3:
+        common_table_df = pd.concat([common_table_df, common_table_df.sample(n = 1, random_state = seed)], ignore_index = True)
+
+    #The report has cases from the common table with and without changes, repeated cases and new cases. The key columns stay the same.
+    report_cases_df = common_table_df.sample(frac = rng.random(), random_state = seed).copy()
+    if len(report_cases_df) > 0:
+        report_cases_df.iloc[rng.randrange(len(report_cases_df)), rng.randrange(3, len(report_cases_df.columns))] = rng.choice(['CHANGED', 7, False, ''])
+        report_cases_df = pd.concat([report_cases_df, report_cases_df.iloc[:2].assign(**{'Docket Date': '07/01/2023'})])
+    report_cases_df = pd.concat([report_cases_df, make_case_df(rng, rng.randint(0, 5), first_number = 1000)]).reset_index(drop = True)
+    if rng.random() < 0.3:
+        report_cases_df = report_cases_df.assign(Comments = 'NEW')
+
+    merged_df = PROD_pending_upload.merge_into_common_table(common_table_df, report_cases_df)
+    appended_df = merge_by_appending(common_table_df, report_cases_df)[merged_df.columns]
+
+    #The same cases with the same values. Only the rows the report matched are in a different place.
+    assert sorted(get_sheet_rows(merged_df)) == sorted(get_sheet_rows(appended_df))
+
+    #Once the upload functions sort the table by status, every status still lists the same cases
+    for df in [merged_df, appended_df]:
+        df.sort_values(by = ['Status'], ignore_index = True, inplace = True, ascending = False, kind = 'mergesort')
+    assert merged_df['Status'].tolist() == appended_df['Status'].tolist()
+    for status in merged_df['Status'].unique():
+        assert sorted(get_sheet_rows(merged_df[merged_df['Status'] == status])) == sorted(get_sheet_rows(appended_df[appended_df['Status'] == status]))
@@ -0,0 +1,42 @@
+import random
+import pandas as pd
+import PROD_prepare
+
+
+def make_name_lists(rng, row_count):
+    """
+    This function builds a column of random name lists like the ones the acquire functions collect: empty lists, single names,
+    names with spaces and commas, and the odd list of blank strings.
+    """
+
+    names = ['SMITH JOHN', 'DOE, JANE', 'GARCIA', 'PRO SE', '', ' ', '01/02/2020', 'POSS CS PG 1 <1G']
+
+    return pd.Series([[rng.choice(names) for _ in range(rng.randint(0, 4))] for _ in range(row_count)], index = range(5, row_count + 5))
+
+def test_convert_name_lists_to_strings_matches_apply():
+    name_lists = make_name_lists(random.Random(17), 5000)
+
+    expected = name_lists.apply(PROD_prepare.convert_name_list_to_string)
+
+    pd.testing.assert_series_equal(PROD_prepare.convert_name_lists_to_strings(name_lists), expected)
+
+def test_convert_name_lists_to_strings_matches_apply_on_an_empty_column():
+    name_lists = pd.Series([], dtype = object)
+
+    assert PROD_prepare.convert_name_lists_to_strings(name_lists).tolist() == name_lists.apply(PROD_prepare.convert_name_list_to_string).tolist()
+
+def test_parse_report_dates_reads_both_year_formats():
+    dates = pd.Series(['03/01/2023', '03/01/23', ' 12/31/1999 ', '', 'NOT A DATE', None])
+
+    parsed_dates = PROD_prepare.parse_report_dates(dates)
+
+    assert pd.api.types.is_datetime64_any_dtype(parsed_dates)
+    assert PROD_prepare.format_report_dates(parsed_dates).tolist() == ['03/01/2023', '03/01/2023', '12/31/1999', '', '', '']
+
+def test_report_dates_compare_as_dates():
+    #As strings, '12/31/2022' sorts after '03/01/2023'
+    parsed_dates = PROD_prepare.parse_report_dates(['12/31/2022', '03/01/2023', '02/28/23'])
+
+    assert PROD_prepare.format_report_date(parsed_dates.max()) == '03/01/2023'
+    assert PROD_prepare.format_report_date(PROD_prepare.parse_report_date('02/28/23')) == '02/28/2023'
+    assert PROD_prepare.format_report_date(pd.NaT) == ''
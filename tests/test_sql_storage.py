@@ -0,0 +1,73 @@
+import random
+import pandas as pd
+import pytest
+
+#The SQLite backend needs the app's dependencies
+pytest.importorskip('streamlit')
+pytest.importorskip('gspread')
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+import PROD_sql_storage
+
+
+@pytest.fixture(autouse = True)
+def engine(tmp_path, monkeypatch):
+    #Keep every test's tables in its own database
+    engine = sqlalchemy.create_engine('sqlite:///' + str(tmp_path / 'pending_reports.db'))
+    monkeypatch.setattr(PROD_sql_storage, 'get_engine', lambda: engine)
+    return engine
+
+def make_rows(rng, row_count, first_number = 0):
+    """
+    This function builds a dataframe of sheet strings like a case table, with some keys listed more than once.
+    """
+
+    return pd.DataFrame({
+        'County': [rng.choice(['Dimmit', 'Maverick', 'Zavala']) for _ in range(row_count)],
+        'Cause Number': ['%02d-%05d' % (rng.randint(15, 23), rng.randint(first_number, first_number + row_count // 2 + 1)) for _ in range(row_count)],
+        'Status': [rng.choice(['Open', 'Closed']) for _ in range(row_count)],
+        'Comments': [rng.choice(['', 'CONTINUED', 'SET FOR TRIAL']) for _ in range(row_count)]
+    })
+
+def load_rows(table_name):
+    return [list(record.values()) for record in PROD_sql_storage.load_records(table_name)]
+
+@pytest.mark.parametrize('seed', range(20))
+def test_saved_order_is_kept_when_rows_are_added_and_moved(seed):
+    rng = random.Random(seed)
+    rows_df = make_rows(rng, 40)
+    PROD_sql_storage.save_table('Common Table', rows_df)
+
+    for save in range(5):
+        #New open rows are sorted to the top of the common table, and some rows are closed or dropped
+        new_rows_df = make_rows(rng, 10, first_number = 1000 * (save + 1))
+        rows_df = pd.concat([rows_df.sample(frac = 0.9, random_state = seed), new_rows_df], ignore_index = True)
+        rows_df.loc[rng.sample(range(len(rows_df)), 5), 'Status'] = 'Closed'
+        rows_df = rows_df.sort_values(by = ['Status'], ascending = False, kind = 'mergesort', ignore_index = True)
+
+        PROD_sql_storage.save_table('Common Table', rows_df)
+
+        assert load_rows('Common Table') == rows_df.values.tolist()
+
+def test_appended_rows_come_after_the_saved_rows():
+    rng = random.Random(21)
+    rows_df = make_rows(rng, 30)
+    appended_df = make_rows(rng, 10)
+
+    PROD_sql_storage.save_table('Closed Table', rows_df)
+    PROD_sql_storage.append_rows('Closed Table', appended_df)
+
+    assert load_rows('Closed Table') == pd.concat([rows_df, appended_df]).values.tolist()
+
+    #Saving the same rows again moves nothing
+    rows_df = pd.concat([rows_df, appended_df], ignore_index = True)
+    PROD_sql_storage.save_table('Closed Table', rows_df)
+
+    assert load_rows('Closed Table') == rows_df.values.tolist()
+
+def test_unkeyed_tables_keep_their_order():
+    rows_df = pd.DataFrame({'Report Type': ['Criminal', 'Civil', 'Juvenile'], 'Report Date': ['03/01/2023', '02/28/2023', '']})
+
+    PROD_sql_storage.save_table('Report Tracker', rows_df)
+
+    assert load_rows('Report Tracker') == rows_df.values.tolist()
@@ -0,0 +1,98 @@
+import random
+import warnings
+import pandas as pd
+import pytest
+
+
+#The inactive tab's columns, in the order they are on the sheet
+inactive_columns = ['County', 'Cause Number', 'Status', 'Inactive Start Date', 'Inactive End Date', 'Inactive Reason',
+                    'Estimated Inactive End Date', 'Original As Of Date', 'Last As Of Date', 'Load DateTime', 'Days Inactive']
+
+def make_sheet_df(rng, row_count, columns = inactive_columns):
+    """
+    This function builds a dataframe the way read_worksheet does, from records with numbers already converted by
+    get_all_records(). Cause numbers and day counts can come back as ints, and blank cells as empty strings.
+    """
+
+    records = []
+    for _ in range(row_count):
+        record = {
+            'County': rng.choice(['Dimmit', 'Maverick', 'Zavala']),
+            'Cause Number': rng.choice(['%02d-%02d-%05d-CR' % (rng.randint(15, 23), rng.randint(1, 12), rng.randint(1, 60)), rng.randint(1, 60)]),
+            'Status': rng.choice(['Active', 'Inactive']),
+            'Inactive Start Date': rng.choice(['', '01/02/2020', '01/02/2020\n03/04/2021']),
+            'Inactive End Date': rng.choice(['', '03/04/2021']),
+            'Inactive Reason': rng.choice(['', 'WARRANT ISSUED', 'COMPETENCY']),
+            'Estimated Inactive End Date': rng.choice(['', '02/28/2023']),
+            'Original As Of Date': '01/31/2023',
+            'Last As Of Date': rng.choice(['02/28/2023', '02/28/2023\n01/31/2023']),
+            'Load DateTime': '2023-03-01 08:00:00-06:00',
+            'Days Inactive': rng.choice([rng.randint(0, 900), '', 1.5])
+        }
+        records.append({column: record[column] for column in columns})
+
+    return pd.DataFrame(records)
+
+def make_inactive_frames(rng):
+    """
+    This function builds the three frames update_inactive_cases concatenates: the whole tab, and the county's inactive and
+    active rows after they were split off the tab, moved between each other and combined with the new report's rows.
+    """
+
+    current_df = make_sheet_df(rng, rng.choice([1, 5, 40]))
+    current_df['Cause Number'] = current_df['Cause Number'].astype(str).str.strip()
+    county = rng.choice(['Dimmit', 'Maverick', 'Zavala'])
+
+    #Filtered frames keep the tab's index. Some are empty.
+    active_df = current_df[(current_df['Status'] == 'Active') & (current_df['County'] == county)]
+    inactive_df = current_df[(current_df['Status'] == 'Inactive') & (current_df['County'] == county)]
+
+    if rng.random() < 0.5:
+        #Some rows were reactivated and moved to the active rows
+        reactivated_df = inactive_df.sample(frac = 0.5, random_state = rng.randint(0, 1000)).reset_index(drop = True)
+        reactivated_df['Status'] = 'Active'
+        active_df = pd.concat([active_df, reactivated_df], ignore_index = True)
+        inactive_df = inactive_df[~inactive_df['Cause Number'].isin(reactivated_df['Cause Number'])].reset_index(drop = True)
+
+    #The new report's rows are added to the inactive rows. They come from the prepare functions, so they are all strings,
+    #and may not have every column the tab has.
+    new_columns = inactive_columns if rng.random() < 0.7 else inactive_columns[:-1]
+    new_inactive_df = make_sheet_df(rng, rng.choice([0, 3, 20]), new_columns).astype(str)
+    new_inactive_df['County'] = county
+    inactive_df = pd.concat([inactive_df, new_inactive_df], ignore_index = True)
+    inactive_df = inactive_df.drop_duplicates(subset = ['Cause Number'], ignore_index = True, keep = 'first')
+
+    return current_df, inactive_df, active_df
+
+def append_one_at_a_time(frames):
+    """
+    This function adds the frames together the way the upload pipeline did before it used one concat: the last two first,
+    then the rest onto those. DataFrame.append is used while this version of pandas still has it.
+    """
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        combined_df = frames[-1]
+        for df in reversed(frames[:-1]):
+            if hasattr(pd.DataFrame, 'append'):
+                combined_df = df.append(combined_df, ignore_index = True)
+            else:
+                combined_df = pd.concat([df, combined_df], ignore_index = True)
+
+    return combined_df
+
+@pytest.mark.parametrize('seed', range(300))
+def test_inactive_concat_matches_the_append_chain(seed):
+    current_df, inactive_df, active_df = make_inactive_frames(random.Random(seed))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        concat_df = pd.concat([current_df, inactive_df, active_df], ignore_index = True)
+    append_df = append_one_at_a_time([current_df, inactive_df, active_df])
+
+    #Same rows in the same order, with the same index and dtypes
+    pd.testing.assert_frame_equal(concat_df, append_df)
+
+    #So the same rows are kept when duplicates are dropped
+    pd.testing.assert_frame_equal(concat_df.drop_duplicates(subset = ['Cause Number'], ignore_index = True, keep = 'last'),
+                                  append_df.drop_duplicates(subset = ['Cause Number'], ignore_index = True, keep = 'last'))
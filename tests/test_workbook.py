@@ -0,0 +1,48 @@
+import os
+import pytest
+
+#The workbooks use gspread's A1 and number helpers
+pytest.importorskip('gspread')
+
+import PROD_workbook
+
+
+@pytest.fixture
+def worksheet(tmp_path, monkeypatch):
+    worksheet = PROD_workbook.LocalFileWorkbook(str(tmp_path)).worksheet('Common Table')
+
+    #Count how many times the CSV file is written
+    worksheet.save_count = 0
+    save = worksheet.save
+    def counting_save():
+        worksheet.save_count += 1
+        save()
+    monkeypatch.setattr(worksheet, 'save', counting_save)
+
+    return worksheet
+
+def test_batch_update_saves_once(worksheet):
+    worksheet.update([['Cause Number', 'Status'], ['15-01-00001-CV', 'Open'], ['15-01-00002-CV', 'Open']])
+    worksheet.save_count = 0
+
+    worksheet.batch_update([{'range': 'B%d' % row, 'values': [['Closed']]} for row in [2, 3]] + [{'range': 'A4:B4', 'values': [['15-01-00003-CV', 'Open']]}])
+
+    assert worksheet.save_count == 1
+    assert PROD_workbook.LocalFileWorksheet('Common Table', worksheet.path).get_all_values() == [
+        ['Cause Number', 'Status'], ['15-01-00001-CV', 'Closed'], ['15-01-00002-CV', 'Closed'], ['15-01-00003-CV', 'Open']]
+
+def test_append_rows_saves_once(worksheet):
+    worksheet.update([['Cause Number', 'Status']])
+    worksheet.save_count = 0
+
+    response = worksheet.append_rows([['15-01-00001-CV', 'Open'], ['15-01-00002-CV', True]])
+
+    assert worksheet.save_count == 1
+    assert response['updates']['updatedRange'] == "'Common Table'!A2:B3"
+    assert PROD_workbook.LocalFileWorksheet('Common Table', worksheet.path).get_all_records() == [
+        {'Cause Number': '15-01-00001-CV', 'Status': 'Open'}, {'Cause Number': '15-01-00002-CV', 'Status': 'TRUE'}]
+
+def test_no_temporary_files_are_left(worksheet):
+    worksheet.batch_update([{'range': 'A%d' % row, 'values': [[row]]} for row in range(1, 50)])
+
+    assert os.listdir(os.path.dirname(worksheet.path)) == ['Common Table.csv']